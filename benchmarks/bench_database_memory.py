@@ -0,0 +1,71 @@
+"""Measures the memory retained by a parsed database and by copies of it
+received from parse workers / loaded from the cache (unpickled)
+
+Usage (from the repository root):
+    python -m benchmarks.bench_database_memory PATH_TO_DOC [COPIES_AMOUNT]
+
+PATH_TO_DOC is a Doxygen output directory (containing docbuild/xml), the
+unpickled copies are measured with and without interning their strings
+(see intern_fragment_strings)
+"""
+
+import os
+import pickle
+import sys
+import tracemalloc
+
+if len(sys.argv) < 2:
+    sys.exit(__doc__)
+# obidog.config reads the ObEngine directory when it is imported
+os.environ.setdefault("OBENGINE_GIT_DIRECTORY", sys.argv[1])
+
+from obidog.databases import CppDatabase  # noqa: E402
+from obidog.parsers.cpp_parser import (  # noqa: E402
+    intern_fragment_strings,
+    parse_doxygen_files,
+)
+
+DEFAULT_COPIES_AMOUNT = 300
+
+
+def measure_retained_memory(function) -> tuple[object, int]:
+    tracemalloc.start()
+    result = function()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, memory
+
+
+def unpickle_copies(pickled_database: bytes, copies_amount: int, intern: bool):
+    copies = []
+    for _ in range(copies_amount):
+        database = pickle.loads(pickled_database)
+        if intern:
+            intern_fragment_strings(database)
+        copies.append(database)
+    return copies
+
+
+def main():
+    path_to_doc = sys.argv[1]
+    copies_amount = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_COPIES_AMOUNT
+
+    def parse():
+        cpp_db = CppDatabase()
+        parse_doxygen_files(path_to_doc, cpp_db)
+        return cpp_db
+
+    cpp_db, memory = measure_retained_memory(parse)
+    print(f"parsed database: {memory / 2**20:.1f}MiB")
+    pickled_database = pickle.dumps(cpp_db)
+    for intern in [False, True]:
+        copies, memory = measure_retained_memory(
+            lambda: unpickle_copies(pickled_database, copies_amount, intern)
+        )
+        label = "interned" if intern else "not interned"
+        print(f"{copies_amount} unpickled copies ({label}): {memory / 2**20:.1f}MiB")
+        del copies
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Measures how the Doxygen index parsing time scales with the amount of compounds
+
+Usage (from the repository root):
+    python -m benchmarks.bench_doxygen_index [COMPOUNDS_AMOUNT ...]
+
+A synthetic index.xml (classes with 20 methods each, a namespace with a
+function for each class) is generated for each amount of compounds, the
+time per compound should stay roughly constant as the index grows
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from obidog.parsers.doxygen_index_parser import parse_doxygen_index
+
+DEFAULT_COMPOUNDS_AMOUNTS = [250, 500, 1000, 2000]
+METHODS_PER_CLASS = 20
+REPEATS = 3
+
+
+def make_index_xml(compounds_amount: int) -> str:
+    compounds = []
+    namespace_members = []
+    for class_index in range(compounds_amount):
+        members = "".join(
+            f'<member refid="c{class_index}m{method_index}" kind="function">'
+            f"<name>m{method_index}</name></member>"
+            for method_index in range(METHODS_PER_CLASS)
+        )
+        compounds.append(
+            f'<compound refid="c{class_index}" kind="class">'
+            f"<name>ns::C{class_index}</name>{members}</compound>"
+        )
+        namespace_members.append(
+            f'<member refid="nf{class_index}" kind="function">'
+            f"<name>f{class_index}</name></member>"
+        )
+    compounds.append(
+        f'<compound refid="ns" kind="namespace"><name>ns</name>'
+        f"{''.join(namespace_members)}</compound>"
+    )
+    return f"<doxygenindex>{''.join(compounds)}</doxygenindex>"
+
+
+def bench(compounds_amount: int, directory: str) -> float:
+    xml_path = os.path.join(directory, f"index{compounds_amount}.xml")
+    with open(xml_path, "w") as xml_file:
+        xml_file.write(make_index_xml(compounds_amount))
+    timings = []
+    for _ in range(REPEATS):
+        start_time = time.perf_counter()
+        parse_doxygen_index(xml_path)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+def main():
+    compounds_amounts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_COMPOUNDS_AMOUNTS
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'compounds':>10} {'time (s)':>10} {'us / compound':>14}")
+        for compounds_amount in compounds_amounts:
+            elapsed = bench(compounds_amount, directory)
+            print(
+                f"{compounds_amount:>10} {elapsed:>10.3f} "
+                f"{elapsed / compounds_amount * 1e6:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Compares the C++ declarations splitting functions built on the tokenizer
+with the original character by character implementations
+
+Usage (from the repository root):
+    python -m benchmarks.bench_tokenizer [REPEATS]
+
+The corpus is tests/fixtures/declarations.json (declarations from Doxygen XML
+files, deeply nested templates and randomly generated declarations), both
+implementations must give the same results on it
+"""
+
+import json
+import os
+import sys
+import time
+
+from obidog.parsers.type_parser import (
+    TEMPLATE_AND_FUNCTION_TYPE_EMBED_SYMBOLS,
+    split_root_types,
+    split_unembedded,
+)
+from obidog.parsers.utils.cpp_utils import _split_definition
+
+DECLARATIONS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "fixtures", "declarations.json"
+)
+DEFAULT_REPEATS = 20
+
+
+def original_split_definition(definition: str):
+    stack = [""]
+    i = 0
+    while i + 1 <= len(definition):
+        character = definition[i]
+
+        if character in [" ", ","]:
+            if stack[-1]:
+                stack.append("")
+        elif character == "<":
+            result, pos = original_split_definition(definition[i + 1 : :])
+            if not stack[-1]:
+                stack[-1] = result
+                stack.append("")
+            else:
+                stack.append(result)
+                stack.append("")
+            i += pos
+        elif character == ">":
+            if not stack[-1]:
+                stack.pop()
+            return stack, i + 1
+        else:
+            stack[-1] = stack[-1] + character
+        i += 1
+    if not stack[-1]:
+        stack.pop()
+    return stack, i
+
+
+def original_split_root_types(templated_type: str):
+    inner_template_count = 0
+    segments = []
+    buffer = ""
+    for char in templated_type:
+        if char in ["<", "("]:
+            inner_template_count += 1
+            buffer = buffer + char
+        elif char in [">", ")"]:
+            inner_template_count -= 1
+            buffer = buffer + char
+        elif char == "," and not inner_template_count:
+            segments.append(buffer.strip())
+            buffer = ""
+        else:
+            buffer = buffer + char
+    if buffer.strip():
+        segments.append(buffer.strip())
+    return [segment.strip() for segment in segments]
+
+
+def original_split_unembedded(
+    string: str, sep: str, embed_symbols: list[tuple[str, str]]
+):
+    stack = []
+    segments = []
+    buffer = ""
+    opening_symbols = [sym[0] for sym in embed_symbols]
+    closing_symbols = [sym[1] for sym in embed_symbols]
+    for char in string:
+        if char in opening_symbols:
+            stack.append(char)
+            buffer = buffer + char
+        elif char in closing_symbols:
+            if opening_symbols.index(stack[-1]) != closing_symbols.index(char):
+                raise RuntimeError("unbalanced opening / closing symbols")
+            stack.pop(len(stack) - 1)
+            buffer = buffer + char
+        elif char == sep and not stack:
+            segments.append(buffer.strip())
+            buffer = ""
+        else:
+            buffer = buffer + char
+    if buffer.strip():
+        segments.append(buffer.strip())
+    return [segment.strip() for segment in segments]
+
+
+def is_balanced(cpp_type: str) -> bool:
+    try:
+        original_split_unembedded(
+            cpp_type, ",", TEMPLATE_AND_FUNCTION_TYPE_EMBED_SYMBOLS
+        )
+    except (IndexError, RuntimeError):
+        return False
+    return True
+
+
+def load_corpus() -> dict[str, list[str]]:
+    with open(DECLARATIONS_PATH) as declarations_file:
+        declarations = json.load(declarations_file)
+    types = [declaration["type"] for declaration in declarations]
+    return {
+        "declarations": [declaration["declaration"] for declaration in declarations],
+        "types": types,
+        "balanced types": [cpp_type for cpp_type in types if is_balanced(cpp_type)],
+    }
+
+
+def bench(function, strings: list[str], repeats: int) -> tuple[float, list]:
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        results = [function(string) for string in strings]
+        timings.append(time.perf_counter() - start_time)
+    return min(timings), results
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPEATS
+    corpus = load_corpus()
+    functions = [
+        (
+            "_split_definition",
+            "declarations",
+            lambda definition: original_split_definition(definition)[0],
+            _split_definition,
+        ),
+        (
+            "split_root_types",
+            "types",
+            original_split_root_types,
+            split_root_types,
+        ),
+        (
+            "split_unembedded",
+            "balanced types",
+            lambda cpp_type: original_split_unembedded(
+                cpp_type, ",", TEMPLATE_AND_FUNCTION_TYPE_EMBED_SYMBOLS
+            ),
+            lambda cpp_type: split_unembedded(
+                cpp_type, ",", TEMPLATE_AND_FUNCTION_TYPE_EMBED_SYMBOLS
+            ),
+        ),
+    ]
+    print(f"{'function':>18} {'strings':>8} {'original (ms)':>14} {'new (ms)':>9}")
+    for name, corpus_name, original_function, function in functions:
+        strings = corpus[corpus_name]
+        original_elapsed, original_results = bench(original_function, strings, repeats)
+        elapsed, results = bench(function, strings, repeats)
+        if results != original_results:
+            sys.exit(f"{name} results differ from the original implementation")
+        print(
+            f"{name:>18} {len(strings):>8} "
+            f"{original_elapsed * 1e3:>14.2f} {elapsed * 1e3:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
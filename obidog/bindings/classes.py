@@ -1,4 +1,3 @@
-import copy
 import os
 from dataclasses import dataclass
 
@@ -8,7 +7,7 @@ from obidog.bindings.functions_v2 import create_function_bindings
 from obidog.bindings.template import generate_template_specialization
 from obidog.bindings.utils import fetch_table, make_shorthand, strip_include
 from obidog.config import SOURCE_DIRECTORIES
-from obidog.databases import CppDatabase
+from obidog.databases import CppDatabase, InheritanceGraph
 from obidog.logger import log
 from obidog.models.classes import ClassModel
 from obidog.models.flags import ObidogHook, ObidogHookTrigger
@@ -130,15 +129,16 @@ def generate_methods_bindings(
 ):
     for method in methods.values():
         if isinstance(method, FunctionOverloadModel):
+            overloads = []
             for overload in method.overloads:
-                if overload.flags.nobind:
-                    continue
-                if overload.template:
+                if not overload.flags.nobind and overload.template:
                     generate_templated_method_bindings(
                         cpp_db, body, class_name, lua_name, overload
                     )
                     # Faking deletion of the method overload to avoid it being generated twice
-                    overload.deleted = True
+                    overload = overload.copy(update={"deleted": True})
+                overloads.append(overload)
+            method = method.copy(update={"overloads": overloads})
         if isinstance(method, FunctionModel) and method.template:
             generate_templated_method_bindings(
                 cpp_db, body, class_name, lua_name, method
@@ -296,6 +296,41 @@ def generate_classes_bindings(cpp_db: CppDatabase, classes: dict[str, ClassModel
     }
 
 
+def _specialise_method(
+    method: FunctionModel, specialisation_name: str, specialisation_types: dict
+) -> FunctionModel:
+    """Copies a method of a templated class for one of its specialisations,
+    models that are not affected by the specialisation are shared (the urls
+    and flags, modified later on, are copied)
+    """
+
+    def specialise_type(cpp_type: str) -> str:
+        # If the type is one of the class template types
+        # we replace it by the specialized type hint
+        return str(
+            parse_cpp_type(cpp_type).traverse(
+                lambda ptype: specialisation_types.get(ptype, ptype)
+            )
+        )
+
+    parameters = []
+    for parameter in method.parameters:
+        parameter_type = specialise_type(parameter.type)
+        if parameter_type != parameter.type:
+            parameter = parameter.copy(update={"type": parameter_type})
+        parameters.append(parameter)
+    return method.copy(
+        update={
+            "from_class": specialisation_name,
+            "parameters": parameters,
+            "urls": method.urls.copy(),
+            "flags": method.flags.copy(deep=True),
+            # Adding return type (specialized class) for constructors
+            "return_type": specialise_type(method.return_type or specialisation_name),
+        }
+    )
+
+
 def generate_class_template_specialisations(cpp_db: CppDatabase):
     specialisations = {}
     specialisations_merges = {}
@@ -309,32 +344,27 @@ def generate_class_template_specialisations(cpp_db: CppDatabase):
             specialisation_typeset,
         ) in class_value.flags.template_hints.items():
             for specialisation_types in specialisation_typeset:
-                specialisation = copy.deepcopy(class_value)
-                specialisation.name = (
-                    f"{class_value.name}<{', '.join(specialisation_types.values())}>"
+                # Specialisations share the models of the templated class
+                # they do not modify (attributes, private methods, ...)
+                name = f"{class_value.name}<{', '.join(specialisation_types.values())}>"
+                constructors = [
+                    _specialise_method(constructor, name, specialisation_types)
+                    for constructor in class_value.constructors
+                ]
+                methods = {
+                    method_name: _specialise_method(method, name, specialisation_types)
+                    for method_name, method in class_value.methods.items()
+                }
+                specialisation = class_value.copy(
+                    update={
+                        "name": name,
+                        "flags": class_value.flags.copy(deep=True),
+                        "constructors": constructors,
+                        "methods": methods,
+                    }
                 )
                 specialisation.flags.rename = specialisation_name
-                constructors_and_methods: list[
-                    FunctionModel
-                ] = specialisation.constructors + list(specialisation.methods.values())
-                for method in constructors_and_methods:
-                    method.from_class = specialisation.name
-                    for parameter in method.parameters:
-                        parameter_type = parse_cpp_type(parameter.type)
-                        # If the parameter type is one of the class template type
-                        # we replace it by the specialized type hint
-                        parameter_type.traverse(
-                            lambda ptype: specialisation_types.get(ptype, ptype)
-                        )
-                        parameter.type = str(parameter_type)
-                    # Adding return type (specialized class) for constructors
-                    if not method.return_type:
-                        method.return_type = specialisation.name
-                    return_type = parse_cpp_type(method.return_type)
-                    return_type.traverse(
-                        lambda rtype: specialisation_types.get(rtype, rtype)
-                    )
-                    method.return_type = str(return_type)
+                for method in constructors + list(methods.values()):
                     if method.flags.merge_template_specialisations_as:
                         if (
                             not method.flags.merge_template_specialisations_as
@@ -358,10 +388,16 @@ def generate_class_template_specialisations(cpp_db: CppDatabase):
             name=specialisations_merge_name, namespace=specialisations[0].namespace
         )
         specialisations_copy = [
-            copy.deepcopy(specialisation) for specialisation in specialisations
+            specialisation.copy(
+                update={
+                    "urls": specialisation.urls.copy(),
+                    "flags": specialisation.flags.copy(
+                        update={"rename": specialisations_merge_name}, deep=True
+                    ),
+                }
+            )
+            for specialisation in specialisations
         ]
-        for specialisation in specialisations_copy:
-            specialisation.flags.rename = specialisations_merge_name
         cpp_db.functions[specialisation_fqn] = FunctionOverloadModel(
             name=specialisations_merge_name,
             namespace=specialisations[0].namespace,
@@ -372,29 +408,36 @@ def generate_class_template_specialisations(cpp_db: CppDatabase):
         )
 
 
-def copy_parent_bases(cpp_db: CppDatabase, classes: dict[str, ClassModel]):
-    def copy_parent_bases_for_one_class(cpp_db, class_value):
+def copy_parent_bases(
+    cpp_db: CppDatabase, classes: dict[str, ClassModel], graph: InheritanceGraph
+):
+    # Inheritance set of each class (computed from its own bases only once)
+    inheritance_sets = {}
+
+    def copy_parent_bases_for_one_class(class_fqn: str):
+        if class_fqn in inheritance_sets:
+            return inheritance_sets[class_fqn]
+        inheritance_sets[class_fqn] = []  # guards against inheritance cycles
         inheritance_set = []
-        for base in class_value.get_bases():
+        for base in cpp_db.classes[class_fqn].get_bases():
             if any(
                 base.startswith(f"{src['namespace']}::") for src in SOURCE_DIRECTORIES
             ):
                 inheritance_set.append(base)
             strip_template_base = base.split("<")[0]
             if strip_template_base in cpp_db.classes:
-                parent_bases = copy_parent_bases_for_one_class(
-                    cpp_db, cpp_db.classes[strip_template_base]
-                )
-                inheritance_set += parent_bases
-        return inheritance_set
+                inheritance_set += copy_parent_bases_for_one_class(strip_template_base)
+        inheritance_sets[class_fqn] = list(dict.fromkeys(inheritance_set))
+        return inheritance_sets[class_fqn]
 
-    for class_value in classes.values():
-        class_value.bases = list(
-            dict.fromkeys(copy_parent_bases_for_one_class(cpp_db, class_value))
-        )
+    for class_fqn, class_value in graph.sort(classes):
+        bases = copy_parent_bases_for_one_class(class_fqn)
+        if bases != class_value.bases:
+            cpp_db.writable("classes", class_fqn).bases = bases
 
 
-def apply_inherit_hook(classes: dict[str, ClassModel]):
+def apply_inherit_hook(cpp_db: CppDatabase, graph: InheritanceGraph):
+    classes = cpp_db.classes
     for class_value in classes.values():
         if any(
             hook.trigger == ObidogHookTrigger.Inherit
@@ -404,87 +447,121 @@ def apply_inherit_hook(classes: dict[str, ClassModel]):
                 name=class_value.name,
                 namespace=class_value.namespace,
             )
-            child_classes = [
-                child_class
-                for child_class in classes.values()
-                if full_class_name in child_class.get_bases(strip_template_types=True)
-            ]
+            child_classes_fqns = graph.children.get(full_class_name, [])
             for hook in class_value.flags.hooks:
                 if hook.trigger == ObidogHookTrigger.Inherit:
-                    for child_class in child_classes:
-                        child_class_fqn = make_fqn(
-                            name=child_class.name,
-                            namespace=child_class.namespace,
+                    for child_class_fqn in child_classes_fqns:
+                        bind_hook = ObidogHook(
+                            trigger=ObidogHookTrigger.Bind,
+                            code=partial_format(hook.code, parentclass=full_class_name),
                         )
-                        child_class.flags.hooks |= {
-                            ObidogHook(
-                                trigger=ObidogHookTrigger.Bind,
-                                code=partial_format(
-                                    hook.code, parentclass=full_class_name
-                                ),
+                        # Hooks lists can be shared by several flags, never
+                        # modified in place
+                        if bind_hook not in classes[child_class_fqn].flags.hooks:
+                            child_class = cpp_db.writable(
+                                "classes", child_class_fqn, "flags"
                             )
-                        }
+                            child_class.flags.hooks = [
+                                *child_class.flags.hooks,
+                                bind_hook,
+                            ]
+
+
+def _copy_inherited_method(
+    method: FunctionUniformModel, update: dict = None
+) -> FunctionUniformModel:
+    """Copies a method of a parent class for one of its children, models that
+    are modified in place later on (urls and flags) are copied, the other ones
+    are shared
+    """
+    update = dict(update or {})
+    if isinstance(method, FunctionOverloadModel):
+        update["overloads"] = [
+            _copy_inherited_method(overload) for overload in method.overloads
+        ]
+    else:
+        update["urls"] = method.urls.copy()
+    update["flags"] = method.flags.copy(deep=True)
+    return method.copy(update=update)
 
 
-def copy_parent_bindings(cpp_db, classes: dict[str, ClassModel]):
-    for class_value in classes.values():
+def copy_parent_bindings(
+    cpp_db: CppDatabase, classes: dict[str, ClassModel], graph: InheritanceGraph
+):
+    # Parents come first so they already hold the items of their own parents
+    for class_fqn, class_value in graph.sort(classes):
         if class_value.flags.copy_parent_items:
+            class_value = cpp_db.writable("classes", class_fqn)
             for base in class_value.get_bases(strip_template_types=True):
                 base_value = cpp_db.classes[base]
-                base_methods = copy.deepcopy(base_value.methods)
-                for base_method in base_methods.values():
-                    base_method.from_class = class_value.name
-                    base_method.namespace = class_value.namespace
+                base_methods = {
+                    method_name: _copy_inherited_method(
+                        method,
+                        {
+                            "from_class": class_value.name,
+                            "namespace": class_value.namespace,
+                        },
+                    )
+                    for method_name, method in base_value.methods.items()
+                }
                 base_methods.update(class_value.methods)
                 class_value.methods = base_methods
 
 
-def flag_abstract_classes(cpp_db, classes):
-    for class_value in classes.values():
+def _get_all_methods(class_value: ClassModel) -> list[FunctionUniformModel]:
+    return [*class_value.private_methods.values(), *class_value.methods.values()]
+
+
+def _get_abstract_methods_names(class_value: ClassModel) -> set[str]:
+    return {
+        method.name
+        for method in _get_all_methods(class_value)
+        if isinstance(method, FunctionModel) and method.abstract
+    }
+
+
+def _get_implemented_methods_names(class_value: ClassModel) -> set[str]:
+    # TODO: Better implementation for overloads
+    return {
+        method.name
+        for method in _get_all_methods(class_value)
+        if (isinstance(method, FunctionModel) and not method.abstract)
+        or (
+            isinstance(method, FunctionOverloadModel)
+            and any(not overload.abstract for overload in method.overloads)
+        )
+    }
+
+
+def flag_abstract_classes(
+    cpp_db: CppDatabase, classes: dict[str, ClassModel], graph: InheritanceGraph
+):
+    # Parents come first so their abstract flag is final when checking children
+    abstract_names = {}
+    implemented_names = {}
+    for class_fqn, class_value in graph.sort(classes):
         class_bases = class_value.get_bases(discard_template_types=True)
         if not class_value.abstract and any(
             cpp_db.classes[base].abstract for base in class_bases
         ):
-            bases = [cpp_db.classes[base] for base in class_bases]
-            bases = [base for base in bases if base.abstract]
-            abstract_methods = [
-                method
-                for base in bases
-                for method in [*base.private_methods.values(), *base.methods.values()]
-                if isinstance(method, FunctionModel) and method.abstract
-            ]
-            abstract_methods_names = [method.name for method in abstract_methods]
-            # TODO: Better implementation for overloads
-            implemented_methods = [
-                method
-                for method in [
-                    *class_value.private_methods.values(),
-                    *class_value.methods.values(),
-                ]
-                if isinstance(method, FunctionModel)
-                and method.name in abstract_methods_names
-                and not method.abstract
-            ]
-            implemented_methods += [
-                method.overloads[0]
-                for method in [
-                    *class_value.private_methods.values(),
-                    *class_value.methods.values(),
-                ]
-                if isinstance(method, FunctionOverloadModel)
-                and method.name in abstract_methods_names
-                and any(not overload.abstract for overload in method.overloads)
-            ]
-            implemented_methods += [
-                method
-                for parent_class in [cpp_db.classes[base] for base in class_bases]
-                for method in [
-                    *parent_class.private_methods.values(),
-                    *parent_class.methods.values(),
-                ]
-                if method.name in abstract_methods_names and not method.abstract
-            ]
-            if set(abstract_methods_names) - set(
-                method.name for method in implemented_methods
-            ):
-                class_value.abstract = True
+            for class_name in [class_fqn, *class_bases]:
+                if class_name not in abstract_names:
+                    class_model = cpp_db.classes[class_name]
+                    abstract_names[class_name] = _get_abstract_methods_names(
+                        class_model
+                    )
+                    implemented_names[class_name] = _get_implemented_methods_names(
+                        class_model
+                    )
+            inherited_abstract_methods = set().union(
+                *(
+                    abstract_names[base]
+                    for base in class_bases
+                    if cpp_db.classes[base].abstract
+                )
+            )
+            implemented_methods = set().union(
+                *(implemented_names[name] for name in [class_fqn, *class_bases])
+            )
+            if inherited_abstract_methods - implemented_methods:
+                cpp_db.writable("classes", class_fqn).abstract = True
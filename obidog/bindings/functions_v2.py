@@ -14,7 +14,7 @@ from obidog.models.functions import (
     FunctionUniformModel,
     ParameterModel,
 )
-from obidog.parsers.type_parser import parse_cpp_type
+from obidog.parsers.type_parser import CppQualifiers, parse_cpp_type
 from obidog.utils.cpp_utils import make_fqn
 
 REACTIVE_ATTRIBUTE_TEMPLATE = "sol::property({function_call})"
@@ -93,11 +93,11 @@ def create_all_default_parameter_specialisations(
             break
         static_part_index += 1
     static_part = [
-        ParameterModel(type=parameter.type, name=parameter.name)
+        ParameterModel.build(type=parameter.type, name=parameter.name)
         for parameter in function_value.parameters[0:static_part_index]
     ]
     specialisations.append(
-        BindableFunctionModel(
+        BindableFunctionModel.build(
             **(
                 function_value.__dict__
                 | {"parameters": static_part, "requires_call_wrapper": True}
@@ -106,11 +106,11 @@ def create_all_default_parameter_specialisations(
     )
     for i in range(static_part_index, len(function_value.parameters)):
         parameter_set = static_part + [
-            ParameterModel(type=parameter.type, name=parameter.name)
+            ParameterModel.build(type=parameter.type, name=parameter.name)
             for parameter in function_value.parameters[static_part_index : i + 1]
         ]
         specialisations.append(
-            BindableFunctionModel(
+            BindableFunctionModel.build(
                 **(
                     function_value.__dict__
                     | {"parameters": parameter_set, "requires_call_wrapper": True}
@@ -155,7 +155,7 @@ def make_bindable_function_model(function_value: FunctionUniformModel):
         elif not function_value.replacement:
             function_call = f"self->{function_value.name}"
             prefix_call_args = [
-                ParameterModel(
+                ParameterModel.build(
                     name="self",
                     type=f"{class_fqn}*",
                 )
@@ -168,7 +168,7 @@ def make_bindable_function_model(function_value: FunctionUniformModel):
         existing_attributes.update({"name": function_value.flags.rename})
 
     # Build BindableFunctionModel with additional infos
-    return BindableFunctionModel(
+    return BindableFunctionModel.build(
         **existing_attributes,
         fqn=fqn,
         function_call=function_call,
@@ -225,9 +225,11 @@ def generate_function_specialisations(
             and MetaTag.NonCopyable.value
             in cpp_db.classes[parsed_return_type.type].flags.meta
         ):
-            parsed_return_type.qualifiers.prefix_qualifiers = ["const"]
-            parsed_return_type.qualifiers.postfix_qualifiers = ["*"]
-            ext_function_value.return_type = str(parsed_return_type)
+            ext_function_value.return_type = str(
+                parsed_return_type.with_qualifiers(
+                    CppQualifiers(prefix_qualifiers=["const"], postfix_qualifiers=["*"])
+                )
+            )
             ext_function_value.requires_call_wrapper = True
             ext_function_value.call_prefix = "&"
 
@@ -239,7 +241,7 @@ def generate_function_specialisations(
                 bind_name,
                 template_hints,
             ) in function_value.flags.template_hints.items():
-                template_specialisation_base = BindableFunctionModel(
+                template_specialisation_base = BindableFunctionModel.build(
                     **(
                         ext_function_value.__dict__
                         | {"name": bind_name, "requires_static_cast": True}
@@ -250,7 +252,7 @@ def generate_function_specialisations(
                         generate_template_specialization(function_value, template_hint)
                     )
                     specialisations.append(
-                        BindableFunctionModel(
+                        BindableFunctionModel.build(
                             **(
                                 template_specialisation_base.__dict__
                                 | template_specialisation_with_hints.__dict__
@@ -15,6 +15,7 @@ from obidog.bindings.enums import generate_enums_bindings
 from obidog.bindings.flavours import sol3 as flavour
 from obidog.bindings.functions import generate_functions_bindings
 from obidog.bindings.globals import generate_globals_bindings
+from obidog.bindings.output import list_output_files, write_generated_files
 from obidog.bindings.utils import strip_include, strip_qualifiers_from_type
 from obidog.config import (
     BINDINGS_CONFIG_FILE,
@@ -23,7 +24,8 @@ from obidog.config import (
     SOURCE_DIRECTORIES,
     SOURCE_DIRECTORIES_BY_OUTPUT,
 )
-from obidog.databases import CppDatabase
+from obidog.context import GenerationContext
+from obidog.databases import CppDatabase, InheritanceGraph
 from obidog.logger import log
 from obidog.models.flags import MetaTag
 from obidog.models.functions import (
@@ -35,11 +37,8 @@ from obidog.models.functions import (
 from obidog.models.namespace import NamespaceModel
 from obidog.parsers.type_parser import parse_cpp_type
 from obidog.parsers.utils.cpp_utils import parse_definition
-from obidog.utils.cpp_utils import make_fqn
 from obidog.utils.string_utils import format_filename, format_name
-from obidog.wrappers.clangformat_wrapper import clang_format_files
 
-GENERATE_BINDINGS = False
 BINDINGS_INCLUDE_TEMPLATE = """
 #pragma once
 
@@ -85,8 +84,25 @@ def match_namespace_with_source(namespace):
     )[0]
 
 
+def _find_nearest_namespace(cpp_db: CppDatabase, scope: str) -> str | None:
+    """Finds the closest namespace containing the given scope
+    (the root namespace is only used for symbols declared directly in it)
+    """
+    last_namespace = scope
+    run_once_for_root_namespace = True
+    while last_namespace or run_once_for_root_namespace:
+        run_once_for_root_namespace = False
+        if last_namespace in cpp_db.namespaces:
+            return last_namespace
+        last_namespace = "::".join(last_namespace.split("::")[:-1:])
+    return None
+
+
 def group_bindings_by_namespace(cpp_db: CppDatabase):
     group_by_namespace = defaultdict(NamespaceModel)
+    # Symbols are read from the namespaces index of each category, the nearest
+    # namespace is resolved once per namespace
+    nearest_namespaces = {}
     for item_type in [
         "classes",
         "enums",
@@ -95,19 +111,17 @@ def group_bindings_by_namespace(cpp_db: CppDatabase):
         "typedefs",
         "namespaces",
     ]:
-        for item_name, item_value in getattr(cpp_db, item_type).items():
-            strip_template = item_name.split("<")[0]
-            last_namespace = "::".join(strip_template.split("::")[:-1:])
-            run_once_for_root_namespace = item_name != ""  # ignore root namespace
-            while last_namespace or run_once_for_root_namespace:
-                run_once_for_root_namespace = False
-                if last_namespace in cpp_db.namespaces:
-                    getattr(group_by_namespace[last_namespace], item_type)[
-                        item_name
-                    ] = item_value
-                    break
-                else:
-                    last_namespace = "::".join(last_namespace.split("::")[:-1:])
+        items = getattr(cpp_db, item_type)
+        for namespace in items.by_namespace:
+            scope = namespace or ""
+            if scope not in nearest_namespaces:
+                nearest_namespaces[scope] = _find_nearest_namespace(cpp_db, scope)
+            scope_items = items.in_namespace(namespace)
+            scope_items.pop("", None)  # ignore root namespace
+            if nearest_namespaces[scope] is not None and scope_items:
+                getattr(
+                    group_by_namespace[nearest_namespaces[scope]], item_type
+                ).update(scope_items)
     for namespace_name, namespace in group_by_namespace.items():
         # Filling missing information
         namespace.description = cpp_db.namespaces[namespace_name].description
@@ -119,7 +133,7 @@ def group_bindings_by_namespace(cpp_db: CppDatabase):
     return group_by_namespace
 
 
-def make_bindings_header(path, namespace, objects):
+def make_bindings_header(context: GenerationContext, path, namespace, objects):
     source = match_namespace_with_source(namespace)
     location = LOCATIONS[source["output_location"]]["headers"]
     inc_out = os.path.join(OUTPUT_DIRECTORY, location, path)
@@ -128,48 +142,40 @@ def make_bindings_header(path, namespace, objects):
         f"void load_{object_name['bindings']}({state_view} state);"
         for object_name in objects
     ]
-    with open(inc_out, "w") as class_binding:
-        class_binding.write(
-            BINDINGS_INCLUDE_TEMPLATE.format(
-                namespace=f"{namespace}::bindings",
-                bindings_functions_signatures="\n".join(
-                    f"{binding_function}" for binding_function in bindings_functions
-                ),
-                state_view_forward_decl_ns="::".join(state_view.split("::")[:-1:]),
-                state_view_forward_decl_cls=state_view.split("::")[-1],
-            )
-        )
-
-
-FILES_TO_FORMAT = []
+    context.generated_files[inc_out] = BINDINGS_INCLUDE_TEMPLATE.format(
+        namespace=f"{namespace}::bindings",
+        bindings_functions_signatures="\n".join(
+            f"{binding_function}" for binding_function in bindings_functions
+        ),
+        state_view_forward_decl_ns="::".join(state_view.split("::")[:-1:]),
+        state_view_forward_decl_cls=state_view.split("::")[-1],
+    )
 
 
-def make_bindings_sources(namespace, path, bindings_header, *datasets):
+def make_bindings_sources(
+    context: GenerationContext, namespace, path, bindings_header, *datasets
+):
     source = match_namespace_with_source(namespace)
     location = LOCATIONS[source["output_location"]]["sources"]
     if source["structure_policy"] == "namespaces":
         src_out = os.path.join(OUTPUT_DIRECTORY, location, path)
-        with open(src_out, "w") as bindings_source:
-            all_includes = set(
-                includes
-                for data in datasets
-                for includes in data["includes"]
-                if not includes.endswith(".cpp")
-            )
-            all_functions = [
-                functions
-                for data in datasets
-                for functions in data["bindings_functions"]
-            ]
-            bindings_source.write(
-                BINDINGS_SRC_TEMPLATE.format(
-                    bindings_header=bindings_header,
-                    bindings_config_file=BINDINGS_CONFIG_FILE,
-                    namespace=f"{namespace}::bindings",
-                    includes="\n".join(all_includes),
-                    bindings_functions="\n".join(all_functions),
-                )
-            )
+        # Includes are deduplicated in order of appearance (reproducible output)
+        all_includes = dict.fromkeys(
+            includes
+            for data in datasets
+            for includes in data["includes"]
+            if not includes.endswith(".cpp")
+        )
+        all_functions = [
+            functions for data in datasets for functions in data["bindings_functions"]
+        ]
+        context.generated_files[src_out] = BINDINGS_SRC_TEMPLATE.format(
+            bindings_header=bindings_header,
+            bindings_config_file=BINDINGS_CONFIG_FILE,
+            namespace=f"{namespace}::bindings",
+            includes="\n".join(all_includes),
+            bindings_functions="\n".join(all_functions),
+        )
     elif source["structure_policy"] == "classes":
         elements = [
             {**obj, "body": binding_function, "includes": includes}
@@ -189,37 +195,27 @@ def make_bindings_sources(namespace, path, bindings_header, *datasets):
             )
             src_filename = os.path.basename(element_path)
             src_out = os.path.join(src_out_base, f"{format_filename(src_filename)}.cpp")
-            os.makedirs(src_out_base, exist_ok=True)
-            with open(src_out, "w") as bindings_source:
-                bindings_source.write(
-                    BINDINGS_SRC_TEMPLATE.format(
-                        bindings_header=bindings_header,
-                        bindings_config_file=BINDINGS_CONFIG_FILE,
-                        namespace=f"{namespace}::bindings",
-                        includes=element["includes"]
-                        if not element["includes"].endswith(".cpp")
-                        else "",
-                        bindings_functions=element["body"],
-                    )
-                )
-            FILES_TO_FORMAT.append(src_out)
+            context.generated_files[src_out] = BINDINGS_SRC_TEMPLATE.format(
+                bindings_header=bindings_header,
+                bindings_config_file=BINDINGS_CONFIG_FILE,
+                namespace=f"{namespace}::bindings",
+                includes=element["includes"]
+                if not element["includes"].endswith(".cpp")
+                else "",
+                bindings_functions=element["body"],
+            )
 
 
 def generate_bindings_for_namespace(
-    cpp_db: CppDatabase, namespace_name: str, namespace: NamespaceModel
+    context: GenerationContext,
+    cpp_db: CppDatabase,
+    namespace_name: str,
+    namespace: NamespaceModel,
 ):
     log.debug(f"Generating bindings for namespace {namespace_name}")
     split_name = "/".join(namespace_name.split("::"))
     source = match_namespace_with_source(namespace_name)
     location = LOCATIONS[source["output_location"]]
-    os.makedirs(
-        os.path.join(OUTPUT_DIRECTORY, location["headers"], split_name),
-        exist_ok=True,
-    )
-    os.makedirs(
-        os.path.join(OUTPUT_DIRECTORY, location["sources"], split_name),
-        exist_ok=True,
-    )
 
     class_bindings = generate_classes_bindings(cpp_db, namespace.classes)
     enum_bindings = generate_enums_bindings(namespace_name, namespace.enums)
@@ -236,8 +232,10 @@ def generate_bindings_for_namespace(
     bindings_header = os.path.join(
         split_name, f"{format_filename(namespace_name.split('::')[-1])}.hpp"
     ).replace(os.path.sep, "/")
-    if GENERATE_BINDINGS:
-        make_bindings_header(bindings_header, namespace_name, generated_objects)
+    if context.write_files:
+        make_bindings_header(
+            context, bindings_header, namespace_name, generated_objects
+        )
     namespace_data = {
         "includes": namespace.flags.additional_includes
         if namespace.flags.additional_includes
@@ -247,13 +245,12 @@ def generate_bindings_for_namespace(
     bindings_source = os.path.join(
         split_name, f"{format_filename(namespace_name.split('::')[-1])}.cpp"
     ).replace(os.path.sep, "/")
-    FILES_TO_FORMAT.append(os.path.join(location["headers"], bindings_header))
-    FILES_TO_FORMAT.append(os.path.join(location["sources"], bindings_source))
-    if GENERATE_BINDINGS:
+    if context.write_files:
         bindings_header_include_path = strip_include(
             os.path.join(location["headers"], bindings_header)
         ).replace("\\", "/")
         make_bindings_sources(
+            context,
             namespace_name,
             bindings_source,
             bindings_header_include_path,
@@ -306,22 +303,19 @@ class BindingIndexEntry:
 
 
 # LATER: Generate bindings shorthands
-def generated_bindings_index(source_name, generated_objects):
+def generated_bindings_index(source_name, generated_objects, generated_files):
     log.info("Generating Bindings Index...")
     body = []
     include_list = []
     bindings_headers_location = LOCATIONS[source_name]["headers"]
-    for current_dir, _, files in os.walk(
-        os.path.join(OUTPUT_DIRECTORY, bindings_headers_location)
+    for fp in list_output_files(
+        generated_files,
+        OUTPUT_DIRECTORY,
+        os.path.join(OUTPUT_DIRECTORY, bindings_headers_location),
+        ".hpp",
     ):
-        for f in files:
-            if f.endswith(".hpp"):
-                fp = (
-                    os.path.join(current_dir, f)
-                    .split(OUTPUT_DIRECTORY)[1]
-                    .lstrip("/\\")
-                )
-                include_list.append(strip_include(fp).replace("\\", "/"))
+        fp = fp.split(OUTPUT_DIRECTORY)[1].lstrip("/\\")
+        include_list.append(strip_include(fp).replace("\\", "/"))
     body += [f"#include <{path}>" for path in include_list]
     body += [
         f"#include <{flavour.INCLUDE_FILE}>",
@@ -355,7 +349,21 @@ def generated_bindings_index(source_name, generated_objects):
     return "\n".join(body)
 
 
-def apply_proxies(cpp_db: CppDatabase, functions):
+def apply_proxies(
+    cpp_db: CppDatabase, functions, namespaces: dict[str, NamespaceModel]
+):
+    def make_writable(category: str, key: str, *fields: str):
+        # Namespaces were grouped before the element is copied, they must
+        # reference the copy that is patched
+        previous = getattr(cpp_db, category)[key]
+        element = cpp_db.writable(category, key, *fields)
+        if element is not previous:
+            for namespace in namespaces.values():
+                elements = getattr(namespace, category)
+                if elements.get(key) is previous:
+                    elements[key] = element
+        return element
+
     def find_and_requalify_if_needed(
         proxy_name: str, base_function_model: FunctionModel
     ) -> FunctionModel:
@@ -373,28 +381,15 @@ def apply_proxies(cpp_db: CppDatabase, functions):
 
         if proxy_name in cpp_db.functions:
             cpp_db.functions[proxy_name] = requalify_if_needed(
-                cpp_db.functions[proxy_name]
+                make_writable("functions", proxy_name)
             )
             return cpp_db.functions[proxy_name]
-        all_methods = {
-            make_fqn(
-                name=method_value.name,
-                namespace=method_value.namespace,
-                from_class=method_value.from_class,
-            ): method_value
-            for class_value in cpp_db.classes.values()
-            for method_value in class_value.methods.values()
-        }
-        if proxy_name in all_methods:
-            method_value = all_methods[proxy_name]
-            class_fqn = make_fqn(
-                name=method_value.from_class,
-                namespace=method_value.namespace,
-            )
-            cpp_db.classes[class_fqn].methods[method_value.name] = requalify_if_needed(
-                method_value
-            )
-            return cpp_db.classes[class_fqn].methods[method_value.name]
+        method_location = cpp_db.find_method(proxy_name)
+        if method_location is not None:
+            class_key, method_key = method_location
+            methods = make_writable("classes", class_key, "methods").methods
+            methods[method_key] = requalify_if_needed(methods[method_key])
+            return methods[method_key]
         raise RuntimeError(f"Could not find proxied method '{proxy_name}'")
 
     for function_name, function_value in functions.items():
@@ -419,7 +414,13 @@ def apply_proxies(cpp_db: CppDatabase, functions):
 
 
 def discard_placeholders(cpp_db):
-    for class_value in cpp_db.classes.values():
+    for class_name, class_value in list(cpp_db.classes.items()):
+        if not any(
+            isinstance(method, FunctionPlaceholderModel)
+            for method in class_value.methods.values()
+        ):
+            continue
+        class_value = cpp_db.writable("classes", class_name)
         class_value.methods = {
             method_name: method
             for method_name, method in class_value.methods.items()
@@ -439,85 +440,152 @@ def inject_ref_in_function_parameters(cpp_db: CppDatabase):
     """
 
     def find_ref_from_type(typename: str):
-        return cpp_db.classes.get(strip_qualifiers_from_type(typename), None)
-
-    def fill_parameters_refs_for_function(function: FunctionUniformModel):
+        class_name = strip_qualifiers_from_type(typename)
+        if class_name not in cpp_db.classes:
+            return None
+        # Referenced classes are flagged as abstract later on, the parameters
+        # must reference the models that are modified
+        return cpp_db.writable("classes", class_name)
+
+    def get_parameters(function: FunctionUniformModel):
         if isinstance(function, FunctionModel):
-            for parameter in function.parameters:
-                parameter.ref = find_ref_from_type(parameter.type)
+            return function.parameters
         elif isinstance(function, FunctionOverloadModel):
-            for overload in function.overloads:
-                for parameter in overload.parameters:
-                    parameter.ref = find_ref_from_type(parameter.type)
+            return [
+                parameter
+                for overload in function.overloads
+                for parameter in overload.parameters
+            ]
         else:
             raise NotImplementedError()
 
-    for function in cpp_db.functions.values():
-        fill_parameters_refs_for_function(function)
+    def are_parameters_refs_outdated(functions: list[FunctionUniformModel]):
+        return any(
+            parameter.ref is not find_ref_from_type(parameter.type)
+            for function in functions
+            for parameter in get_parameters(function)
+        )
 
-    for class_value in cpp_db.classes.values():
-        for method in class_value.methods.values():
-            fill_parameters_refs_for_function(method)
-        for constructor in class_value.constructors:
-            fill_parameters_refs_for_function(constructor)
+    def fill_parameters_refs(functions: list[FunctionUniformModel]):
+        for function in functions:
+            for parameter in get_parameters(function):
+                parameter.ref = find_ref_from_type(parameter.type)
+
+    for function_name, function in list(cpp_db.functions.items()):
+        if are_parameters_refs_outdated([function]):
+            fill_parameters_refs(
+                [
+                    cpp_db.writable(
+                        "functions", function_name, "parameters", "overloads.parameters"
+                    )
+                ]
+            )
+
+    for class_name, class_value in list(cpp_db.classes.items()):
+        if are_parameters_refs_outdated(
+            [*class_value.methods.values(), *class_value.constructors]
+        ):
+            class_value = cpp_db.writable(
+                "classes",
+                class_name,
+                "methods.parameters",
+                "methods.overloads.parameters",
+                "constructors.parameters",
+            )
+            fill_parameters_refs(
+                [*class_value.methods.values(), *class_value.constructors]
+            )
+
+
+def make_renamed_functions_writable(cpp_db: CppDatabase):
+    """Bindings generation gives their Lua name to the functions with a 'rename'
+    flag in place (the documentation then reads it from the database)
+    """
+
+    def is_renamed(functions: list[FunctionUniformModel]):
+        return any(
+            function_model.flags.rename
+            for function_value in functions
+            for function_model in [
+                function_value,
+                *getattr(function_value, "overloads", []),
+            ]
+        )
+
+    for function_name, function_value in list(cpp_db.functions.items()):
+        if is_renamed([function_value]):
+            cpp_db.writable("functions", function_name, "overloads")
+    for class_name, class_value in list(cpp_db.classes.items()):
+        if is_renamed([*class_value.methods.values(), *class_value.constructors]):
+            cpp_db.writable("classes", class_name, "methods.overloads", "constructors")
 
 
 # See: https://github.com/ThePhD/sol2/issues/1259
 def patch_const_ref_return_type(cpp_db: CppDatabase):
-    all_functions = [function_value for function_value in cpp_db.functions.values()] + [
-        method_value
-        for class_value in cpp_db.classes.values()
-        for method_value in class_value.methods.values()
-    ]
-    all_functions_overloads = [
-        function_value
-        for function_value in all_functions
-        if isinstance(function_value, FunctionOverloadModel)
-    ]
-    all_functions = [
-        function_value
-        for function_value in all_functions
-        if not isinstance(function_value, FunctionOverloadModel)
-    ]
-    all_functions += [
-        overload
-        for function_value in all_functions_overloads
-        for overload in function_value.overloads
-    ]
+    def get_functions_models(functions: list[FunctionUniformModel]):
+        return [
+            function_model
+            for function_value in functions
+            for function_model in getattr(function_value, "overloads", [function_value])
+        ]
 
-    for function_value in all_functions:
+    def returns_non_copyable_const_ref(function_value: FunctionModel) -> bool:
         parsed_ret_type = parse_cpp_type(function_value.return_type)
-        if parsed_ret_type.qualifiers.is_const_ref():
-            if (
-                parsed_ret_type.type in cpp_db.classes
-                and MetaTag.NonCopyable.value
-                in cpp_db.classes[parsed_ret_type.type].flags.meta
-            ):
-                arg_list = [
-                    f"{param.type} {param.name}" for param in function_value.parameters
-                ]
-                arg_names = [param.name for param in function_value.parameters]
-                if function_value.from_class:
-                    class_name = "::".join(
-                        (
-                            [
-                                elem
-                                for elem in function_value.namespace.split("::")
-                                if elem
-                            ]
-                            + [function_value.from_class]
-                        )
-                    )
-                    arg_list.insert(0, f"{class_name}* self")
-                    function_value.flags.bind_code = (
-                        f"[]({', '.join(arg_list)})"
-                        f"{{ return &self->{function_value.name}({', '.join(arg_names)}); }}"
+        return (
+            parsed_ret_type.qualifiers.is_const_ref()
+            and parsed_ret_type.type in cpp_db.classes
+            and MetaTag.NonCopyable.value
+            in cpp_db.classes[parsed_ret_type.type].flags.meta
+        )
+
+    def patch_functions(functions: list[FunctionUniformModel]):
+        for function_value in get_functions_models(functions):
+            if not returns_non_copyable_const_ref(function_value):
+                continue
+            arg_list = [
+                f"{param.type} {param.name}" for param in function_value.parameters
+            ]
+            arg_names = [param.name for param in function_value.parameters]
+            if function_value.from_class:
+                class_name = "::".join(
+                    (
+                        [elem for elem in function_value.namespace.split("::") if elem]
+                        + [function_value.from_class]
                     )
-                else:
-                    function_value.flags.bind_code = (
-                        f"[]({', '.join(arg_list)})"
-                        f"{{ return &{function_value.name}({', '.join(arg_names)}); }}"
+                )
+                arg_list.insert(0, f"{class_name}* self")
+                function_value.flags.bind_code = (
+                    f"[]({', '.join(arg_list)})"
+                    f"{{ return &self->{function_value.name}({', '.join(arg_names)}); }}"
+                )
+            else:
+                function_value.flags.bind_code = (
+                    f"[]({', '.join(arg_list)})"
+                    f"{{ return &{function_value.name}({', '.join(arg_names)}); }}"
+                )
+
+    for function_name, function_value in list(cpp_db.functions.items()):
+        if any(
+            returns_non_copyable_const_ref(function_model)
+            for function_model in get_functions_models([function_value])
+        ):
+            patch_functions(
+                [
+                    cpp_db.writable(
+                        "functions", function_name, "flags", "overloads.flags"
                     )
+                ]
+            )
+
+    for class_name, class_value in list(cpp_db.classes.items()):
+        if any(
+            returns_non_copyable_const_ref(function_model)
+            for function_model in get_functions_models(class_value.methods.values())
+        ):
+            class_value = cpp_db.writable(
+                "classes", class_name, "methods.flags", "methods.overloads.flags"
+            )
+            patch_functions(class_value.methods.values())
 
 
 # LATER: Add a tag in Doxygen to allow custom name / namespace binding
@@ -533,30 +601,45 @@ def patch_const_ref_return_type(cpp_db: CppDatabase):
 # TODO: Check behaviour with smart pointers
 # TODO: Allow injection of "commonly used types" in templated functions using a certain flag in doc (pushParameter for example)
 def generate_bindings(cpp_db: CppDatabase, write_files: bool = True):
-    global GENERATE_BINDINGS
-    GENERATE_BINDINGS = write_files
+    context = GenerationContext(write_files=write_files)
     log.info("===== Generating bindings for ÖbEngine ====")
+    # The following passes only copy the elements they modify (see CppDatabase.writable)
     discard_placeholders(cpp_db)
     inject_ref_in_function_parameters(cpp_db)
     patch_const_ref_return_type(cpp_db)
     generate_class_template_specialisations(cpp_db)
-    apply_inherit_hook(cpp_db.classes)
+    inheritance_graph = InheritanceGraph(cpp_db.classes)
+    apply_inherit_hook(cpp_db, inheritance_graph)
+    # Inheritance passes run once on all the bound classes, parents first
+    bound_classes_names = [
+        class_name
+        for namespace in group_bindings_by_namespace(cpp_db).values()
+        for class_name in namespace.classes
+    ]
+
+    def get_bound_classes():
+        # Passes replace the classes they modify by copies
+        return {
+            class_name: cpp_db.classes[class_name] for class_name in bound_classes_names
+        }
+
+    copy_parent_bindings(cpp_db, get_bound_classes(), inheritance_graph)
+    copy_parent_bases(cpp_db, get_bound_classes(), inheritance_graph)
+    flag_abstract_classes(cpp_db, get_bound_classes(), inheritance_graph)
+    make_renamed_functions_writable(cpp_db)
     namespaces = group_bindings_by_namespace(cpp_db)
     generated_objects = {}
     for namespace_name, namespace in namespaces.items():
-        copy_parent_bindings(cpp_db, namespace.classes)
-        copy_parent_bases(cpp_db, namespace.classes)
-        flag_abstract_classes(cpp_db, namespace.classes)
-        apply_proxies(cpp_db, namespace.functions)
+        apply_proxies(cpp_db, namespace.functions, namespaces)
         generation_results = generate_bindings_for_namespace(
-            cpp_db, namespace_name, namespace
+            context, cpp_db, namespace_name, namespace
         )
         generated_objects[namespace_name] = {
             "objects": generation_results[0],
             "header": generation_results[1],
             "source": generation_results[2],
         }
-    if GENERATE_BINDINGS:
+    if context.write_files:
         for location, source_namespaces in SOURCE_DIRECTORIES_BY_OUTPUT.items():
             source_generated_objects = {
                 namespace: generated_object
@@ -567,14 +650,10 @@ def generate_bindings(cpp_db: CppDatabase, write_files: bool = True):
                 )
             }
             source_path = LOCATIONS[location]["sources"]
-            with open(
-                os.path.join(OUTPUT_DIRECTORY, f"{source_path}/index.cpp"),
-                "w",
-            ) as bindings_index:
-                bindings_index.write(
-                    generated_bindings_index(location, source_generated_objects)
-                )
-            FILES_TO_FORMAT.append(f"{source_path}/index.cpp")
-            if GENERATE_BINDINGS:
-                clang_format_files(FILES_TO_FORMAT)
+            context.generated_files[
+                os.path.join(OUTPUT_DIRECTORY, f"{source_path}/index.cpp")
+            ] = generated_bindings_index(
+                location, source_generated_objects, context.generated_files
+            )
+        write_generated_files(context.generated_files, OUTPUT_DIRECTORY)
     return generated_objects
@@ -0,0 +1,113 @@
+import os
+
+from obidog import stats
+from obidog.cache import CacheBucket, file_digest, make_digest
+from obidog.logger import log
+from obidog.wrappers.clangformat_wrapper import (
+    clang_format_files,
+    get_formatting_context,
+)
+
+# Manifest of the files generated by the previous run, stored with the outputs
+# (paths relative to the output directory)
+MANIFEST_FILENAME = ".obidog_generated_files.pickle"
+
+
+def _open_manifest(output_directory: str) -> CacheBucket:
+    return CacheBucket(os.path.join(output_directory, MANIFEST_FILENAME), "")
+
+
+def _get_manifest_key(path: str, output_directory: str) -> str:
+    return os.path.relpath(path, output_directory).replace(os.path.sep, "/")
+
+
+def _get_previous_files(manifest: CacheBucket, output_directory: str) -> dict:
+    """Files of the previous run not generated (yet) during this run"""
+    return {
+        os.path.join(output_directory, key): entry
+        for key, entry in manifest.unused_entries().items()
+    }
+
+
+def _is_file_unchanged(
+    manifest: CacheBucket, output_directory: str, path: str, generated_digest: str
+):
+    entry = manifest.get(_get_manifest_key(path, output_directory))
+    return (
+        entry is not None
+        and entry["generated"] == generated_digest
+        and os.path.isfile(path)
+        and file_digest(path) == entry["output"]
+    )
+
+
+def _remove_stale_files(manifest: CacheBucket, output_directory: str):
+    for path, entry in _get_previous_files(manifest, output_directory).items():
+        if not os.path.isfile(path):
+            continue
+        if file_digest(path) != entry["output"]:
+            log.warning(f"Keeping stale generated file '{path}' (modified manually)")
+            continue
+        log.info(f"Removing stale generated file '{path}'")
+        os.remove(path)
+        stats.count("generated files removed")
+
+
+def write_generated_files(generated_files: dict[str, str], output_directory: str):
+    """Writes then formats the generated files whose content changed
+
+    The manifest of the files written by the previous run (content hashes
+    before and after formatting, stored in the output directory) is used to
+    leave the unchanged files untouched (their mtime is kept so they are not
+    recompiled) and to remove the files that are not generated anymore
+    """
+    manifest = _open_manifest(output_directory)
+    formatting_context = get_formatting_context()
+    written_files = {}
+    for path, content in generated_files.items():
+        generated_digest = make_digest(formatting_context, content)
+        if _is_file_unchanged(manifest, output_directory, path, generated_digest):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as generated_file:
+            generated_file.write(content)
+        written_files[path] = generated_digest
+    stats.count("generated files written", len(written_files))
+    stats.count("generated files unchanged", len(generated_files) - len(written_files))
+
+    # Files that could not be formatted are written and formatted again next run
+    for path in dict.fromkeys(clang_format_files(list(written_files))):
+        manifest.set(
+            _get_manifest_key(path, output_directory),
+            {"generated": written_files[path], "output": file_digest(path)},
+        )
+    _remove_stale_files(manifest, output_directory)
+    os.makedirs(output_directory, exist_ok=True)
+    manifest.save()
+
+
+def list_output_files(
+    generated_files: dict[str, str],
+    output_directory: str,
+    directory: str,
+    extension: str,
+) -> list[str]:
+    """Files of a directory once the generated files are written : the files
+    already in the directory (except the stale generated files that are going
+    to be removed) and the files generated during this run
+    """
+    # Files of the previous run that are not generated again are removed
+    previous_files = _get_previous_files(
+        _open_manifest(output_directory), output_directory
+    )
+    files = {
+        path
+        for path in generated_files
+        if path.startswith(os.path.join(directory, "")) and path.endswith(extension)
+    }
+    for current_dir, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(current_dir, filename)
+            if filename.endswith(extension) and path not in previous_files:
+                files.add(path)
+    return sorted(files)
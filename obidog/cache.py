@@ -0,0 +1,101 @@
+import hashlib
+import os
+import pickle
+
+from obidog.logger import log
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def files_digest(paths: list[str]) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        with open(path, "rb") as file:
+            digest.update(path.encode("utf-8"))
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def make_digest(*parts: str) -> str:
+    return hashlib.sha256("\0".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class CacheBucket:
+    """Persistent key -> value mapping stored as a single pickle file
+
+    Values are pickled as soon as they are stored so later mutations of the
+    stored objects do not leak into the cache.
+    Only the entries used (get hits or set) during the run are saved back,
+    which drops stale entries automatically.
+    The whole bucket is discarded when its context changes.
+    """
+
+    def __init__(self, path: str, context: str):
+        self.path = path
+        self.context = context
+        self._entries: dict[str, bytes] = {}
+        self._used: dict[str, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+        if os.path.isfile(path):
+            try:
+                with open(path, "rb") as bucket_file:
+                    content = pickle.load(bucket_file)
+                if content["context"] == context:
+                    self._entries = content["entries"]
+            except Exception as e:
+                log.warning(f"Ignoring unreadable cache file '{path}' : {e}")
+
+    def get(self, key: str):
+        if key in self._entries:
+            self.hits += 1
+            self._used[key] = self._entries[key]
+            return pickle.loads(self._entries[key])
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value):
+        self._used[key] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def unused_entries(self) -> dict:
+        """Entries of the previous run that were not used (yet) during this run,
+        they are dropped when the bucket is saved
+        """
+        return {
+            key: pickle.loads(value)
+            for key, value in self._entries.items()
+            if key not in self._used
+        }
+
+    def save(self):
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as bucket_file:
+            pickle.dump(
+                {"context": self.context, "entries": self._used},
+                bucket_file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temporary_path, self.path)
+
+
+class ParseCache:
+    """Directory containing the persistent cache buckets of Obidog"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.buckets: dict[str, CacheBucket] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def bucket(self, name: str, context: str = "") -> CacheBucket:
+        if name not in self.buckets:
+            self.buckets[name] = CacheBucket(
+                os.path.join(self.directory, f"{name}.pickle"), context
+            )
+        return self.buckets[name]
+
+    def save(self):
+        for bucket in self.buckets.values():
+            bucket.save()
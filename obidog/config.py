@@ -63,6 +63,22 @@ OBENGINE_GIT_URL = os.environ.get(
     "OBENGINE_GIT_URL", "https://github.com/Sygmei/ObEngine"
 )
 OBENGINE_GIT_SSH = os.environ.get("OBENGINE_GIT_SSH", "git@github.com:Sygmei/ObEngine")
+# Sources links of the documentation point to the current commit instead of the branch
+PIN_SOURCES_LINKS = bool(os.environ.get("OBIDOG_PIN_SOURCES_LINKS", ""))
+# Directory where parsing results are cached between runs (disabled when unset)
+CACHE_DIRECTORY = os.environ.get("OBIDOG_CACHE_DIRECTORY", None)
+# Persistent Doxygen build directory, Doxygen is skipped when sources did not change
+DOXYGEN_BUILD_DIRECTORY = os.environ.get("OBIDOG_DOXYGEN_BUILD_DIRECTORY", None)
+# Amount of parsed C++ types kept in memory (see parse_cpp_type)
+TYPES_CACHE_SIZE = int(os.environ.get("OBIDOG_TYPES_CACHE_SIZE", 4096))
+# Validates the models built from parsed values (see BaseModel.build), slower
+VALIDATE_MODELS = bool(os.environ.get("OBIDOG_VALIDATE_MODELS", ""))
+# Reports the peak memory usage of the main process (tracemalloc), slower
+TRACE_MEMORY = bool(os.environ.get("OBIDOG_TRACE_MEMORY", ""))
+# Times each XPath query of the parsers separately (see compile_xpath), slower
+TIME_XPATH_QUERIES = bool(os.environ.get("OBIDOG_TIME_XPATH_QUERIES", ""))
+# Amount of clang-format processes run in parallel to format the generated files
+CLANG_FORMAT_JOBS = int(os.environ.get("OBIDOG_CLANG_FORMAT_JOBS", os.cpu_count() or 1))
 
 
 def set_obengine_git_directory(directory):
@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+
+from obidog.converters.lua.types import DynamicTypesCollection
+
+
+@dataclass
+class GenerationContext:
+    """State of one generation run (bindings, hints), every run has its own
+    so nothing leaks from a run to another one
+    """
+
+    # Generated files are only written when enabled
+    write_files: bool = True
+    # Path -> content of the generated files, written at the end of the run
+    generated_files: dict[str, str] = field(default_factory=dict)
+    # Lua types created while converting the C++ types (std::tuple, ...)
+    dynamic_types: DynamicTypesCollection = field(
+        default_factory=DynamicTypesCollection
+    )
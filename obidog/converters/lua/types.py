@@ -4,7 +4,13 @@ from obidog.databases import CppDatabase
 from obidog.logger import log
 from obidog.models.bindings import LuaType
 from obidog.models.functions import FunctionOverloadModel, FunctionUniformModel
-from obidog.parsers.type_parser import split_root_types
+from obidog.parsers.type_parser import (
+    CppFunctionType,
+    CppQualifiers,
+    CppTemplateType,
+    CppType,
+    parse_cpp_type,
+)
 
 PRIMITIVE_TYPES = {
     "bool": "boolean",
@@ -116,11 +122,6 @@ ALL_TYPES_MATCH = {
 }
 
 
-def fetch_symbol(cpp_db: CppDatabase, symbol: str):
-    symbols = {**cpp_db.classes, **cpp_db.enums, **cpp_db.typedefs}
-    return symbols[symbol]
-
-
 # TODO: open issue on Doxygen
 def horrible_doxygen_parse_error_patch(cpp_type: str) -> str:
     return re.sub(">([a-zA-Z])", r">(\1", cpp_type)
@@ -177,120 +178,141 @@ class DynamicTypesCollection:
         self.dynamic_types[str(new_type)] = new_type
         return str(new_type)
 
+    def items(self):
+        """Dynamic types sorted by name (whatever the conversions order)"""
+        return sorted(self.dynamic_types.items())
+
+
+NO_QUALIFIERS = CppQualifiers(prefix_qualifiers=[], postfix_qualifiers=[])
+
+
+def _unqualified(cpp_type: CppType) -> str:
+    return str(cpp_type.with_qualifiers(NO_QUALIFIERS))
 
-DYNAMIC_TYPES = DynamicTypesCollection()
 
+class LuaTypeConverter:
+    """Converts C++ types to Lua types
 
-def cpp_type_to_lua_type(cpp_db, cpp_type):
-    if isinstance(cpp_type, LuaType):
+    Conversions are memoized, the returned LuaType instances are shared
+    and must not be modified in place
+    """
+
+    def __init__(self, dynamic_types: DynamicTypesCollection = None):
+        self.dynamic_types = dynamic_types or DynamicTypesCollection()
+        self._conversions: dict[str, LuaType] = {}
+
+    def convert(self, cpp_type: str | LuaType) -> LuaType:
         cpp_type = str(cpp_type)
-    if "," in cpp_type and not ("<" in cpp_type and ">" in cpp_type):
-        return ",".join(
-            [
-                str(cpp_type_to_lua_type(cpp_db, sub_type))
-                for sub_type in cpp_type.split(",")
-            ]
-        )
-    cpp_type_backup = cpp_type
-    if cpp_type.strip().startswith("std::function"):
-        cpp_type = horrible_doxygen_parse_error_patch(cpp_type)
-    lua_type = ""
-    cpp_type = prepare_and_strip_type(cpp_type)
-    if "<" in cpp_type and ">" in cpp_type:
-        cpp_type, *templated_type = cpp_type.split("<")  # LATER: Add templated types
-        templated_type[-1] = templated_type[-1].strip().removesuffix(">").strip()
-        cpp_type = cpp_type.strip()
-        templated_type = "<".join(templated_type).strip()
-        sub_types = split_root_types(templated_type)
-        if cpp_type == "std::optional":
-            lua_type = f"{cpp_type_to_lua_type(cpp_db, templated_type)}?"
-        elif cpp_type in ["std::vector", "std::array"]:
-            lua_type = f"{cpp_type_to_lua_type(cpp_db, sub_types[0])}[]"
-        elif cpp_type in ["std::unordered_map", "std::map"]:
-            lua_type = f"table<{cpp_type_to_lua_type(cpp_db, sub_types[0])}, {cpp_type_to_lua_type(cpp_db, sub_types[1])}>"
-        elif cpp_type in ["std::pair", "std::tuple"]:
-            if all(sub_type == sub_types[0] for sub_type in sub_types):
-                lua_type = (
-                    f"table<number, {cpp_type_to_lua_type(cpp_db, sub_types[0])}>"
+        if cpp_type not in self._conversions:
+            self._conversions[cpp_type] = self._convert(cpp_type)
+        return self._conversions[cpp_type]
+
+    def _convert(self, cpp_type: str) -> LuaType:
+        if "," in cpp_type and not ("<" in cpp_type and ">" in cpp_type):
+            return LuaType(
+                type=",".join(
+                    [str(self.convert(sub_type)) for sub_type in cpp_type.split(",")]
                 )
-            else:
-                tuple_types = [
-                    cpp_type_to_lua_type(cpp_db, variant_elem)
-                    for variant_elem in sub_types
-                ]
-                lua_type = DYNAMIC_TYPES.add_tuple_type(tuple_types)
-        elif cpp_type == "sol::nested":
-            return cpp_type_to_lua_type(cpp_db, sub_types[0])
-        elif cpp_type in ["std::shared_ptr", "std::unique_ptr"]:
-            return cpp_type_to_lua_type(cpp_db, sub_types[0])
-        elif cpp_type == "std::function":
-            # TODO: re-use what is done in obidog.parsers.type_parser
-            fun_return_type, fun_args = sub_types[0].split("(")
-            fun_args = fun_args.strip().removesuffix(")").strip()
-            fun_args = split_root_types(fun_args)
-            fun_args_formatted = []
-            for fun_arg_i, fun_arg in enumerate(fun_args):
-                fun_arg = prepare_and_strip_type(fun_arg)
-                fun_arg_split = split_root_types(fun_arg)
-                # Is the argument name present ?
-                if len(fun_arg_split) == 1 and len(fun_arg.split(" ")) == 2:
-                    fun_arg_type, fun_arg_name = fun_arg.split(" ")
-                    fun_args_formatted.append(
-                        f"{fun_arg_name}:{cpp_type_to_lua_type(cpp_db, fun_arg_type)}"
-                    )
-                elif len(fun_arg_split) == 1 and len(fun_arg.split(" ")) > 2:
-                    raise RuntimeError("Is that supposed to happen ?")
-                else:
-                    fun_args_formatted.append(
-                        f"p{fun_arg_i}:{cpp_type_to_lua_type(cpp_db, fun_arg)}"
-                    )
-            fun_lua_return_type = cpp_type_to_lua_type(cpp_db, fun_return_type)
-            fun_lua_return_type = (
-                f":{fun_lua_return_type}" if fun_lua_return_type.type != "nil" else ""
             )
-            fun_signature = f"fun({', '.join(fun_args_formatted)}){fun_lua_return_type}"
-            lua_type = fun_signature
-        elif cpp_type == "std::variant":
-            lua_type = "|".join(
-                [
-                    str(cpp_type_to_lua_type(cpp_db, variant_elem))
-                    for variant_elem in sub_types
-                ]
+        if cpp_type.strip().startswith("std::function"):
+            cpp_type = horrible_doxygen_parse_error_patch(cpp_type)
+        cpp_type = prepare_and_strip_type(cpp_type)
+        if "<" in cpp_type and ">" in cpp_type:
+            parsed_type = parse_cpp_type(cpp_type)
+            if isinstance(parsed_type, CppTemplateType):
+                return self._convert_template(parsed_type)
+        if cpp_type in ALL_TYPES_MATCH:
+            return LuaType(type=ALL_TYPES_MATCH[cpp_type])
+        return LuaType(type=".".join(cpp_type.split("::")))
+
+    def _convert_template(self, cpp_type: CppTemplateType) -> LuaType:
+        template_type = cpp_type.type
+        sub_types = [_unqualified(sub_type) for sub_type in cpp_type.template_types]
+        if template_type == "std::optional":
+            lua_type = f"{self.convert(', '.join(sub_types))}?"
+        elif template_type in ["std::vector", "std::array"]:
+            lua_type = f"{self.convert(sub_types[0])}[]"
+        elif template_type in ["std::unordered_map", "std::map"]:
+            lua_type = (
+                f"table<{self.convert(sub_types[0])}, {self.convert(sub_types[1])}>"
             )
+        elif template_type in ["std::pair", "std::tuple"]:
+            if all(
+                sub_type == cpp_type.template_types[0]
+                for sub_type in cpp_type.template_types
+            ):
+                lua_type = f"table<number, {self.convert(sub_types[0])}>"
+            else:
+                lua_type = self.dynamic_types.add_tuple_type(
+                    [self.convert(sub_type) for sub_type in sub_types]
+                )
+        elif template_type in ["sol::nested", "std::shared_ptr", "std::unique_ptr"]:
+            return self.convert(sub_types[0])
+        elif template_type == "std::function":
+            lua_type = self._convert_function(cpp_type.template_types[0])
+        elif template_type == "std::variant":
+            lua_type = "|".join(str(self.convert(sub_type)) for sub_type in sub_types)
         else:
             log.warn("Unable to determine proper templated type")
-            lua_type = f"{cpp_type_to_lua_type(cpp_db, cpp_type)}[{cpp_type_to_lua_type(cpp_db, templated_type)}]"
-    elif cpp_type in ALL_TYPES_MATCH:
-        lua_type = ALL_TYPES_MATCH[cpp_type]
-    else:
-        lua_type = ".".join(cpp_type.split("::"))
-    return LuaType(type=lua_type)
+            lua_type = (
+                f"{self.convert(template_type)}[{self.convert(', '.join(sub_types))}]"
+            )
+        return LuaType(type=lua_type)
 
+    def _convert_function(self, function_type: CppType) -> str:
+        if not isinstance(function_type, CppFunctionType):
+            return ALL_TYPES_MATCH["std::function"]
+        fun_args_formatted = []
+        for fun_arg_i, fun_arg in enumerate(function_type.args):
+            fun_arg_name = fun_arg.name or f"p{fun_arg_i}"
+            fun_args_formatted.append(
+                f"{fun_arg_name}:{self.convert(_unqualified(fun_arg.type))}"
+            )
+        fun_lua_return_type = self.convert(_unqualified(function_type.type))
+        fun_lua_return_type = (
+            f":{fun_lua_return_type}" if fun_lua_return_type.type != "nil" else ""
+        )
+        return f"fun({', '.join(fun_args_formatted)}){fun_lua_return_type}"
 
-def convert_function_types(cpp_db: CppDatabase, function: FunctionUniformModel):
+
+def convert_function_types(converter: LuaTypeConverter, function: FunctionUniformModel):
     if isinstance(function, FunctionOverloadModel):
         for overload in function.overloads:
-            convert_function_types(cpp_db, overload)
+            convert_function_types(converter, overload)
     else:
-        function.return_type = cpp_type_to_lua_type(cpp_db, function.return_type)
+        function.return_type = converter.convert(function.return_type)
         for parameter in function.parameters:
-            parameter.type = cpp_type_to_lua_type(cpp_db, parameter.type)
+            parameter.type = converter.convert(parameter.type)
 
 
-def convert_all_types(cpp_db: CppDatabase):
-    for class_value in cpp_db.classes.values():
+def convert_all_types(
+    cpp_db: CppDatabase, dynamic_types: DynamicTypesCollection = None
+):
+    """Converts the C++ types of cpp_db to Lua types, the Lua types created
+    along the way are added to dynamic_types
+    """
+    converter = LuaTypeConverter(dynamic_types)
+    classes = cpp_db.writable_category(
+        "classes",
+        "constructors.parameters",
+        "methods.parameters",
+        "methods.overloads.parameters",
+        "attributes",
+    )
+    for class_value in classes.values():
         for constructor in class_value.constructors:
-            convert_function_types(cpp_db, constructor)
+            convert_function_types(converter, constructor)
         for method in class_value.methods.values():
-            convert_function_types(cpp_db, method)
+            convert_function_types(converter, method)
         for attribute in class_value.attributes.values():
-            attribute.type = cpp_type_to_lua_type(cpp_db, attribute.type)
-        class_value.bases = [
-            cpp_type_to_lua_type(cpp_db, base) for base in class_value.bases
-        ]
-    for function in cpp_db.functions.values():
-        convert_function_types(cpp_db, function)
-    for glob in cpp_db.globals.values():
-        glob.type = cpp_type_to_lua_type(cpp_db, glob.type)
-    for typedef in cpp_db.typedefs.values():
-        typedef.type = cpp_type_to_lua_type(cpp_db, typedef.type)
+            attribute.type = converter.convert(attribute.type)
+        class_value.bases = [converter.convert(base) for base in class_value.bases]
+    functions = cpp_db.writable_category(
+        "functions", "parameters", "overloads.parameters"
+    )
+    for function in functions.values():
+        convert_function_types(converter, function)
+    for glob in cpp_db.writable_category("globals").values():
+        glob.type = converter.convert(glob.type)
+    for typedef in cpp_db.writable_category("typedefs").values():
+        typedef.type = converter.convert(typedef.type)
@@ -1,9 +1,10 @@
-from obidog.config import BINDINGS_SOURCES_LOCATION, OBENGINE_GIT_URL
+from obidog.config import BINDINGS_SOURCES_LOCATION
 from obidog.documentation.config import DOC_PATH, DOXYGEN_PATH, WEBSITE_URL
 from obidog.logger import log
 from obidog.models.namespace import NamespaceModel
 from obidog.parsers.bindings_parser import find_binding_location
 from obidog.parsers.doxygen_index_parser import DoxygenIndex
+from obidog.wrappers.git_wrapper import RepositoryMetadata, get_repository_metadata
 
 
 def get_documentation_url(element):
@@ -21,12 +22,15 @@ def get_documentation_url(element):
         return f"https://{WEBSITE_URL}/{DOC_PATH}/{element_path}#doc_{element.name}"
 
 
-def get_source_url(element, branch):
+def get_source_url(element, repository: RepositoryMetadata):
     if hasattr(element, "location") and element.location.file:
-        return f"{OBENGINE_GIT_URL}/blob/{branch}/{element.location.file}#L{element.location.line}"
+        return (
+            f"{repository.url}/blob/{repository.ref}/"
+            f"{element.location.file}#L{element.location.line}"
+        )
 
 
-def get_bindings_url(bindings_results, element, branch):
+def get_bindings_url(bindings_results, element, repository: RepositoryMetadata):
     if isinstance(element, NamespaceModel):
         namespace = element.path
     else:
@@ -35,7 +39,10 @@ def get_bindings_url(bindings_results, element, branch):
         bindings_source = bindings_results[namespace]["source"]
         bindings_line = find_binding_location(bindings_source, element)
         # TODO: Take Location parameter into account
-        return f"{OBENGINE_GIT_URL}/blob/{branch}/{BINDINGS_SOURCES_LOCATION}/{bindings_source}#L{bindings_line}"
+        return (
+            f"{repository.url}/blob/{repository.ref}/"
+            f"{BINDINGS_SOURCES_LOCATION}/{bindings_source}#L{bindings_line}"
+        )
     else:
         log.warn(f"Namespace '{namespace}' not found in bindings generation results")
         return ""
@@ -65,19 +72,20 @@ def fill_element_urls(
     element,
     doxygen_index: DoxygenIndex = None,
     bindings_results: dict = {},
-    branch="master",
+    repository: RepositoryMetadata = None,
 ):
+    repository = repository or get_repository_metadata()
     if not hasattr(element, "overloads"):
         element.urls.documentation = get_documentation_url(element)
         if doxygen_index:
             element.urls.doxygen = get_doxygen_url(doxygen_index, element)
-        element.urls.source = get_source_url(element, branch)
-        element.urls.bindings = get_bindings_url(bindings_results, element, branch)
+        element.urls.source = get_source_url(element, repository)
+        element.urls.bindings = get_bindings_url(bindings_results, element, repository)
     else:
         for overload in element.overloads:
             fill_element_urls(
                 overload,
                 doxygen_index=doxygen_index,
                 bindings_results=bindings_results,
-                branch=branch,
+                repository=repository,
             )
@@ -1,19 +1,329 @@
+from pydantic import BaseModel
+
 from obidog.models.classes import ClassModel
 from obidog.models.enums import EnumModel
 from obidog.models.functions import FunctionBaseModel
 from obidog.models.globals import GlobalModel
 from obidog.models.namespace import NamespaceModel
 from obidog.models.typedefs import TypedefModel
+from obidog.utils.cpp_utils import make_fqn
+
+CPP_DATABASE_CATEGORIES = [
+    "classes",
+    "typedefs",
+    "functions",
+    "globals",
+    "enums",
+    "namespaces",
+]
+
+
+def get_element_namespace(element) -> str | None:
+    overloads = getattr(element, "overloads", None)
+    if overloads:
+        return overloads[0].namespace
+    return getattr(element, "namespace", None)
+
+
+def _make_fields_tree(fields: list[str]) -> dict:
+    tree = {}
+    for field in fields:
+        node = tree
+        for field_name in field.split("."):
+            node = node.setdefault(field_name, {})
+    return tree
+
+
+def _copy_value(value, fields_tree: dict):
+    if isinstance(value, dict):
+        return {key: _copy_value(item, fields_tree) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_value(item, fields_tree) for item in value]
+    if isinstance(value, BaseModel):
+        value = value.copy()
+        _copy_fields(value, fields_tree)
+    return value
+
+
+def _copy_fields(model: BaseModel, fields_tree: dict):
+    """Replaces the given fields of a model by shallow copies"""
+    for field_name, nested_fields in fields_tree.items():
+        if field_name in model.__dict__:
+            model.__dict__[field_name] = _copy_value(
+                model.__dict__[field_name], nested_fields
+            )
+
+
+class SymbolTable(dict):
+    """Symbols dict (FQN -> model) indexing its keys by namespace of the symbol
+
+    The namespace of a symbol is read when it is inserted, it must be set
+    before the insertion
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        # Namespace -> keys of the symbols of this namespace (in insertion order)
+        self.by_namespace: dict[str | None, dict[str, None]] = {}
+        self._namespaces: dict[str, str | None] = {}
+        # Incremented on every insertion / removal (used to invalidate indexes)
+        self.version = 0
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return (SymbolTable, (dict(self),))
+
+    def _unindex(self, key: str):
+        if key in self._namespaces:
+            del self.by_namespace[self._namespaces.pop(key)][key]
+
+    def __setitem__(self, key: str, value):
+        namespace = get_element_namespace(value)
+        if self._namespaces.get(key, namespace) != namespace:
+            self._unindex(key)
+        self._namespaces[key] = namespace
+        self.by_namespace.setdefault(namespace, {})[key] = None
+        self.version += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str):
+        super().__delitem__(key)
+        self._unindex(key)
+        self.version += 1
+
+    def pop(self, key: str, *default):
+        if key in self:
+            self._unindex(key)
+            self.version += 1
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._unindex(key)
+        self.version += 1
+        return key, value
+
+    def setdefault(self, key: str, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        super().clear()
+        self.by_namespace.clear()
+        self._namespaces.clear()
+        self.version += 1
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def copy(self) -> "SymbolTable":
+        return SymbolTable(self)
+
+    def in_namespace(self, namespace: str) -> dict:
+        return {key: self[key] for key in self.by_namespace.get(namespace, {})}
+
+
+class InheritanceGraph:
+    """Inheritance relations between classes (the template arguments of the
+    bases are stripped, bases that are not part of the classes are ignored)
+    """
+
+    def __init__(self, classes: dict[str, ClassModel]):
+        self.parents: dict[str, list[str]] = {}
+        self.children: dict[str, list[str]] = {class_fqn: [] for class_fqn in classes}
+        for class_fqn, class_value in classes.items():
+            self.parents[class_fqn] = [
+                base
+                for base in dict.fromkeys(
+                    class_value.get_bases(strip_template_types=True)
+                )
+                if base in classes
+            ]
+            for parent in self.parents[class_fqn]:
+                self.children[parent].append(class_fqn)
+        self.topological_order = self._sort_topologically()
+
+    def _sort_topologically(self) -> list[str]:
+        """Classes sorted so that parents always come before their children
+        (classes keep their original order otherwise)
+        """
+        order = {}
+        visiting = set()
+
+        def visit(class_fqn: str):
+            if class_fqn in order or class_fqn in visiting:
+                return  # already sorted or inheritance cycle
+            visiting.add(class_fqn)
+            for parent in self.parents[class_fqn]:
+                visit(parent)
+            visiting.discard(class_fqn)
+            order[class_fqn] = None
+
+        for class_fqn in self.parents:
+            visit(class_fqn)
+        return list(order)
+
+    def sort(self, classes: dict[str, ClassModel]) -> list[tuple[str, ClassModel]]:
+        """Items of the given classes, parents first"""
+        return [
+            (class_fqn, classes[class_fqn])
+            for class_fqn in self.topological_order
+            if class_fqn in classes
+        ]
 
 
 class CppDatabase:
     def __init__(self):
-        self.classes: dict[str, ClassModel] = {}
-        self.typedefs: dict[str, TypedefModel] = {}
-        self.functions: dict[str, FunctionBaseModel] = {}
-        self.globals: dict[str, GlobalModel] = {}
-        self.enums: dict[str, EnumModel] = {}
-        self.namespaces: dict[str, NamespaceModel] = {}
+        self.classes: SymbolTable[str, ClassModel] = SymbolTable()
+        self.typedefs: SymbolTable[str, TypedefModel] = SymbolTable()
+        self.functions: SymbolTable[str, FunctionBaseModel] = SymbolTable()
+        self.globals: SymbolTable[str, GlobalModel] = SymbolTable()
+        self.enums: SymbolTable[str, EnumModel] = SymbolTable()
+        self.namespaces: SymbolTable[str, NamespaceModel] = SymbolTable()
+        # Elements shared with the database this one is a snapshot of
+        self._shared: dict[str, dict] = {}
+        # (category, key) -> (element, copied field path -> copied value of the
+        # first field of the path), see CppDatabase.writable
+        self._writable: dict[tuple[str, str], tuple[BaseModel, dict]] | None = None
+        # Methods FQN -> (class key, method key), see CppDatabase.find_method
+        self._methods_index: dict[str, tuple[str, str]] = {}
+        self._methods_index_version: tuple[int, int] | None = None
+
+    def __setattr__(self, name, value):
+        # Categories stay indexed even when they are replaced by a plain dict
+        if name in CPP_DATABASE_CATEGORIES and not isinstance(value, SymbolTable):
+            value = SymbolTable(value)
+        super().__setattr__(name, value)
+
+    def categories(self) -> dict[str, dict]:
+        return {
+            category: getattr(self, category) for category in CPP_DATABASE_CATEGORIES
+        }
+
+    def snapshot(self) -> "CppDatabase":
+        """Creates a copy-on-write view of the database
+
+        The snapshot has its own dicts, so adding or removing elements does not
+        affect this database, but shares the elements until they are
+        retrieved using CppDatabase.writable
+        """
+        snapshot = CppDatabase()
+        for category, elements in self.categories().items():
+            setattr(snapshot, category, elements.copy())
+            snapshot._shared[category] = dict(elements)
+        snapshot._writable = {}
+        return snapshot
+
+    def writable(self, category: str, key: str, *fields: str):
+        """Returns an element that can be modified in place without affecting
+        the database this one is a snapshot of
+
+        Only the element itself is copied, the fields that are modified in place
+        must be given as dotted paths (ex: "methods.parameters" copies the methods
+        and their parameters), the other models stay shared. Paths go through
+        lists and dicts and skip the models that do not have the field (ex:
+        "methods.overloads" only copies the overloads of overloaded methods).
+        Fields replaced since they were copied are copied again
+        """
+        elements = getattr(self, category)
+        element = elements[key]
+        if self._writable is None:
+            return element
+        writable_element, copied_fields = self._writable.get(
+            (category, key), (None, None)
+        )
+        if writable_element is not element:
+            # Elements added to the snapshot may still hold shared models
+            if self._shared[category].get(key) is element:
+                element = elements[key] = element.copy()
+                del self._shared[category][key]
+            copied_fields = {}
+            self._writable[(category, key)] = (element, copied_fields)
+        missing_fields = [
+            field
+            for field in fields
+            if not any(
+                (copied == field or copied.startswith(f"{field}."))
+                and element.__dict__.get(copied.split(".")[0]) is copied_value
+                for copied, copied_value in copied_fields.items()
+            )
+        ]
+        if missing_fields:
+            fields_tree = _make_fields_tree(missing_fields)
+            previous_values = {
+                field_name: element.__dict__.get(field_name)
+                for field_name in fields_tree
+            }
+            _copy_fields(element, fields_tree)
+            # Copies made from copies keep the fields copied before
+            for copied, copied_value in copied_fields.items():
+                field_name = copied.split(".")[0]
+                if (
+                    field_name in previous_values
+                    and previous_values[field_name] is copied_value
+                ):
+                    copied_fields[copied] = element.__dict__.get(field_name)
+            for field in missing_fields:
+                copied_fields[field] = element.__dict__.get(field.split(".")[0])
+        return element
+
+    def writable_category(self, category: str, *fields: str) -> dict:
+        """Makes all the elements of a category writable (see CppDatabase.writable)"""
+        for key in list(getattr(self, category)):
+            self.writable(category, key, *fields)
+        return getattr(self, category)
+
+    def _build_methods_index(self):
+        self._methods_index = {}
+        for class_key, class_value in self.classes.items():
+            for method_key, method_value in class_value.methods.items():
+                for method_model in [
+                    *getattr(method_value, "overloads", []),
+                    method_value,
+                ]:
+                    method_fqn = make_fqn(
+                        name=method_model.name,
+                        namespace=method_model.namespace,
+                        from_class=method_model.from_class,
+                    )
+                    self._methods_index[method_fqn] = (class_key, method_key)
+        self._methods_index_version = (id(self.classes), self.classes.version)
+
+    def _is_method_location_valid(self, method_fqn: str, location: tuple[str, str]):
+        class_key, method_key = location
+        class_value = self.classes.get(class_key)
+        if class_value is None or method_key not in class_value.methods:
+            return False
+        method_value = class_value.methods[method_key]
+        return method_fqn == make_fqn(
+            name=method_value.name,
+            namespace=method_value.namespace,
+            from_class=method_value.from_class,
+        )
+
+    def find_method(self, method_fqn: str) -> tuple[str, str] | None:
+        """Returns the location (class key, method key) of a method (or of an
+        overload member) from its FQN
+
+        The index is rebuilt when classes were added / replaced / removed since it
+        was built (a missing method is not searched again until then) or when
+        the indexed location of the method is outdated
+        """
+        if self._methods_index_version != (id(self.classes), self.classes.version):
+            self._build_methods_index()
+        location = self._methods_index.get(method_fqn)
+        if location is not None and not self._is_method_location_valid(
+            method_fqn, location
+        ):
+            self._build_methods_index()
+            location = self._methods_index.get(method_fqn)
+        return location
 
 
 class LuaDatabase:
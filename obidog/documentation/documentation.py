@@ -15,7 +15,7 @@ from obidog.logger import log
 from obidog.models.classes import ClassModel
 from obidog.models.namespace import NamespaceModel
 from obidog.parsers.doxygen_index_parser import DoxygenIndex
-from obidog.wrappers.git_wrapper import get_current_branch
+from obidog.wrappers.git_wrapper import get_repository_metadata
 
 DB_FILENAME = "search.json"
 CURRENT_VERSION = "0.5"  # TODO: Fetch version from ObEngine repo
@@ -64,9 +64,18 @@ def generate_documentation(
 
     all_elements = (
         [
-            item
-            for item_type in cpp_db.__dict__.keys()
-            for item in getattr(cpp_db, item_type).values()
+            # Urls are filled in place
+            cpp_db.writable(
+                item_type,
+                item_name,
+                "urls",
+                "overloads.urls",
+                "methods.urls",
+                "methods.overloads.urls",
+                "attributes.urls",
+            )
+            for item_type, items in cpp_db.categories().items()
+            for item_name, item in items.items()
             if not item.flags.nobind
         ]
         + [
@@ -83,12 +92,13 @@ def generate_documentation(
         ]
     )
     log.info("Retrieving urls for all elements")
+    repository = get_repository_metadata()
     for element in all_elements:
         fill_element_urls(
             element,
             doxygen_index=doxygen_index,
             bindings_results=bindings_results,
-            branch=get_current_branch(),
+            repository=repository,
         )
 
     # Injecting root namespace for main index generation
@@ -12,12 +12,35 @@ class DefaultEncoder(json.JSONEncoder):
         return o.__dict__
 
 
+def _make_search_entry(element, element_type: str = None, **overrides):
+    """Builds the search database entry of an element without modifying it"""
+    entry = {
+        "_type": element_type or element._type,
+        "name": element.name,
+        "namespace": element.namespace,
+    }
+    if hasattr(element, "from_class"):
+        entry["from_class"] = element.from_class
+    entry["url"] = element.urls.documentation
+    return entry | overrides
+
+
 def _make_search_db(cpp_db: CppDatabase):
-    return [
-        item
-        for item_type in cpp_db.__dict__.keys()
-        for item in getattr(cpp_db, item_type).values()
-    ]
+    search_db = []
+    for items in cpp_db.categories().values():
+        for item in items.values():
+            if item._type == "overload":
+                search_db.append(
+                    _make_search_entry(
+                        item.overloads[0],
+                        "function",
+                        name=item.name,
+                        from_class=item.from_class,
+                    )
+                )
+            else:
+                search_db.append(_make_search_entry(item))
+    return search_db
 
 
 def _add_overloads(cpp_db: CppDatabase, search_db):
@@ -25,51 +48,30 @@ def _add_overloads(cpp_db: CppDatabase, search_db):
         for method in class_value.methods.values():
             if method._type == "overload":
                 method = method.overloads[0]
-            method.from_class = f"{class_value.namespace}::{class_value.name}"
-            method._type = "method"
-            search_db.append(method)
+            search_db.append(
+                _make_search_entry(
+                    method,
+                    "method",
+                    from_class=f"{class_value.namespace}::{class_value.name}",
+                )
+            )
 
 
 def _add_attributes(cpp_db: CppDatabase, search_db):
     for class_value in cpp_db.classes.values():
         for attribute in class_value.attributes.values():
-            attribute.from_class = f"{class_value.namespace}::{class_value.name}"
-            search_db.append(attribute)
-
-
-def _strip_namespace_content(search_db):
-    for item in search_db:
-        if item._type == "namespace":
-            for elem in ["typedefs", "globals", "functions", "enums"]:
-                item.__dict__.pop(elem)
-
-
-def _fix_overloads(search_db: CppDatabase):
-    for element in search_db:
-        if element._type == "overload":
-            element.urls = element.overloads[0].urls
-            element._type = "function"
-            element.namespace = element.overloads[0].namespace
-
-
-def _strip_unnecessary_attributes(search_db: CppDatabase):
-    for element in search_db:
-        to_pop = []
-        element.url = element.urls.documentation
-        for attr in element.__dict__:
-            if attr not in ["_type", "name", "namespace", "from_class", "url"]:
-                to_pop.append(attr)
-        for attr in to_pop:
-            element.__dict__.pop(attr)
+            search_db.append(
+                _make_search_entry(
+                    attribute,
+                    from_class=f"{class_value.namespace}::{class_value.name}",
+                )
+            )
 
 
 def generate_search_db(cpp_db: CppDatabase):
     search_db = _make_search_db(cpp_db)
     _add_overloads(cpp_db, search_db)
     _add_attributes(cpp_db, search_db)
-    _strip_namespace_content(search_db)
-    _fix_overloads(search_db)
-    _strip_unnecessary_attributes(search_db)
 
     with open(
         os.path.join("export", "search.json"), "w", encoding="utf-8"
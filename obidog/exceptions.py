@@ -4,3 +4,7 @@ class InvalidObEngineGitRepositoryException(Exception):
 
 class ParameterNameNotFoundInXMLException(Exception):
     pass
+
+
+class DoxygenBuildFailedException(Exception):
+    pass
@@ -9,9 +9,10 @@ from mako.template import Template
 
 from obidog.bindings.generator import discard_placeholders
 from obidog.config import PATH_TO_OBENGINE
+from obidog.context import GenerationContext
 from obidog.converters.lua.types import (
-    DYNAMIC_TYPES,
     DynamicTupleType,
+    DynamicTypesCollection,
     convert_all_types,
 )
 from obidog.databases import CppDatabase
@@ -73,7 +74,7 @@ def write_hints(
             hints.append(f"return {namespace};")
 
     # Copy custom hints to export folder
-    for custom_hint_filename in glob.glob(os.path.join("hints", "*.*")):
+    for custom_hint_filename in sorted(glob.glob(os.path.join("hints", "*.*"))):
         shutil.copy(custom_hint_filename, export_directory)
 
     for namespace, hints in hints_by_namespace.items():
@@ -109,14 +110,10 @@ def _remove_operators(cpp_db: CppDatabase):
 
 def _get_namespace_tables(elements):
     return sorted(
-        list(
-            set(
-                [
-                    element.namespace.replace("::", ".")
-                    for element in elements
-                    if hasattr(element, "namespace") and element.namespace
-                ]
-            )
+        dict.fromkeys(
+            element.namespace.replace("::", ".")
+            for element in elements
+            if hasattr(element, "namespace") and element.namespace
         ),
         key=lambda s: s.count("."),
     )
@@ -314,9 +311,11 @@ def _generate_dynamic_tuple(
     )
 
 
-def _generate_dynamic_types() -> dict[str, ClassModel]:
+def _generate_dynamic_types(
+    dynamic_types: DynamicTypesCollection,
+) -> dict[str, ClassModel]:
     result = {}
-    for dynamic_type_name, dynamic_type in DYNAMIC_TYPES.dynamic_types.items():
+    for dynamic_type_name, dynamic_type in dynamic_types.items():
         if isinstance(dynamic_type, DynamicTupleType):
             result[dynamic_type_name] = _generate_dynamic_tuple(
                 dynamic_type_name, dynamic_type
@@ -325,19 +324,21 @@ def _generate_dynamic_types() -> dict[str, ClassModel]:
 
 
 def generate_hints(cpp_db: CppDatabase):
+    context = GenerationContext()
     log.info("Discarding placeholders")
     discard_placeholders(cpp_db)
 
     log.info("Converting all types")
-    convert_all_types(cpp_db)
+    convert_all_types(cpp_db, context.dynamic_types)
 
     cpp_db.classes |= _build_table_for_events(cpp_db.classes)
     cpp_db.classes |= _build_table_for_gameobject_events(cpp_db.classes)
-    cpp_db.classes |= _generate_dynamic_types()
+    cpp_db.classes |= _generate_dynamic_types(context.dynamic_types)
     all_elements = [
-        item
-        for item_type in cpp_db.__dict__.keys()
-        for item in getattr(cpp_db, item_type).values()
+        # Renamed elements are modified in place by _fix_bind_as
+        cpp_db.writable(item_type, item_name) if item.flags.rename else item
+        for item_type, items in cpp_db.categories().items()
+        for item_name, item in items.items()
         if not item.flags.nobind
     ]
 
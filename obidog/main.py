@@ -1,20 +1,108 @@
 import argparse
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
+from obidog import stats
 from obidog.bindings.generator import generate_bindings
+from obidog.cache import ParseCache
+from obidog.config import CACHE_DIRECTORY, DOXYGEN_BUILD_DIRECTORY
 from obidog.databases import CppDatabase
 from obidog.documentation.documentation import generate_documentation
 from obidog.hints.hints import generate_hints
 from obidog.logger import log
 from obidog.parsers.cpp_parser import parse_doxygen_files
+from obidog.parsers.doxygen_index_parser import DoxygenIndex
 from obidog.wrappers.doxygen_wrapper import build_doxygen_documentation
 from obidog.wrappers.git_wrapper import check_git_directory
 
+MODES = ["bindings", "hints", "documentation"]
+# Documentation reads the bindings sources to link each element to its binding
+MODES_DEPENDENCIES = {"documentation": ["bindings"]}
+
+# Parsing results given to the modes worker processes (see _initialize_mode_worker)
+_WORKER_PARSING_RESULTS: tuple[CppDatabase, DoxygenIndex, str] | None = None
+
+
+def run_mode(
+    mode: str, cpp_db: CppDatabase, doxygen_index: DoxygenIndex, path_to_doc: str
+):
+    if mode == "documentation":
+        generate_documentation(cpp_db, doxygen_index, path_to_doc)
+
+    elif mode == "bindings":
+        generate_bindings(cpp_db)
+
+    elif mode == "hints":
+        generate_hints(cpp_db)
+
+
+def _initialize_mode_worker(
+    cpp_db: CppDatabase, doxygen_index: DoxygenIndex, path_to_doc: str
+):
+    global _WORKER_PARSING_RESULTS
+    _WORKER_PARSING_RESULTS = (cpp_db, doxygen_index, path_to_doc)
+    # Forked workers inherit the statistics of the main process
+    stats.pop_stats()
+
+
+def _run_mode_in_worker(mode: str):
+    cpp_db, doxygen_index, path_to_doc = _WORKER_PARSING_RESULTS
+    # A worker can run several modes, each one modifies its own copy-on-write
+    # view of the database
+    run_mode(mode, cpp_db.snapshot(), doxygen_index, path_to_doc)
+    return stats.pop_stats()
+
+
+def run_modes(
+    modes: list[str],
+    cpp_db: CppDatabase,
+    doxygen_index: DoxygenIndex,
+    path_to_doc: str,
+):
+    modes = [mode for mode in MODES if mode in modes]
+    if len(modes) == 1:
+        run_mode(modes[0], cpp_db, doxygen_index, path_to_doc)
+        return
+    # Generators only modify their own snapshot of the database, but they are
+    # CPU-bound pure Python code that threads would run one at a time (GIL),
+    # modes run in worker processes to overlap, the parsing results are only
+    # transferred once per worker
+    with ProcessPoolExecutor(
+        max_workers=len(modes),
+        initializer=_initialize_mode_worker,
+        initargs=(cpp_db, doxygen_index, path_to_doc),
+    ) as executor:
+        futures = {}
+        for mode in modes:
+            for dependency in MODES_DEPENDENCIES.get(mode, []):
+                if dependency in futures:
+                    futures[dependency].result()
+            log.info(f"Running mode {mode}")
+            futures[mode] = executor.submit(_run_mode_in_worker, mode)
+        for future in futures.values():
+            stats.merge_stats(*future.result())
+
 
 def main():
     parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "mode",
+        help="Resources you want to generate",
+        choices=MODES,
+        nargs="+",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Amount of processes used to parse Doxygen XML files",
+        type=int,
+        default=1,
+    )
+    args = parser.parse_args()
+
     # Starting Obidog
     log.info("Obidog starting...")
+    stats.start_memory_tracing()
 
     # Creating databases
     cpp_db = CppDatabase()
@@ -24,29 +112,26 @@ def main():
 
     # Generating Doxygen documentation
     log.info("Building Doxygen XML documentation...")
-    path_to_doc = build_doxygen_documentation(path_to_obengine)
+    path_to_doc = build_doxygen_documentation(path_to_obengine, DOXYGEN_BUILD_DIRECTORY)
+
+    # Reusing the results of previous runs when a cache directory is configured
+    cache = None
+    if CACHE_DIRECTORY:
+        log.info(f"Using cache directory : {CACHE_DIRECTORY}")
+        cache = ParseCache(CACHE_DIRECTORY)
 
     # Processing all files in Doxygen documentation
-    doxygen_index = parse_doxygen_files(path_to_doc, cpp_db)
+    doxygen_index = parse_doxygen_files(
+        path_to_doc, cpp_db, jobs=args.jobs, cache=cache
+    )
 
     cwd = tempfile.mkdtemp()
     log.info(f"Working directory : {cwd}")
 
-    parser.add_argument(
-        "mode",
-        help="Resource you want to generate",
-        choices=["documentation", "bindings", "hints"],
-    )
-    args = parser.parse_args()
-
-    if args.mode == "documentation":
-        generate_documentation(cpp_db, doxygen_index, path_to_doc)
-
-    elif args.mode == "bindings":
-        generate_bindings(cpp_db)
+    with stats.timed("generating " + ", ".join(args.mode)):
+        run_modes(args.mode, cpp_db, doxygen_index, path_to_doc)
 
-    if args.mode == "hints":
-        generate_hints(cpp_db)
+    stats.report_stats()
 
 
 if __name__ == "__main__":
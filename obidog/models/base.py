@@ -1,6 +1,119 @@
+import sys
+from copy import deepcopy
 from enum import Enum
+from functools import partial
+from typing import Any, Callable, NamedTuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel as PydanticBaseModel
+
+from obidog.config import VALIDATE_MODELS
+
+# Fields whose values are repeated across many models (interned by BaseModel.build)
+INTERNED_FIELDS = {"namespace", "from_class", "type", "return_type", "file"}
+IMMUTABLE_DEFAULTS_TYPES = (type(None), bool, int, float, str, tuple, frozenset, Enum)
+
+
+class BuildDefaults(NamedTuple):
+    """Default values of the fields of a model class (see BaseModel.build)"""
+
+    # Field name -> immutable default value (None for required fields),
+    # in fields order
+    values: dict[str, Any]
+    # Field name -> default value factory (for mutable defaults)
+    factories: dict[str, Callable[[], Any]]
+    required: list[str]
+
+    @classmethod
+    def from_model(cls, model_class: type[PydanticBaseModel]) -> "BuildDefaults":
+        build_defaults = cls(values={}, factories={}, required=[])
+        for field_name, field in model_class.__fields__.items():
+            build_defaults.values[field_name] = None
+            if field.required:
+                build_defaults.required.append(field_name)
+            elif field.default_factory is not None:
+                build_defaults.factories[field_name] = (
+                    field.default_factory.build
+                    if isinstance(field.default_factory, type)
+                    and issubclass(field.default_factory, BaseModel)
+                    else field.default_factory
+                )
+            elif isinstance(field.default, IMMUTABLE_DEFAULTS_TYPES):
+                build_defaults.values[field_name] = field.default
+            else:
+                build_defaults.factories[field_name] = partial(deepcopy, field.default)
+        return build_defaults
+
+
+class BaseModel(PydanticBaseModel):
+    @classmethod
+    def build(cls, **values):
+        """Creates a model from values that are already valid (parsers, copies
+        of other models) without validating them, unless OBIDOG_VALIDATE_MODELS
+        is set
+
+        Values are used as-is : nested models are shared instead of copied
+        """
+        for field_name in INTERNED_FIELDS.intersection(values):
+            if type(values[field_name]) is str:
+                values[field_name] = sys.intern(values[field_name])
+        if VALIDATE_MODELS:
+            return cls(**values)
+        defaults = _BUILD_DEFAULTS.get(cls)
+        if defaults is None:
+            defaults = _BUILD_DEFAULTS[cls] = BuildDefaults.from_model(cls)
+        fields_values = defaults.values.copy()
+        fields_values.update(values)
+        for field_name, factory in defaults.factories.items():
+            if field_name not in values:
+                fields_values[field_name] = factory()
+        for field_name in defaults.required:
+            if field_name not in values:
+                raise TypeError(f"{cls.__name__} requires field '{field_name}'")
+        # Same as BaseModel.construct, without pydantic default values copies
+        model = cls.__new__(cls)
+        object.__setattr__(model, "__dict__", fields_values)
+        object.__setattr__(model, "__fields_set__", _get_shared_fields_set(values))
+        model._init_private_attributes()
+        return model
+
+    def __setattr__(self, name, value):
+        # Fields sets shared by built models are copied once a model is modified
+        if type(self.__fields_set__) is frozenset:
+            object.__setattr__(self, "__fields_set__", set(self.__fields_set__))
+        super().__setattr__(name, value)
+
+    def intern_strings(self):
+        """Interns the strings of the interned fields of the model and of its
+        nested models (strings are not interned anymore once unpickled)
+        """
+        for field_name, value in self.__dict__.items():
+            if type(value) is str:
+                if field_name in INTERNED_FIELDS:
+                    self.__dict__[field_name] = sys.intern(value)
+            else:
+                _intern_nested_strings(value)
+
+
+def _intern_nested_strings(value):
+    if isinstance(value, BaseModel):
+        value.intern_strings()
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            _intern_nested_strings(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _intern_nested_strings(item)
+
+
+_BUILD_DEFAULTS: dict[type[BaseModel], BuildDefaults] = {}
+# Sets of the fields given to BaseModel.build, models built from the same
+# fields share the same (frozen) set instead of holding their own
+_SHARED_FIELDS_SETS: dict[frozenset[str], frozenset[str]] = {}
+
+
+def _get_shared_fields_set(values: dict[str, Any]) -> frozenset[str]:
+    fields_set = frozenset(values)
+    return _SHARED_FIELDS_SETS.setdefault(fields_set, fields_set)
 
 
 class CppElement(BaseModel):
@@ -36,9 +36,10 @@ class ObidogFlagsModel(BaseModel):
     rename: str = None
     rename_parameters: list[tuple[str, str]] = Field(default_factory=list)
     bind_code: str = None
-    meta: set[str] = Field(default_factory=set)
+    meta: list[str] = Field(default_factory=list)
     merge_template_specialisations_as: str | None = None
-    hooks: set[ObidogHook] = Field(default_factory=set)
+    # Lists without duplicates (in declaration order) to keep outputs reproducible
+    hooks: list[ObidogHook] = Field(default_factory=list)
 
     def combine(self, flags: "ObidogFlagsModel"):
         self.helpers += flags.helpers
@@ -53,9 +54,9 @@ class ObidogFlagsModel(BaseModel):
         self.rename = self.rename or flags.rename
         self.rename_parameters = self.rename_parameters or flags.rename_parameters
         self.bind_code = self.bind_code or flags.bind_code
-        self.meta = self.meta | flags.meta
+        self.meta = list(dict.fromkeys(self.meta + flags.meta))
         self.merge_template_specialisations_as = (
             self.merge_template_specialisations_as
             or flags.merge_template_specialisations_as
         )
-        self.hooks = self.hooks | flags.hooks
+        self.hooks = list(dict.fromkeys(self.hooks + flags.hooks))
@@ -3,86 +3,103 @@ import re
 
 from obidog.config import BINDINGS_SOURCES_LOCATION, PATH_TO_OBENGINE
 
+# Binding statements of classes, functions, methods / attributes, globals and
+# enums, all the statements of a bindings source are matched in one pass
+BINDING_STATEMENTS_REG = re.compile(
+    "|".join(
+        [
+            r"sol::usertype<(?P<class_identifier>[^;]+?)>\s*bind(?P<class_name>\w+)"
+            r"\s*=\s*(?P<class_namespace>\w+)_namespace\s*"
+            r".new_usertype<\s*(?P=class_identifier)\s*>",
+            r"(?P<function_namespace>\w+)_namespace\s*.set_function\(\s*"
+            r'"(?P<function_name>[^"]*)"\s*,',
+            r'bind(?P<member_class>\w+)\s*\[\s*"(?P<member_name>[^"]*)"\s*\]\s*=',
+            r'(?P<global_namespace>\w+)_namespace\s*\[\s*"(?P<global_name>[^"]*)"'
+            r"\s*\]\s*=\s*(?P<global_identifier>[^;]+?)\s*;",
+            r"(?P<enum_namespace>\w+)_namespace.new_enum<(?P<enum_identifier>[^;]+?)>",
+        ]
+    ),
+    re.DOTALL | re.MULTILINE,
+)
 
-def CLASS_BINDING_REG(identifier, class_name, namespace):
-    return (
-        rf"sol::usertype<{identifier}>\s*bind{class_name}"
-        rf"\s*=\s*{namespace}_namespace\s*.new_usertype<\s*{identifier}\s*>"
-    )
-
-
-def FUNCTION_BINDING_REG(function_name, namespace):
-    return rf'{namespace}_namespace\s*.set_function\(\s*"{function_name}"\s*,'
 
-
-def METHOD_BINDING_REG(method_name, class_name):
-    return rf'bind{class_name}\s*\[\s*"{method_name}"\s*\]\s*='
+def _make_binding_key(match: re.Match) -> tuple:
+    if match["class_name"] is not None:
+        return (
+            "class",
+            match["class_identifier"],
+            match["class_name"],
+            match["class_namespace"],
+        )
+    elif match["function_name"] is not None:
+        return ("function", match["function_namespace"], match["function_name"])
+    elif match["member_name"] is not None:
+        return ("member", match["member_class"], match["member_name"])
+    elif match["global_name"] is not None:
+        return (
+            "global",
+            match["global_namespace"],
+            match["global_name"],
+            match["global_identifier"],
+        )
+    else:
+        return ("enum", match["enum_namespace"], match["enum_identifier"])
 
 
-def ATTRIBUTE_BINDING_REG(attribute_name, class_name):
-    return rf'bind{class_name}\s*\[\s*"{attribute_name}"\s*\]\s*='
+def index_binding_locations(bindings: str) -> dict[tuple, int]:
+    """Line of the first binding statement of each element of a bindings source"""
+    locations = {}
+    line, position = 1, 0
+    for match in BINDING_STATEMENTS_REG.finditer(bindings):
+        line += bindings.count("\n", position, match.start())
+        position = match.start()
+        locations.setdefault(_make_binding_key(match), line)
+    return locations
 
 
-def GLOBAL_BINDING_REG(identifier, global_name, namespace):
-    return rf'{namespace}_namespace\s*\[\s*"{global_name}"\s*\]\s*=\s*{identifier}\s*;'
+# Bindings source path -> (modification time, size, binding locations)
+_BINDING_LOCATIONS_CACHE: dict[str, tuple[int, int, dict[tuple, int]]] = {}
 
 
-def ENUM_BINDING_REG(identifier, namespace):
-    return rf"{namespace}_namespace.new_enum<{identifier}>"
+def get_binding_locations(full_path: str) -> dict[tuple, int]:
+    """Binding locations of a bindings source, indexed once per version of the file"""
+    file_stat = os.stat(full_path)
+    cached = _BINDING_LOCATIONS_CACHE.get(full_path)
+    if cached is None or cached[:2] != (file_stat.st_mtime_ns, file_stat.st_size):
+        with open(full_path, encoding="utf-8") as bindings_source_file:
+            locations = index_binding_locations(bindings_source_file.read())
+        cached = _BINDING_LOCATIONS_CACHE[full_path] = (
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+            locations,
+        )
+    return cached[2]
 
 
 def find_binding_location(location: str, element):
     # TODO: Take Location parameter into account
     full_path = os.path.join(PATH_TO_OBENGINE, BINDINGS_SOURCES_LOCATION, location)
-    with open(full_path, encoding="utf-8") as bindings_source_file:
-        bindings = bindings_source_file.read()
-    identifier = re.escape(
+    identifier = (
         f"{element.namespace}::{element.name}" if element.namespace else element.name
     )
     last_namespace = element.namespace.split("::")[-1]
-    search_result = None
     if element._type == "class":
-        search_result = re.search(
-            CLASS_BINDING_REG(identifier, element.name, last_namespace),
-            bindings,
-            re.DOTALL | re.MULTILINE,
-        )
+        key = ("class", identifier, element.name, last_namespace)
     elif element._type == "typedef":
         return 1  # TODO: Typedefs are not yet exposed to the Lua VM
     elif element._type == "namespace":
         return 1  # The whole file is the namespace, go to line 1
     elif element._type == "function":
         if getattr(element, "from_class", False):
-            search_result = re.search(
-                METHOD_BINDING_REG(re.escape(element.name), element.from_class),
-                bindings,
-                re.DOTALL | re.MULTILINE,
-            )
+            key = ("member", element.from_class, element.name)
         else:
-            search_result = re.search(
-                FUNCTION_BINDING_REG(re.escape(element.name), last_namespace),
-                bindings,
-                re.DOTALL | re.MULTILINE,
-            )
+            key = ("function", last_namespace, element.name)
     elif element._type == "attribute":
-        search_result = re.search(
-            ATTRIBUTE_BINDING_REG(re.escape(element.name), element.from_class),
-            bindings,
-            re.DOTALL | re.MULTILINE,
-        )
+        key = ("member", element.from_class, element.name)
     elif element._type == "global":
-        search_result = re.search(
-            GLOBAL_BINDING_REG(identifier, re.escape(element.name), last_namespace),
-            bindings,
-            re.DOTALL | re.MULTILINE,
-        )
+        key = ("global", last_namespace, element.name, identifier)
     elif element._type == "enum":
-        search_result = re.search(
-            ENUM_BINDING_REG(identifier, last_namespace),
-            bindings,
-            re.DOTALL | re.MULTILINE,
-        )
-    if search_result is not None:
-        return bindings[0 : search_result.span()[0]].count("\n") + 1
+        key = ("enum", last_namespace, identifier)
     else:
         return 1
+    return get_binding_locations(full_path).get(key, 1)
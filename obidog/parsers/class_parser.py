@@ -1,3 +1,4 @@
+from obidog import stats
 from obidog.models.base import ItemVisibility
 from obidog.models.classes import AttributeModel, ClassModel
 from obidog.models.flags import MetaTag, ObidogFlagsModel
@@ -10,39 +11,36 @@ from obidog.models.qualifiers import QualifiersModel
 from obidog.parsers.function_parser import parse_function_from_xml
 from obidog.parsers.location_parser import parse_doxygen_location
 from obidog.parsers.obidog_parser import get_cpp_element_obidog_flags
+from obidog.parsers.session import current_parse_session
 from obidog.parsers.type_parser import (
     parse_cpp_type,
     parse_real_type,
     rebuild_incomplete_type,
 )
 from obidog.parsers.utils.cpp_utils import parse_definition
-from obidog.parsers.utils.doxygen_utils import doxygen_id_to_cpp_id
+from obidog.parsers.utils.doxygen_utils import MemberSections, doxygen_id_to_cpp_id
 from obidog.parsers.utils.xml_utils import (
     extract_xml_value,
     get_content,
     get_content_if,
+    xpath,
 )
 from obidog.utils.cpp_utils import make_fqn
 
-UNUSABLE_METHODS_IDS = set()
 
-
-def parse_methods(class_name, class_value, doxygen_index):
+@stats.timed("parsing classes methods")
+def parse_methods(class_name, sections: MemberSections, doxygen_index):
     methods = {}
     constructors = []
     destructor = None
     private_methods = {}
-    all_methods = (
-        class_value.xpath("sectiondef[@kind='public-func']/memberdef[@kind='function']")
-        + class_value.xpath(
-            "sectiondef[@kind='public-static-func']/memberdef[@kind='function']"
-        )
-        + class_value.xpath(
-            "sectiondef[@kind='protected-func']/memberdef[@kind='function']"
-        )
-        + class_value.xpath(
-            "sectiondef[@kind='private-func']/memberdef[@kind='function']"
-        )
+    unusable_methods_ids = current_parse_session().unusable_methods_ids
+    all_methods = sections.get(
+        "function",
+        "public-func",
+        "public-static-func",
+        "protected-func",
+        "private-func",
     )
 
     if not all_methods:
@@ -56,7 +54,7 @@ def parse_methods(class_name, class_value, doxygen_index):
         # Found a placeholder method, if we encounter another method with the same name
         # we will force cast the previous "valid" occurence (and store it for future occurences)
         if isinstance(method, FunctionPlaceholderModel):
-            UNUSABLE_METHODS_IDS.add(method_fqn)
+            unusable_methods_ids.add(method_fqn)
             for method_container in (methods, private_methods, constructors):
                 if method.name in method_container:
                     methods[method.name].force_cast = True
@@ -84,7 +82,7 @@ def parse_methods(class_name, class_value, doxygen_index):
         # Method not already in methods dict
         if method.name not in function_dest:
             function_dest[method.name] = method
-            if method_fqn in UNUSABLE_METHODS_IDS:
+            if method_fqn in unusable_methods_ids:
                 method.force_cast = True
         else:
             overload = function_dest[method.name]
@@ -93,12 +91,12 @@ def parse_methods(class_name, class_value, doxygen_index):
                 if method.flags.rename:
                     overload.flags.rename = method.rename
             else:
-                function_dest[method.name] = FunctionOverloadModel(
+                function_dest[method.name] = FunctionOverloadModel.build(
                     name=method.name,
                     namespace=overload.namespace,
                     from_class=overload.from_class,
                     overloads=[overload, method],
-                    flags=ObidogFlagsModel(
+                    flags=ObidogFlagsModel.build(
                         rename=overload.flags.rename or method.flags.rename
                     ),
                 )
@@ -106,16 +104,13 @@ def parse_methods(class_name, class_value, doxygen_index):
     return methods, constructors, destructor, private_methods
 
 
-def parse_attributes(class_name, class_value, doxygen_index):
+@stats.timed("parsing classes attributes")
+def parse_attributes(class_name, sections: MemberSections, doxygen_index):
     attributes = {}
     private_attributes = {}
     all_xml_attributes = {
-        False: class_value.xpath(
-            "sectiondef[@kind='public-attrib']/memberdef[@kind='variable']"
-        ),
-        True: class_value.xpath(
-            "sectiondef[@kind='public-static-attrib']/memberdef[@kind='variable']"
-        ),
+        False: sections.get("variable", "public-attrib"),
+        True: sections.get("variable", "public-static-attrib"),
     }
     for is_static, xml_attributes in all_xml_attributes.items():
         for xml_attribute in xml_attributes:
@@ -127,7 +122,7 @@ def parse_attributes(class_name, class_value, doxygen_index):
             attribute_type = parse_real_type(xml_attribute, doxygen_index)
             attribute_desc = get_content(xml_attribute.find("briefdescription"))
             initializer = get_content_if(xml_attribute.find("initializer"))
-            qualifiers = QualifiersModel(static=is_static)
+            qualifiers = QualifiersModel.build(static=is_static)
             flags = get_cpp_element_obidog_flags(attribute_id)
             templated = False
             visibility = ItemVisibility(xml_attribute.attrib["prot"])
@@ -142,7 +137,7 @@ def parse_attributes(class_name, class_value, doxygen_index):
                 identifier = identifier.split(" ")[0]
             namespace = "::".join(identifier.split("::")[:-2])
             if not templated:
-                attribute_dest[attribute_name] = AttributeModel(
+                attribute_dest[attribute_name] = AttributeModel.build(
                     id=attribute_id,
                     name=attribute_name,
                     namespace=namespace,
@@ -169,7 +164,9 @@ def is_class_non_copyable(class_model: ClassModel):
     return False
 
 
-def parse_class_from_xml(class_value, doxygen_index) -> ClassModel:
+def parse_class_from_xml(
+    class_value, doxygen_index, sections: MemberSections = None
+) -> ClassModel:
     nobind = False
     class_id = doxygen_id_to_cpp_id(class_value.attrib["id"])
     class_name = extract_xml_value(class_value, "compoundname")
@@ -184,14 +181,17 @@ def parse_class_from_xml(class_value, doxygen_index) -> ClassModel:
     # Fetching parents
     base_classes_id = [
         item.attrib["refid"]
-        for item in class_value.xpath(
-            'inheritancegraph/node[@id = 1]/childnode[@relation="public-inheritance"]'
+        for item in xpath(
+            class_value,
+            'inheritancegraph/node[@id = 1]/childnode[@relation="public-inheritance"]',
         )
     ]
     bases = []
     if base_classes_id:
         for base_class_id in base_classes_id:
-            base = class_value.xpath(f"inheritancegraph/node[@id = {base_class_id}]")[0]
+            base = xpath(
+                class_value, "inheritancegraph/node[@id = $id]", id=base_class_id
+            )[0]
             # TODO: resolve with refid first (for inner types)
             bases.append(
                 rebuild_incomplete_type(
@@ -203,16 +203,17 @@ def parse_class_from_xml(class_value, doxygen_index) -> ClassModel:
 
     description = extract_xml_value(class_value, "briefdescription/para")
 
+    sections = sections or MemberSections(class_value)
     methods, constructors, destructor, private_methods = parse_methods(
-        class_name, class_value, doxygen_index
+        class_name, sections, doxygen_index
     )
     attributes, private_attributes = parse_attributes(
-        class_name, class_value, doxygen_index
+        class_name, sections, doxygen_index
     )
     flags = get_cpp_element_obidog_flags(class_id)
 
     templated = False
-    if class_value.xpath("templateparamlist"):
+    if xpath(class_value, "templateparamlist"):
         templated = True
         # Ignore template classes without template hints
         if not flags.template_hints:
@@ -220,7 +221,7 @@ def parse_class_from_xml(class_value, doxygen_index) -> ClassModel:
 
     flags.nobind = flags.nobind or nobind
 
-    class_model = ClassModel(
+    class_model = ClassModel.build(
         id=class_id,
         name=class_name,
         namespace=namespace_name,
@@ -237,6 +238,9 @@ def parse_class_from_xml(class_value, doxygen_index) -> ClassModel:
         description=description or "",
         location=parse_doxygen_location(class_value),
     )
-    if is_class_non_copyable(class_model):
-        class_model.flags.meta.add(MetaTag.NonCopyable.value)
+    if (
+        is_class_non_copyable(class_model)
+        and MetaTag.NonCopyable.value not in class_model.flags.meta
+    ):
+        class_model.flags.meta.append(MetaTag.NonCopyable.value)
     return class_model
@@ -1,35 +1,42 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 from lxml import etree
 
+from obidog import stats
+from obidog.cache import CacheBucket, ParseCache, file_digest, files_digest, make_digest
 from obidog.config import SOURCE_DIRECTORIES
 from obidog.databases import CppDatabase
 from obidog.logger import log
 from obidog.parsers.class_parser import parse_class_from_xml
 from obidog.parsers.doxygen_index_parser import DoxygenIndex, parse_doxygen_index
 from obidog.parsers.namespace_parser import (
+    fill_namespace_members,
     parse_enums_from_xml,
-    parse_namespace_from_xml,
+    parse_namespace_symbols_from_xml,
 )
 from obidog.parsers.obidog_parser import (
     apply_obidog_flags_surrogates,
     parse_all_obidog_flags_from_xml,
 )
+from obidog.parsers.session import (
+    ParseSession,
+    current_parse_session,
+    set_current_parse_session,
+)
+from obidog.parsers.type_parser import patch_incomplete_type
+from obidog.parsers.utils.doxygen_utils import MemberSections
+from obidog.parsers.utils.xml_utils import xpath
 from obidog.utils.cpp_utils import make_fqn
 
+# Doxygen index of the current parse worker (see _initialize_parse_worker)
+_WORKER_DOXYGEN_INDEX: DoxygenIndex | None = None
 
-def parse_doxygen_files(path_to_doc: str, cpp_db: CppDatabase) -> DoxygenIndex:
-    log.info("Parsing Doxygen files...")
-    doxygen_index = parse_doxygen_index(
-        os.path.join(path_to_doc, "docbuild", "xml", "index.xml")
-    )
-
-    obidog_flags_filepath = os.path.join(path_to_doc, "docbuild", "xml", "obidog.xml")
-    parse_all_obidog_flags_from_xml(obidog_flags_filepath)
 
+def list_doxygen_compounds(xml_directory: str) -> tuple[list[str], list[str]]:
     namespaces_files = []
     classes_files = []
-    for currentDir, _, files in os.walk(os.path.join(path_to_doc, "docbuild/xml/")):
+    for currentDir, _, files in os.walk(xml_directory):
         for f in sorted(files):
             if any(
                 (
@@ -49,30 +56,308 @@ def parse_doxygen_files(path_to_doc: str, cpp_db: CppDatabase) -> DoxygenIndex:
                 namespaces_files.append(namespace_filepath)
             else:
                 log.debug(f"Ignoring file {f}")
+    return namespaces_files, classes_files
 
-    for namespace_filepath in namespaces_files:
-        log.debug(f"  Parsing namespace {namespace_filepath}")
-        parse_namespace_from_xml(namespace_filepath, cpp_db, doxygen_index)
-
-    for class_filepath in classes_files:
-        log.debug(f"  Parsing class {class_filepath}")
-        tree = etree.parse(class_filepath)
-        class_xml = tree.xpath("/doxygen/compounddef")[0]
-        if class_xml.attrib.get("prot") == "private":
-            continue  # ignore private classes
-        class_model = parse_class_from_xml(class_xml, doxygen_index)
+
+def parse_namespace_file(
+    namespace_filepath: str, doxygen_index: DoxygenIndex
+) -> CppDatabase:
+    """Parses a Doxygen namespace file into a standalone CppDatabase fragment"""
+    log.debug(f"  Parsing namespace {namespace_filepath}")
+    fragment = CppDatabase()
+    parse_namespace_symbols_from_xml(namespace_filepath, fragment, doxygen_index)
+    return fragment
+
+
+def parse_class_file(class_filepath: str, doxygen_index: DoxygenIndex) -> CppDatabase:
+    """Parses a Doxygen class file into a standalone CppDatabase fragment
+    containing the class and its inner enums (empty for private classes)
+    """
+    log.debug(f"  Parsing class {class_filepath}")
+    fragment = CppDatabase()
+    tree = etree.parse(class_filepath)
+    class_xml = xpath(tree, "/doxygen/compounddef")[0]
+    if class_xml.attrib.get("prot") == "private":
+        return fragment  # ignore private classes
+    sections = MemberSections(class_xml)
+    class_model = parse_class_from_xml(class_xml, doxygen_index, sections)
+    class_fqn = make_fqn(name=class_model.name, namespace=class_model.namespace)
+    fragment.classes[class_fqn] = class_model
+    # Inner elements
+    parse_enums_from_xml(
+        class_fqn,
+        sections,
+        fragment,
+    )
+    return fragment
+
+
+def merge_namespace_fragment(cpp_db: CppDatabase, fragment: CppDatabase):
+    cpp_db.namespaces.update(fragment.namespaces)
+    cpp_db.functions.update(fragment.functions)
+    cpp_db.typedefs.update(fragment.typedefs)
+    cpp_db.enums.update(fragment.enums)
+    cpp_db.globals.update(fragment.globals)
+    for namespace_name in fragment.namespaces:
+        fill_namespace_members(namespace_name, cpp_db)
+
+
+def merge_class_fragment(cpp_db: CppDatabase, fragment: CppDatabase):
+    for class_model in fragment.classes.values():
         if class_model.namespace in cpp_db.namespaces:
             if cpp_db.namespaces[class_model.namespace].flags.nobind:
-                continue  # ignore classes from nobind namespaces
-        class_fqn = make_fqn(name=class_model.name, namespace=class_model.namespace)
-        cpp_db.classes[class_fqn] = class_model
-        # Inner elements
-        parse_enums_from_xml(
-            class_fqn,
-            class_xml,
-            cpp_db,
+                return  # ignore classes from nobind namespaces
+    cpp_db.classes.update(fragment.classes)
+    cpp_db.enums.update(fragment.enums)
+
+
+def intern_fragment_strings(fragment: CppDatabase):
+    """Shares the repeated strings of an unpickled fragment (received from a
+    worker or loaded from the cache) with the other fragments
+    """
+    for elements in fragment.categories().values():
+        for element in elements.values():
+            element.intern_strings()
+
+
+def _parse_file_with_dependencies(
+    parser, filepath: str, doxygen_index: DoxygenIndex
+) -> tuple[CppDatabase, dict]:
+    """Parses a compound file, also returns the index / flags lookups done
+    while parsing it (see ParseSession.dependencies)
+    """
+    with current_parse_session().recording_dependencies() as dependencies:
+        return parser(filepath, doxygen_index), dependencies
+
+
+def _lookup_dependency(doxygen_index: DoxygenIndex, kind: str, *arguments):
+    """Current result of a lookup recorded in ParseSession.dependencies"""
+    if kind == "refid":
+        return doxygen_index.by_refid.get(*arguments)
+    elif kind == "type":
+        parent, incomplete_type = arguments
+        return patch_incomplete_type(parent, doxygen_index)(incomplete_type)
+    elif kind == "flags":
+        return current_parse_session().obidog_flags.get(*arguments)
+    raise ValueError(f"unknown dependency kind '{kind}'")
+
+
+def _are_dependencies_unchanged(dependencies: dict, doxygen_index: DoxygenIndex):
+    for (kind, *arguments), value in dependencies.items():
+        try:
+            if _lookup_dependency(doxygen_index, kind, *arguments) != value:
+                return False
+        except RuntimeError:
+            return False  # type resolution conflict
+    return True
+
+
+def _initialize_parse_worker(doxygen_index: DoxygenIndex, session: ParseSession):
+    global _WORKER_DOXYGEN_INDEX
+    _WORKER_DOXYGEN_INDEX = doxygen_index
+    set_current_parse_session(session)
+    # Forked workers inherit the statistics of the main process
+    stats.pop_stats()
+
+
+def _parse_namespace_file_in_worker(namespace_filepath: str):
+    result = _parse_file_with_dependencies(
+        parse_namespace_file, namespace_filepath, _WORKER_DOXYGEN_INDEX
+    )
+    return result, stats.pop_stats()
+
+
+def _parse_class_file_in_worker(class_filepath: str):
+    result = _parse_file_with_dependencies(
+        parse_class_file, class_filepath, _WORKER_DOXYGEN_INDEX
+    )
+    return result, stats.pop_stats()
+
+
+def _merge_worker_stats(results):
+    for result, worker_stats in results:
+        stats.merge_stats(*worker_stats)
+        yield result
+
+
+def _parse_files(files, parser, worker, doxygen_index, executor, jobs, cache_bucket):
+    """Yields one fragment per file, in the same order as the given files,
+    only parsing the files that are missing from the cache
+
+    Cached fragments are stored by digest of their file along with the index /
+    flags lookups done while parsing them, they are parsed again when one of
+    the lookups gives another result
+    """
+    cached_fragments = [None] * len(files)
+    digests = [None] * len(files)
+    if cache_bucket is not None:
+        digests = [file_digest(filepath) for filepath in files]
+        for file_index, digest in enumerate(digests):
+            cached_entry = cache_bucket.get(digest)
+            if cached_entry is not None and _are_dependencies_unchanged(
+                cached_entry[1], doxygen_index
+            ):
+                cached_fragments[file_index] = cached_entry[0]
+    missing_files = [
+        filepath
+        for filepath, fragment in zip(files, cached_fragments)
+        if fragment is None
+    ]
+    if cache_bucket is not None:
+        log.info(
+            f"Reused {len(files) - len(missing_files)} cached Doxygen compounds, "
+            f"parsing {len(missing_files)}"
+        )
+        stats.count("cached doxygen compounds reused", len(files) - len(missing_files))
+    if executor is None:
+        parsed_fragments = (
+            _parse_file_with_dependencies(parser, filepath, doxygen_index)
+            for filepath in missing_files
+        )
+    else:
+        # Executor.map keeps the submission order so merges stay deterministic
+        chunksize = max(1, len(missing_files) // (jobs * 4))
+        parsed_fragments = _merge_worker_stats(
+            executor.map(worker, missing_files, chunksize=chunksize)
+        )
+    for digest, fragment in zip(digests, cached_fragments):
+        if fragment is None:
+            fragment, dependencies = next(parsed_fragments)
+            if cache_bucket is not None:
+                cache_bucket.set(digest, (fragment, dependencies))
+            if executor is not None:
+                intern_fragment_strings(fragment)
+        else:
+            intern_fragment_strings(fragment)
+        yield fragment
+
+
+def _parse_compounds(
+    namespaces_files: list[str],
+    classes_files: list[str],
+    doxygen_index: DoxygenIndex,
+    jobs: int,
+    cache_bucket: CacheBucket = None,
+):
+    """Yields the namespaces fragments then the classes fragments,
+    in the same order as the given files whatever the amount of jobs
+    """
+    executor = None
+    if jobs > 1:
+        log.info(f"Parsing Doxygen compounds using {jobs} processes...")
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_initialize_parse_worker,
+            initargs=(doxygen_index, current_parse_session()),
+        )
+    try:
+        for files, parser, worker, merger in (
+            (
+                namespaces_files,
+                parse_namespace_file,
+                _parse_namespace_file_in_worker,
+                merge_namespace_fragment,
+            ),
+            (
+                classes_files,
+                parse_class_file,
+                _parse_class_file_in_worker,
+                merge_class_fragment,
+            ),
+        ):
+            for fragment in _parse_files(
+                files, parser, worker, doxygen_index, executor, jobs, cache_bucket
+            ):
+                yield merger, fragment
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _get_parsers_sources_digest() -> str:
+    """Digest of the code producing cached results, any change in it
+    invalidates the whole cache
+    """
+    obidog_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sources = [
+        os.path.join(obidog_directory, "config.py"),
+        os.path.join(obidog_directory, "databases.py"),
+    ]
+    for package in ("parsers", "models"):
+        for currentDir, _, files in os.walk(os.path.join(obidog_directory, package)):
+            sources += [os.path.join(currentDir, f) for f in files if f.endswith(".py")]
+    return files_digest(sources)
+
+
+def _parse_obidog_flags(obidog_flags_filepath: str, cache: ParseCache = None):
+    if cache is None:
+        parse_all_obidog_flags_from_xml(obidog_flags_filepath)
+        return
+    session = current_parse_session()
+    flags_bucket = cache.bucket("obidog_flags", _get_parsers_sources_digest())
+    flags_digest = file_digest(obidog_flags_filepath)
+    cached_flags = flags_bucket.get(flags_digest)
+    if cached_flags is None:
+        parse_all_obidog_flags_from_xml(obidog_flags_filepath)
+        flags_bucket.set(flags_digest, (session.obidog_flags, session.flag_surrogates))
+    else:
+        obidog_flags, flag_surrogates = cached_flags
+        session.obidog_flags.update(obidog_flags)
+        session.flag_surrogates.update(flag_surrogates)
+
+
+def parse_doxygen_files(
+    path_to_doc: str,
+    cpp_db: CppDatabase,
+    jobs: int = 1,
+    cache: ParseCache = None,
+    session: ParseSession = None,
+) -> DoxygenIndex:
+    """Parses the Doxygen documentation into cpp_db, within the given parse
+    session (a new one by default, nothing is kept from previous parsings)
+    """
+    with (session or ParseSession()).activate():
+        return _parse_doxygen_files(path_to_doc, cpp_db, jobs, cache)
+
+
+def _parse_doxygen_files(
+    path_to_doc: str, cpp_db: CppDatabase, jobs: int, cache: ParseCache
+) -> DoxygenIndex:
+    log.info("Parsing Doxygen files...")
+    xml_directory = os.path.join(path_to_doc, "docbuild", "xml")
+    index_filepath = os.path.join(xml_directory, "index.xml")
+    obidog_flags_filepath = os.path.join(xml_directory, "obidog.xml")
+
+    index_bucket = None
+    compounds_bucket = None
+    if cache is not None:
+        sources_digest = _get_parsers_sources_digest()
+        index_bucket = cache.bucket("doxygen_index", sources_digest)
+        # Index / flags entries used by each compound are checked separately
+        compounds_bucket = cache.bucket(
+            "compounds",
+            make_digest(sources_digest, os.environ.get("OBENGINE_GIT_DIRECTORY", "")),
         )
 
+    with stats.timed("parsing doxygen index"):
+        doxygen_index = parse_doxygen_index(index_filepath, index_bucket)
+
+    _parse_obidog_flags(obidog_flags_filepath, cache)
+
+    namespaces_files, classes_files = list_doxygen_compounds(
+        os.path.join(path_to_doc, "docbuild/xml/")
+    )
+
+    # Namespaces must be merged before classes (nobind namespaces discard classes)
+    with stats.timed("parsing doxygen compounds"):
+        for merger, fragment in _parse_compounds(
+            namespaces_files, classes_files, doxygen_index, jobs, compounds_bucket
+        ):
+            merger(cpp_db, fragment)
+
+    if cache is not None:
+        cache.save()
+
     # Keep last
     for element in [
         *cpp_db.classes.values(),
@@ -1,23 +1,32 @@
+import hashlib
+import time
+from typing import NamedTuple
+
 from lxml import etree
-from pydantic import BaseModel, Field
 
-from obidog.parsers.utils.xml_utils import get_content
+from obidog.logger import log
+from obidog.parsers.utils.xml_utils import get_content, xpath
 
 
 def _get_element_identifier(element):
-    return get_content(element.xpath("name")[0]).strip()
+    return get_content(xpath(element, "name")[0]).strip()
 
 
-class DoxygenElement(BaseModel):
+class DoxygenElement(NamedTuple):
     kind: str
     name: str
     fqn: str
     refid: str
 
 
-class DoxygenIndex(BaseModel):
-    by_refid: dict[str, DoxygenElement] = Field(default_factory=dict)
-    by_fqn: dict[str, DoxygenElement] = Field(default_factory=dict)
+class DoxygenIndex:
+    def __init__(self):
+        self.by_refid: dict[str, DoxygenElement] = {}
+        self.by_fqn: dict[str, DoxygenElement] = {}
+        # Last N segments of a FQN -> FQNs ending with them (see build_suffix_index)
+        self.by_suffix: dict[tuple[str, ...], list[str]] = {}
+        # (parent, type) -> type resolved by patch_incomplete_type
+        self.resolved_types: dict[tuple[str, str], str] = {}
 
     def register_element(
         self,
@@ -31,15 +40,22 @@ class DoxygenIndex(BaseModel):
         self.by_refid[refid] = element
         self.by_fqn[fqn] = element
 
-    def __or__(self, other: "DoxygenIndex"):
-        return DoxygenIndex(
-            by_refid=self.by_refid | other.by_refid,
-            by_fqn=self.by_fqn | other.by_fqn,
-        )
+    def merge(self, other: "DoxygenIndex"):
+        self.by_refid.update(other.by_refid)
+        self.by_fqn.update(other.by_fqn)
+
+    def build_suffix_index(self):
+        self.by_suffix = {}
+        for fqn in self.by_fqn:
+            segments = tuple(fqn.split("::"))
+            for suffix_length in range(1, len(segments) + 1):
+                self.by_suffix.setdefault(segments[-suffix_length:], []).append(fqn)
 
+    def find_by_suffix(self, segments: list[str]) -> list[str]:
+        return self.by_suffix.get(tuple(segments), [])
 
-def parse_namespace(namespace, ignore_namespace=False):
-    result = DoxygenIndex()
+
+def parse_namespace(namespace, result: DoxygenIndex, ignore_namespace=False):
     if not ignore_namespace:
         namespace_name = _get_element_identifier(namespace)
         refid = namespace.attrib["refid"]
@@ -53,7 +69,7 @@ def parse_namespace(namespace, ignore_namespace=False):
     if not ignore_namespace:
         namespace_prefix = f"{namespace_name}::"
 
-    for variable in namespace.xpath("member[@kind='variable']"):
+    for variable in xpath(namespace, "member[@kind='variable']"):
         variable_name = _get_element_identifier(variable)
         refid = variable.attrib["refid"]
         fqn = f"{namespace_prefix}{variable_name}"
@@ -61,19 +77,19 @@ def parse_namespace(namespace, ignore_namespace=False):
             kind="variable", refid=refid, fqn=fqn, name=variable_name
         )
 
-    for enum in namespace.xpath("member[@kind='enum']"):
+    for enum in xpath(namespace, "member[@kind='enum']"):
         enum_name = _get_element_identifier(enum)
         refid = enum.attrib["refid"]
         fqn = f"{namespace_prefix}{enum_name}"
         result.register_element(kind="enum", refid=refid, fqn=fqn, name=enum_name)
 
-    for typedef in namespace.xpath("member[@kind='typedef']"):
+    for typedef in xpath(namespace, "member[@kind='typedef']"):
         typedef_name = _get_element_identifier(typedef)
         refid = typedef.attrib["refid"]
         fqn = f"{namespace_prefix}{typedef_name}"
         result.register_element(kind="typedef", refid=refid, fqn=fqn, name=typedef_name)
 
-    for function in namespace.xpath("member[@kind='function']"):
+    for function in xpath(namespace, "member[@kind='function']"):
         function_name = _get_element_identifier(function)
         refid = function.attrib["refid"]
         fqn = f"{namespace_prefix}{function_name}"
@@ -81,30 +97,27 @@ def parse_namespace(namespace, ignore_namespace=False):
             kind="function", refid=refid, fqn=fqn, name=function_name
         )
 
-    for define in namespace.xpath("member[@kind='define']"):
+    for define in xpath(namespace, "member[@kind='define']"):
         define_name = _get_element_identifier(define)
         refid = define.attrib["refid"]
         fqn = define_name
         result.register_element(kind="define", refid=refid, fqn=fqn, name=define_name)
 
-    return result
-
 
-def parse_class(class_value):
-    result = DoxygenIndex()
+def parse_class(class_value, result: DoxygenIndex):
     class_name = _get_element_identifier(class_value)
     refid = class_value.attrib["refid"]
     result.register_element(
         kind="class", refid=refid, fqn=class_name, name=class_name.split("::")[-1]
     )
 
-    for method in class_value.xpath("member[@kind='function']"):
+    for method in xpath(class_value, "member[@kind='function']"):
         method_name = _get_element_identifier(method)
         refid = method.attrib["refid"]
         fqn = f"{class_name}::{method_name}"
         result.register_element(kind="method", refid=refid, fqn=fqn, name=method_name)
 
-    for attribute in class_value.xpath("member[@kind='variable']"):
+    for attribute in xpath(class_value, "member[@kind='variable']"):
         attribute_name = _get_element_identifier(attribute)
         refid = attribute.attrib["refid"]
         fqn = f"{class_name}::{attribute_name}"
@@ -112,43 +125,75 @@ def parse_class(class_value):
             kind="attribute", refid=refid, fqn=fqn, name=attribute_name
         )
 
-    for inner_typedef in class_value.xpath("member[@kind='typedef']"):
+    for inner_typedef in xpath(class_value, "member[@kind='typedef']"):
         typedef_name = _get_element_identifier(inner_typedef)
         refid = inner_typedef.attrib["refid"]
         fqn = f"{class_name}::{typedef_name}"
         result.register_element(kind="typedef", refid=refid, fqn=fqn, name=typedef_name)
 
-    for inner_enum in class_value.xpath("member[@kind='enum']"):
+    for inner_enum in xpath(class_value, "member[@kind='enum']"):
         enum_name = _get_element_identifier(inner_enum)
         refid = inner_enum.attrib["refid"]
         fqn = f"{class_name}::{enum_name}"
         result.register_element(kind="enum", refid=refid, fqn=fqn, name=enum_name)
 
-    for inner_class in class_value.xpath("member[@kind='class']"):
+    for inner_class in xpath(class_value, "member[@kind='class']"):
         raise NotImplementedError()
 
-    return result
 
-
-def parse_doxygen_index(xml_path):
-    tree = etree.parse(xml_path)
-
-    index = tree.xpath("/doxygenindex")[0]
-    classes = index.xpath("compound[@kind='class']")
-    classes += index.xpath("compound[@kind='struct']")
-    namespaces = index.xpath("compound[@kind='namespace']")
-    non_namespaces_elements = index.xpath("compound[@kind='file']")
-    pages = index.xpath("compound[@kind='page']")
+def _parse_file_compound(file_index, result: DoxygenIndex):
+    parse_namespace(file_index, result, ignore_namespace=True)
+
+
+def _parse_compound(compound, parser, index_db: DoxygenIndex, cache_bucket):
+    if cache_bucket is None:
+        parser(compound, index_db)
+        return
+    key = hashlib.sha256(etree.tostring(compound)).hexdigest()
+    compound_index = cache_bucket.get(key)
+    if compound_index is None:
+        compound_index = DoxygenIndex()
+        parser(compound, compound_index)
+        cache_bucket.set(key, compound_index)
+    index_db.merge(compound_index)
+
+
+COMPOUNDS_PARSERS = {
+    "class": parse_class,
+    "struct": parse_class,
+    "namespace": parse_namespace,
+    "file": _parse_file_compound,
+}
+
+
+def parse_doxygen_index(xml_path, cache_bucket=None):
+    start_time = time.perf_counter()
+
+    # Compounds are streamed and discarded once indexed, each kind of compound
+    # is registered into its own index so they can be merged in kinds order
+    indexes_by_kind = {kind: DoxygenIndex() for kind in COMPOUNDS_PARSERS}
+    compounds_amount = 0
+    for _, compound in etree.iterparse(xml_path, events=("end",), tag="compound"):
+        kind = compound.attrib.get("kind")
+        if kind in COMPOUNDS_PARSERS and compound.getparent().tag == "doxygenindex":
+            _parse_compound(
+                compound, COMPOUNDS_PARSERS[kind], indexes_by_kind[kind], cache_bucket
+            )
+            compounds_amount += 1
+        compound.clear()
+        while compound.getprevious() is not None:
+            del compound.getparent()[0]
 
     index_db = DoxygenIndex()
+    for kind_index in indexes_by_kind.values():
+        index_db.merge(kind_index)
 
-    for class_value in classes:
-        index_db |= parse_class(class_value)
+    index_db.build_suffix_index()
 
-    for namespace in namespaces:
-        index_db |= parse_namespace(namespace)
-
-    for file_index in non_namespaces_elements:
-        index_db |= parse_namespace(file_index, ignore_namespace=True)
+    log.info(
+        f"Indexed {compounds_amount} Doxygen compounds "
+        f"({len(index_db.by_fqn)} symbols) "
+        f"in {time.perf_counter() - start_time:.2f}s"
+    )
 
     return index_db
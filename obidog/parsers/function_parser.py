@@ -45,22 +45,24 @@ def parse_function_from_xml(xml_function, doxygen_index, is_method: bool = False
     if (
         "<" in name and ">" in name and "<=>" not in name
     ):  # Template specialisation is ignored
-        return FunctionPlaceholderModel(
+        return FunctionPlaceholderModel.build(
             name=name, namespace="", visibility=visibility
         )  # note: do we need namespace here ?
     if name.startswith("operator") and not is_method:  # TODO: Improve matching
-        return FunctionPlaceholderModel(
+        return FunctionPlaceholderModel.build(
             name=name, namespace="", visibility=visibility
         )  # note: do we need to inject namespace here ?
     return_type = make_return_type(xml_function.find("type"))
     if not return_type and not is_method:
-        return FunctionPlaceholderModel(name=name, namespace="", visibility=visibility)
+        return FunctionPlaceholderModel.build(
+            name=name, namespace="", visibility=visibility
+        )
     if xml_function.find("templateparamlist") is not None:
         templated = True
     definition = get_content(xml_function.find("definition"))
     description = get_content_if(xml_function.find("briefdescription").find("para"))
     parameters = parse_parameters_from_xml(xml_function, doxygen_index)
-    qualifiers = QualifiersModel()
+    qualifiers = QualifiersModel.build()
     if xml_function.attrib["const"] == "yes":
         qualifiers.const = True
     if "volatile" in xml_function.attrib and xml_function.attrib["volatile"] == "yes":
@@ -81,7 +83,7 @@ def parse_function_from_xml(xml_function, doxygen_index, is_method: bool = False
 
     flags = get_cpp_element_obidog_flags(function_id)
     if flags.nobind:
-        return FunctionPlaceholderModel(
+        return FunctionPlaceholderModel.build(
             name=name, namespace=namespace, visibility=visibility
         )
 
@@ -98,7 +100,7 @@ def parse_function_from_xml(xml_function, doxygen_index, is_method: bool = False
                 f" in function '{namespace}::{name}'"
             )
 
-    return FunctionModel(
+    return FunctionModel.build(
         id=function_id,
         name=name,
         namespace=namespace,
@@ -13,7 +13,7 @@ def parse_global_from_xml(xml_global, doxygen_index):
     if not description:
         description = get_content(xml_global.find("briefdescription"))
     flags = get_cpp_element_obidog_flags(global_id)
-    return GlobalModel(
+    return GlobalModel.build(
         id=global_id,
         name=get_content(xml_global.find("name")),
         definition=get_content(xml_global.find("definition")),
@@ -1,9 +1,27 @@
 import os
+import sys
+from functools import lru_cache
 
+from obidog import stats
 from obidog.config import PATH_TO_OBENGINE
 from obidog.models.location import Location
 
 
+@lru_cache(maxsize=None)
+def get_relative_location_path(file_location: str, root_directory: str) -> str:
+    """Path of a Doxygen location relative to the ÖbEngine repository
+    (interned, all the members of a file share the same string)
+    """
+    return sys.intern(
+        os.path.relpath(
+            os.path.normpath(file_location), os.path.normpath(root_directory)
+        ).replace(os.path.sep, "/")
+    )
+
+
+stats.register_cache("locations paths", get_relative_location_path)
+
+
 def parse_doxygen_location(element):
     location_node = element.find("location")
     has_body = "bodyfile" in location_node.attrib
@@ -11,15 +29,13 @@ def parse_doxygen_location(element):
         location_node.attrib["bodyfile"] if has_body else location_node.attrib["file"]
     )
 
-    file_location = os.path.relpath(
-        os.path.normpath(file_location), os.path.normpath(PATH_TO_OBENGINE)
-    ).replace(os.path.sep, "/")
+    file_location = get_relative_location_path(file_location, PATH_TO_OBENGINE)
     line = (
         int(location_node.attrib["bodystart"])
         if has_body
         else int(location_node.attrib["line"])
     )
-    return Location(
+    return Location.build(
         file=file_location,
         line=line,
         column=0 if has_body else int(location_node.attrib["column"]),
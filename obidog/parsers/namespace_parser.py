@@ -8,20 +8,22 @@ from obidog.parsers.function_parser import parse_function_from_xml
 from obidog.parsers.globals_parser import parse_global_from_xml
 from obidog.parsers.location_parser import parse_doxygen_location
 from obidog.parsers.obidog_parser import get_cpp_element_obidog_flags
+from obidog.parsers.session import current_parse_session
 from obidog.parsers.type_parser import parse_real_type, rebuild_incomplete_type
-from obidog.parsers.utils.doxygen_utils import doxygen_id_to_cpp_id
+from obidog.parsers.utils.doxygen_utils import MemberSections, doxygen_id_to_cpp_id
 from obidog.parsers.utils.xml_utils import (
     extract_xml_value,
     get_content,
     get_content_if,
+    xpath,
 )
 
-UNUSABLE_FUNCTIONS_IDS = set()
 
-
-def parse_functions_from_xml(namespace_name, namespace, cpp_db, doxygen_index):
-    functions_path = "sectiondef[@kind='func']/memberdef[@kind='function']"
-    xml_functions = namespace.xpath(functions_path)
+def parse_functions_from_xml(
+    namespace_name, sections: MemberSections, cpp_db, doxygen_index
+):
+    xml_functions = sections.get("function", "func")
+    unusable_functions_ids = current_parse_session().unusable_functions_ids
     for xml_function in xml_functions:
         function = parse_function_from_xml(xml_function, doxygen_index)
         real_name = "::".join((namespace_name, function.name))
@@ -31,18 +33,18 @@ def parse_functions_from_xml(namespace_name, namespace, cpp_db, doxygen_index):
                 if isinstance(existing_function, FunctionOverloadModel):
                     existing_function.overloads.append(function)
                 else:
-                    cpp_db.functions[real_name] = FunctionOverloadModel(
+                    cpp_db.functions[real_name] = FunctionOverloadModel.build(
                         name=existing_function.name,
                         namespace=existing_function.namespace,
                         overloads=[existing_function, function],
                     )
             else:
                 cpp_db.functions[real_name] = function
-            if real_name in UNUSABLE_FUNCTIONS_IDS:
+            if real_name in unusable_functions_ids:
                 cpp_db.functions[real_name].force_cast = True
         else:
             # Force cast as unusable function exists
-            UNUSABLE_FUNCTIONS_IDS.add(real_name)
+            unusable_functions_ids.add(real_name)
             if real_name in cpp_db.functions:
                 cpp_db.functions[real_name].force_cast = True
 
@@ -58,7 +60,7 @@ def parse_typedef_from_xml(namespace_name, xml_typedef, doxygen_index):
     )
     typedef_definition = get_content(xml_typedef.find("definition"))
 
-    return TypedefModel(
+    return TypedefModel.build(
         id=typedef_id,
         name=typedef_name,
         namespace=namespace_name,
@@ -70,14 +72,15 @@ def parse_typedef_from_xml(namespace_name, xml_typedef, doxygen_index):
     )
 
 
-def parse_typedefs_from_xml(namespace_name, namespace, cpp_db, doxygen_index):
-    typedefs_path = "sectiondef[@kind='typedef']/memberdef[@kind='typedef']"
-    xml_typedefs = namespace.xpath(typedefs_path)
+def parse_typedefs_from_xml(
+    namespace_name, sections: MemberSections, cpp_db, doxygen_index
+):
+    xml_typedefs = sections.get("typedef", "typedef")
     for xml_typedef in xml_typedefs:
         typedef = parse_typedef_from_xml(namespace_name, xml_typedef, doxygen_index)
         full_name = "::".join((namespace_name, typedef.name))
+        typedef.namespace = namespace_name
         cpp_db.typedefs[full_name] = typedef
-        cpp_db.typedefs[full_name].namespace = namespace_name
 
 
 def parse_enum_from_xml(xml_enum):
@@ -86,14 +89,14 @@ def parse_enum_from_xml(xml_enum):
     enum_description = get_content(xml_enum.find("briefdescription"))
 
     enum_values = []
-    for enum_value in xml_enum.xpath("enumvalue"):
+    for enum_value in xpath(xml_enum, "enumvalue"):
         enum_values.append(
-            EnumValueModel(
+            EnumValueModel.build(
                 name=get_content(enum_value.find("name")),
                 description=get_content(enum_value.find("briefdescription")),
             )
         )
-    return EnumModel(
+    return EnumModel.build(
         id=enum_id,
         name=enum_name,
         values=enum_values,
@@ -103,33 +106,37 @@ def parse_enum_from_xml(xml_enum):
     )
 
 
-def parse_enums_from_xml(namespace_name, namespace, cpp_db):
-    namespace_kind = namespace.attrib["kind"]
-    from_section = "enum" if namespace_kind == "namespace" else "public-type"
-    enums_path = f"sectiondef[@kind='{from_section}']/memberdef[@kind='enum']"
-    xml_enums = namespace.xpath(enums_path)
+def parse_enums_from_xml(namespace_name, sections: MemberSections, cpp_db):
+    from_section = "enum" if sections.compound_kind == "namespace" else "public-type"
+    xml_enums = sections.get("enum", from_section)
     for xml_enum in xml_enums:
         enum = parse_enum_from_xml(xml_enum)
         full_name = "::".join((namespace_name, enum.name))
+        enum.namespace = namespace_name
         cpp_db.enums[full_name] = enum
-        cpp_db.enums[full_name].namespace = namespace_name
 
 
-def parse_globals_from_xml(namespace_name, namespace, cpp_db, doxygen_index):
-    globals_path = "sectiondef[@kind='var']/memberdef[@kind='variable']"
-    xml_globals = namespace.xpath(globals_path)
+def parse_globals_from_xml(
+    namespace_name, sections: MemberSections, cpp_db, doxygen_index
+):
+    xml_globals = sections.get("variable", "var")
     for xml_global in xml_globals:
         cpp_global = parse_global_from_xml(xml_global, doxygen_index)
         if cpp_global:
             full_name = "::".join((namespace_name, cpp_global.name))
+            cpp_global.namespace = namespace_name
             cpp_db.globals[full_name] = cpp_global
-            cpp_db.globals[full_name].namespace = namespace_name
 
 
-def parse_namespace_from_xml(xml_path, cpp_db, doxygen_index):
+def parse_namespace_symbols_from_xml(xml_path, cpp_db, doxygen_index) -> str:
+    """Parses a Doxygen namespace file into cpp_db and returns the namespace name
+
+    Namespace members (NamespaceModel.functions, ...) are not filled,
+    see fill_namespace_members
+    """
     tree = etree.parse(xml_path)
 
-    namespace = tree.xpath("/doxygen/compounddef")[0]
+    namespace = xpath(tree, "/doxygen/compounddef")[0]
     namespace_id = doxygen_id_to_cpp_id(namespace.attrib["id"])
     namespace_name = extract_xml_value(namespace, "compoundname")
     namespace_description = extract_xml_value(namespace, "briefdescription")
@@ -137,7 +144,7 @@ def parse_namespace_from_xml(xml_path, cpp_db, doxygen_index):
 
     flags = get_cpp_element_obidog_flags(namespace_id)
 
-    cpp_db.namespaces[namespace_name] = NamespaceModel(
+    cpp_db.namespaces[namespace_name] = NamespaceModel.build(
         id=namespace_id,
         name=namespace_name.split("::")[-1],
         path=namespace_name,
@@ -147,36 +154,33 @@ def parse_namespace_from_xml(xml_path, cpp_db, doxygen_index):
     )
 
     if flags.nobind:
-        return
+        return namespace_name
 
-    parse_functions_from_xml(namespace_name, namespace, cpp_db, doxygen_index)
-    parse_typedefs_from_xml(namespace_name, namespace, cpp_db, doxygen_index)
-    parse_enums_from_xml(namespace_name, namespace, cpp_db)
-    parse_globals_from_xml(namespace_name, namespace, cpp_db, doxygen_index)
+    sections = MemberSections(namespace)
+    parse_functions_from_xml(namespace_name, sections, cpp_db, doxygen_index)
+    parse_typedefs_from_xml(namespace_name, sections, cpp_db, doxygen_index)
+    parse_enums_from_xml(namespace_name, sections, cpp_db)
+    parse_globals_from_xml(namespace_name, sections, cpp_db, doxygen_index)
 
-    cpp_db.namespaces[namespace_name].functions = {
+    return namespace_name
+
+
+def fill_namespace_members(namespace_name, cpp_db):
+    namespace_model = cpp_db.namespaces[namespace_name]
+    if namespace_model.flags.nobind:
+        return
+    namespace_model.functions = {
         function_name: function
-        for function_name, function in cpp_db.functions.items()
-        if (
-            isinstance(function, FunctionModel) and function.namespace == namespace_name
-        )
-        or (
-            isinstance(function, FunctionOverloadModel)
-            and function.overloads[0].namespace == namespace_name
-        )
-    }
-    cpp_db.namespaces[namespace_name].typedefs = {
-        typedef_name: typedef
-        for typedef_name, typedef in cpp_db.typedefs.items()
-        if typedef.namespace == namespace_name
-    }
-    cpp_db.namespaces[namespace_name].enums = {
-        enum_name: enum
-        for enum_name, enum in cpp_db.enums.items()
-        if enum.namespace == namespace_name
-    }
-    cpp_db.namespaces[namespace_name].globals = {
-        global_name: glob
-        for global_name, glob in cpp_db.globals.items()
-        if glob.namespace == namespace_name
+        for function_name, function in cpp_db.functions.in_namespace(
+            namespace_name
+        ).items()
+        if isinstance(function, (FunctionModel, FunctionOverloadModel))
     }
+    namespace_model.typedefs = cpp_db.typedefs.in_namespace(namespace_name)
+    namespace_model.enums = cpp_db.enums.in_namespace(namespace_name)
+    namespace_model.globals = cpp_db.globals.in_namespace(namespace_name)
+
+
+def parse_namespace_from_xml(xml_path, cpp_db, doxygen_index):
+    namespace_name = parse_namespace_symbols_from_xml(xml_path, cpp_db, doxygen_index)
+    fill_namespace_members(namespace_name, cpp_db)
@@ -2,9 +2,12 @@ from itertools import product
 
 from lxml import etree
 
+from obidog import stats
 from obidog.logger import log
 from obidog.models.flags import ObidogFlagsModel, ObidogHook, ObidogHookTrigger
+from obidog.parsers.session import current_parse_session
 from obidog.parsers.utils.doxygen_utils import doxygen_id_to_cpp_id
+from obidog.parsers.utils.xml_utils import compile_xpath, xpath
 from obidog.utils.string_utils import replace_delimiters
 
 TEMPLATE_HINTS_VARIABLES = {
@@ -58,6 +61,9 @@ TEMPLATE_HINTS_VARIABLES = {
 
 
 def inject_template_variables(template_combination):
+    """Yields the template combinations obtained by replacing the template hints
+    variables ($lists, $maps, ...) by each of their values
+    """
     associations = {}
     for template_association in template_combination:
         template_name = template_association.split("=")[0].strip()
@@ -70,30 +76,40 @@ def inject_template_variables(template_combination):
             else:
                 raise RuntimeError(f"Unknown template_hint variable {associate_type}")
     if not associations:
-        return [template_combination]
-    else:
-        generated_combinations = []
-        variable_combinations = [x for x in product(*associations.values())]
-        for variable_combination in variable_combinations:
-            current_combination = []
-            for comb in template_combination:
-                template_name = comb.split("=")[0].strip()
-                variable_index = list(associations.keys()).index(template_name)
-                if template_name in associations:
-                    current_combination.append(
-                        f"{template_name}={variable_combination[variable_index]}"
-                    )
-                else:
-                    current_combination.append(comb)
-            generated_combinations.append(current_combination)
-        return generated_combinations
-
-
-def find_obidog_flag(tree, flag_name, amount=None) -> list[str]:
+        yield template_combination
+        return
+    variables_indexes = {
+        template_name: variable_index
+        for variable_index, template_name in enumerate(associations)
+    }
+    for variable_combination in product(*associations.values()):
+        current_combination = []
+        for comb in template_combination:
+            template_name = comb.split("=")[0].strip()
+            if template_name in associations:
+                variable_index = variables_indexes[template_name]
+                current_combination.append(
+                    f"{template_name}={variable_combination[variable_index]}"
+                )
+            else:
+                current_combination.append(comb)
+        yield current_combination
+
+
+# Links of all the Obidog flags of an element, collected in one traversal
+OBIDOG_FLAGS_LINKS_XPATH = compile_xpath("*/ulink[starts-with(@url, 'obidog.')]/@url")
+
+
+def collect_obidog_flags(tree) -> list[str]:
+    return [str(url) for url in OBIDOG_FLAGS_LINKS_XPATH(tree)]
+
+
+def find_obidog_flag(flags_urls: list[str], flag_name, amount=None) -> list[str]:
     search_for = f"obidog.{flag_name}"
     flags = [
-        elem.attrib["url"][len(search_for) : :]
-        for elem in tree.xpath(f"*/ulink[starts-with(@url, '{search_for}')]")
+        flag_url[len(search_for) : :]
+        for flag_url in flags_urls
+        if flag_url.startswith(search_for)
     ]
     flags = [flag[1::] if flag.startswith(":") else flag for flag in flags]
     if amount:
@@ -105,20 +121,17 @@ def find_obidog_flag(tree, flag_name, amount=None) -> list[str]:
     return flags
 
 
-FLAG_SURROGATES: dict[str, ObidogFlagsModel] = {}
-
-
 # Simple flag parsers
 def parse_obidog_boolean_flag(flag_name: str):
-    def parse_obidog_flag(tree) -> bool:
-        return bool(find_obidog_flag(tree, flag_name, 1))
+    def parse_obidog_flag(flags_urls) -> bool:
+        return bool(find_obidog_flag(flags_urls, flag_name, 1))
 
     return parse_obidog_flag
 
 
 def parse_obidog_single_value_flag(flag_name: str, transformer=lambda x: x):
-    def parse_obidog_flag(tree) -> str | None:
-        values = find_obidog_flag(tree, flag_name, 1)
+    def parse_obidog_flag(flags_urls) -> str | None:
+        values = find_obidog_flag(flags_urls, flag_name, 1)
         if values:
             return transformer(values[0].strip())
         return None
@@ -129,8 +142,8 @@ def parse_obidog_single_value_flag(flag_name: str, transformer=lambda x: x):
 def parse_obidog_many_values_flag(
     flag_name: str, transformer=lambda x: x, set_transformer=lambda x: list(x)
 ):
-    def parse_obidog_flag(tree) -> str | None:
-        values = find_obidog_flag(tree, flag_name)
+    def parse_obidog_flag(flags_urls) -> str | None:
+        values = find_obidog_flag(flags_urls, flag_name)
         if values:
             return set_transformer(transformer(value.strip()) for value in values)
         return None
@@ -139,8 +152,8 @@ def parse_obidog_many_values_flag(
 
 
 # Custom flag parsers
-def parse_obidog_flag_template_hint(tree):
-    template_hints = find_obidog_flag(tree, "template_hint")
+def parse_obidog_flag_template_hint(flags_urls):
+    template_hints = find_obidog_flag(flags_urls, "template_hint")
     if template_hints:
         thints = {}
         for template_hint in template_hints:
@@ -149,8 +162,7 @@ def parse_obidog_flag_template_hint(tree):
             template_combination = template_combination.strip().split(";")
             if bind_name not in thints:
                 thints[bind_name] = []
-            template_combinations = inject_template_variables(template_combination)
-            for template_combination in template_combinations:
+            for template_combination in inject_template_variables(template_combination):
                 thints[bind_name].append(
                     {
                         template_association.split("=")[0]
@@ -163,7 +175,7 @@ def parse_obidog_flag_template_hint(tree):
     return None
 
 
-def parse_obidog_flag_rename_parameters(tree):
+def parse_obidog_flag_rename_parameters(flags_urls):
     def parse_rename_parameters_instruction(instruction):
         from_parameter, to_parameter = instruction.split(",")
         from_parameter, to_parameter = from_parameter.strip(), to_parameter.strip()
@@ -171,11 +183,11 @@ def parse_obidog_flag_rename_parameters(tree):
 
     return [
         parse_rename_parameters_instruction(instruction)
-        for instruction in find_obidog_flag(tree, "paramrename")
+        for instruction in find_obidog_flag(flags_urls, "paramrename")
     ]
 
 
-def parse_obidog_flag_hooks(tree):
+def parse_obidog_flag_hooks(flags_urls):
     def parse_hook_instruction(instruction):
         hook_trigger_parameter, hook_code_parameter = instruction.split(",")
         hook_trigger_parameter, hook_code_parameter = (
@@ -187,10 +199,12 @@ def parse_obidog_flag_hooks(tree):
             code=replace_delimiters(hook_code_parameter, "%", "{", "}"),
         )
 
-    return [
-        parse_hook_instruction(instruction)
-        for instruction in find_obidog_flag(tree, "hook")
-    ]
+    return list(
+        dict.fromkeys(
+            parse_hook_instruction(instruction)
+            for instruction in find_obidog_flag(flags_urls, "hook")
+        )
+    )
 
 
 # All flags
@@ -212,57 +226,102 @@ OBIDOG_FLAGS_PARSERS = {
     "load_priority": parse_obidog_single_value_flag("loadpriority", transformer=int),
     "rename": parse_obidog_single_value_flag("rename"),
     "rename_parameters": parse_obidog_flag_rename_parameters,
-    "meta": parse_obidog_many_values_flag("meta", set_transformer=set),
+    "meta": parse_obidog_many_values_flag(
+        "meta", set_transformer=lambda values: list(dict.fromkeys(values))
+    ),
     "hooks": parse_obidog_flag_hooks,
 }
 
 
+@stats.timed("parsing elements obidog flags")
 def parse_element_obidog_flags(tree):
-    flags = ObidogFlagsModel()
+    flags = ObidogFlagsModel.build()
+    flags_urls = collect_obidog_flags(tree)
+    stats.count("obidog flags", len(flags_urls))
+    if not flags_urls:
+        return flags
 
     for flag_name, flag_parser in OBIDOG_FLAGS_PARSERS.items():
-        flag_value = flag_parser(tree)
+        flag_value = flag_parser(flags_urls)
         if flag_value:
             setattr(flags, flag_name, flag_value)
 
     # flag_surrogate (must be kept last)
-    flag_surrogate = find_obidog_flag(tree, "flagsurrogate", 1)
+    flag_surrogate = find_obidog_flag(flags_urls, "flagsurrogate", 1)
     if flag_surrogate:
         flag_surrogate_target = flag_surrogate[0]
         flags_copy = flags.copy()
-        if flag_surrogate_target not in FLAG_SURROGATES:
-            FLAG_SURROGATES[flag_surrogate_target] = flags_copy
+        flag_surrogates = current_parse_session().flag_surrogates
+        if flag_surrogate_target not in flag_surrogates:
+            flag_surrogates[flag_surrogate_target] = flags_copy
         else:
-            FLAG_SURROGATES[flag_surrogate_target].combine(flags_copy)
+            flag_surrogates[flag_surrogate_target].combine(flags_copy)
         flags.nobind = True
 
     return flags
 
 
-OBIDOG_FLAGS_DB = {}
+def _is_flags_list_item(element) -> bool:
+    """Checks that element matches */detaileddescription/para/variablelist/*"""
+    ancestors = [element.getparent()]
+    for _ in range(4):
+        if ancestors[-1] is None:
+            return False
+        ancestors.append(ancestors[-1].getparent())
+    variablelist, para, detaileddescription, compound, root = ancestors
+    return (
+        variablelist.tag == "variablelist"
+        and para.tag == "para"
+        and detaileddescription.tag == "detaileddescription"
+        and root is not None
+        and root.getparent() is None
+    )
 
 
+@stats.timed("parsing obidog flags list")
 def parse_all_obidog_flags_from_xml(flags_filepath: str):
-    flags_tree = etree.parse(flags_filepath)
-    elements_and_flags = flags_tree.xpath("*/detaileddescription/para/variablelist/*")
-    OBIDOG_FLAGS_DB.update(
-        {
-            # Warning: There doesn't seem to be a problem with this yet but
-            # note that some "term" have more than one ref in it
-            # Usually the case is when we have a function with some referenced
-            # parameters
-            doxygen_id_to_cpp_id(
-                element.xpath("term/ref")[0].attrib["refid"]
-            ): parse_element_obidog_flags(flags)
-            for element, flags in zip(elements_and_flags[::2], elements_and_flags[1::2])
-        }
-    )
+    # Entries (varlistentry) and flags (listitem) alternate in the variable lists,
+    # they are parsed as they are read and discarded right after, like the
+    # compounds holding them once they are finished
+    obidog_flags = current_parse_session().obidog_flags
+    element = None
+    for _, item in etree.iterparse(
+        flags_filepath,
+        events=("end",),
+        tag=("varlistentry", "listitem", "compounddef"),
+    ):
+        if item.tag == "compounddef":
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+            continue
+        if not _is_flags_list_item(item):
+            continue
+        if element is None:
+            element = item
+            continue
+        flags = item
+        # Warning: There doesn't seem to be a problem with this yet but
+        # note that some "term" have more than one ref in it
+        # Usually the case is when we have a function with some referenced
+        # parameters
+        obidog_flags[
+            doxygen_id_to_cpp_id(xpath(element, "term/ref")[0].attrib["refid"])
+        ] = parse_element_obidog_flags(flags)
+        element = None
+        flags.clear()
+        while flags.getprevious() is not None:
+            del flags.getparent()[0]
 
 
 def get_cpp_element_obidog_flags(cpp_element_id: str):
-    return OBIDOG_FLAGS_DB.get(cpp_element_id, ObidogFlagsModel())
+    session = current_parse_session()
+    flags = session.obidog_flags.get(cpp_element_id)
+    session.record_dependency(("flags", cpp_element_id), flags)
+    return flags if flags is not None else ObidogFlagsModel.build()
 
 
 def apply_obidog_flags_surrogates(symbol_name: str, flags: ObidogFlagsModel):
-    if symbol_name in FLAG_SURROGATES:
-        flags.combine(FLAG_SURROGATES[symbol_name])
+    flag_surrogates = current_parse_session().flag_surrogates
+    if symbol_name in flag_surrogates:
+        flags.combine(flag_surrogates[symbol_name])
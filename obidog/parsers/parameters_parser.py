@@ -1,11 +1,14 @@
 from obidog.models.functions import ParameterModel
 from obidog.parsers.type_parser import parse_real_type
-from obidog.parsers.utils.xml_utils import get_content, get_content_if
+from obidog.parsers.utils.xml_utils import get_content, get_content_if, xpath
 
 
 def parse_parameters_from_xml(xml_function, doxygen_index):
     parameters = []
-    for index, xml_parameter in enumerate(xml_function.xpath("param")):
+    xml_parameters_descriptions = xpath(
+        xml_function, "detaileddescription/para/parameterlist/parameteritem"
+    )
+    for index, xml_parameter in enumerate(xpath(xml_function, "param")):
         parameter_declname = xml_parameter.find("declname")
         parameter_defname = xml_parameter.find("defname")
         if parameter_declname is not None:
@@ -18,15 +21,15 @@ def parse_parameters_from_xml(xml_function, doxygen_index):
 
         parameter_return_type = parse_real_type(xml_parameter, doxygen_index)
 
-        parameter = ParameterModel(name=parameter_name, type=parameter_return_type)
+        parameter = ParameterModel.build(
+            name=parameter_name, type=parameter_return_type
+        )
         if get_content_if(xml_parameter.find("defval")):
             parameter.default = get_content_if(xml_parameter.find("defval"))
         parameter_description = get_content_if(xml_parameter.find("briefdescription"))
         # LATER: Handle templated parameters (Discard ?)
-        for xml_p_description in xml_function.xpath(
-            "detaileddescription/para/parameterlist/parameteritem"
-        ):
-            if len(xml_p_description.xpath("parameternamelist/parametername")) > 0:
+        for xml_p_description in xml_parameters_descriptions:
+            if xpath(xml_p_description, "parameternamelist/parametername"):
                 if (
                     get_content(
                         xml_p_description.find("parameternamelist").find(
@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from obidog.models.flags import ObidogFlagsModel
+
+# Parse session of the current thread / task (see current_parse_session)
+_CURRENT_PARSE_SESSION: ContextVar["ParseSession"] = ContextVar("parse_session")
+
+
+@dataclass
+class ParseSession:
+    """State shared by the parsers while parsing one Doxygen documentation
+
+    Each parse_doxygen_files call runs in its own session so several source
+    trees can be parsed in the same process (in different threads / tasks)
+    """
+
+    # C++ element id -> obidog flags of the element
+    obidog_flags: dict[str, ObidogFlagsModel] = field(default_factory=dict)
+    # Symbol FQN -> flags given by other elements (flagsurrogate flag)
+    flag_surrogates: dict[str, ObidogFlagsModel] = field(default_factory=dict)
+    # Methods / functions with overloads that can't be bound (need a cast)
+    unusable_methods_ids: set[str] = field(default_factory=set)
+    unusable_functions_ids: set[str] = field(default_factory=set)
+    # Index / flags lookups (key -> result) of the compound being parsed, a
+    # cached compound is only reused when the lookups give the same results
+    dependencies: dict[tuple, object] | None = None
+
+    @contextmanager
+    def activate(self):
+        """Makes this session the current one of the calling thread / task"""
+        token = _CURRENT_PARSE_SESSION.set(self)
+        try:
+            yield self
+        finally:
+            _CURRENT_PARSE_SESSION.reset(token)
+
+    @contextmanager
+    def recording_dependencies(self):
+        """Records the lookups done while parsing a compound (see dependencies)"""
+        previous_dependencies, self.dependencies = self.dependencies, {}
+        try:
+            yield self.dependencies
+        finally:
+            self.dependencies = previous_dependencies
+
+    def record_dependency(self, key: tuple, value):
+        if self.dependencies is not None:
+            self.dependencies[key] = value
+
+
+def set_current_parse_session(session: ParseSession):
+    """Makes a session the current one until another one is set
+    (used by worker processes that only handle one session)
+    """
+    _CURRENT_PARSE_SESSION.set(session)
+
+
+def current_parse_session() -> ParseSession:
+    """Returns the active parse session, a new one is started in the current
+    thread / task when none was activated
+    """
+    session = _CURRENT_PARSE_SESSION.get(None)
+    if session is None:
+        session = ParseSession()
+        _CURRENT_PARSE_SESSION.set(session)
+    return session
@@ -1,6 +1,14 @@
+import re
+import weakref
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Iterator
 
+from obidog import stats
+from obidog.config import TYPES_CACHE_SIZE
 from obidog.parsers.doxygen_index_parser import DoxygenIndex
+from obidog.parsers.session import current_parse_session
+from obidog.parsers.utils.cpp_utils import tokenize
 from obidog.parsers.utils.doxygen_utils import doxygen_id_to_cpp_id
 from obidog.parsers.utils.xml_utils import get_content
 
@@ -12,10 +20,14 @@ def parse_real_type(element, doxygen_index: DoxygenIndex, type_tag: str = "type"
         for param_ref in param_refs:
             param_refid = param_ref.attrib.get("refid")
             if param_refid:
-                if doxygen_index.by_refid[param_refid].kind == "define":
+                ref_element = doxygen_index.by_refid[param_refid]
+                current_parse_session().record_dependency(
+                    ("refid", param_refid), ref_element
+                )
+                if ref_element.kind == "define":
                     real_ref_type = ""
                 else:
-                    real_ref_type = doxygen_index.by_refid[param_refid].fqn
+                    real_ref_type = ref_element.fqn
             else:
                 real_ref_type = doxygen_id_to_cpp_id(param_ref)
             repl_index = final_type.index(get_content(param_ref))
@@ -25,93 +37,117 @@ def parse_real_type(element, doxygen_index: DoxygenIndex, type_tag: str = "type"
         return get_content(element.find(type_tag)).strip()
 
 
-# TODO: remove this ? (replace with split_unembedded)
-def split_root_types(templated_type: str):
-    inner_template_count = 0
+def _split_at(string: str, separators: Iterator[re.Match]) -> list[str]:
     segments = []
-    buffer = ""
-    for char in templated_type:
-        if char in ["<", "("]:
+    segment_start = 0
+    for separator in separators:
+        segments.append(string[segment_start : separator.start()].strip())
+        segment_start = separator.end()
+    last_segment = string[segment_start:].strip()
+    if last_segment:
+        segments.append(last_segment)
+    return segments
+
+
+def _iter_root_separators(templated_type: str) -> Iterator[re.Match]:
+    inner_template_count = 0
+    for token in tokenize(templated_type, "<>(),", with_text=False):
+        symbol = token[0]
+        if symbol in ("<", "("):
             inner_template_count += 1
-            buffer = buffer + char
-        elif char in [">", ")"]:
+        elif symbol in (">", ")"):
             inner_template_count -= 1
-            buffer = buffer + char
-        elif char == "," and not inner_template_count:
-            segments.append(buffer.strip())
-            buffer = ""
-        else:
-            buffer = buffer + char
-    if buffer.strip():
-        segments.append(buffer.strip())
-    return [segment.strip() for segment in segments]
+        elif not inner_template_count:
+            yield token
+
+
+# TODO: remove this ? (replace with split_unembedded)
+def split_root_types(templated_type: str):
+    return _split_at(templated_type, _iter_root_separators(templated_type))
 
 
 TEMPLATE_AND_FUNCTION_TYPE_EMBED_SYMBOLS = [("<", ">"), ("(", ")")]
 
 
-def split_unembedded(string: str, sep: str, embed_symbols: list[tuple[str, str]]):
+def _iter_unembedded_separators(
+    string: str, sep: str, embed_symbols: list[tuple[str, str]]
+) -> Iterator[re.Match]:
+    closing_of = dict(embed_symbols)
+    closing_symbols = set(closing_of.values())
+    # Expected closing symbols of the opened embeds
     stack = []
-    segments = []
-    buffer = ""
-    opening_symbols = [sym[0] for sym in embed_symbols]
-    closing_symbols = [sym[1] for sym in embed_symbols]
-    for char in string:
-        if char in opening_symbols:
-            stack.append(char)
-            buffer = buffer + char
-        elif char in closing_symbols:
-            if opening_symbols.index(stack[-1]) != closing_symbols.index(char):
+    symbols = sep + "".join(closing_of) + "".join(closing_symbols)
+    for token in tokenize(string, symbols, with_text=False):
+        symbol = token[0]
+        if symbol in closing_of:
+            stack.append(closing_of[symbol])
+        elif symbol in closing_symbols:
+            if not stack or stack.pop() != symbol:
                 raise RuntimeError("unbalanced opening / closing symbols")
-            stack.pop(len(stack) - 1)
-            buffer = buffer + char
-        elif char == sep and not stack:
-            segments.append(buffer.strip())
-            buffer = ""
-        else:
-            buffer = buffer + char
-    if buffer.strip():
-        segments.append(buffer.strip())
-    return [segment.strip() for segment in segments]
+        elif not stack:
+            yield token
+
+
+def split_unembedded(string: str, sep: str, embed_symbols: list[tuple[str, str]]):
+    return _split_at(string, _iter_unembedded_separators(string, sep, embed_symbols))
 
 
 class CppQualifiers:
+    """Immutable prefix / postfix qualifiers of a C++ type"""
+
+    __slots__ = ("prefix_qualifiers", "postfix_qualifiers")
+
     def __init__(self, prefix_qualifiers: list[str], postfix_qualifiers: list[str]):
-        self.prefix_qualifiers = prefix_qualifiers
-        self.postfix_qualifiers = postfix_qualifiers
+        object.__setattr__(self, "prefix_qualifiers", tuple(prefix_qualifiers))
+        object.__setattr__(self, "postfix_qualifiers", tuple(postfix_qualifiers))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (CppQualifiers, (self.prefix_qualifiers, self.postfix_qualifiers))
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, CppQualifiers)
+            and self.prefix_qualifiers == other.prefix_qualifiers
+            and self.postfix_qualifiers == other.postfix_qualifiers
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.prefix_qualifiers, self.postfix_qualifiers))
 
     def format(self, type: str):
-        return " ".join(self.prefix_qualifiers + [type] + self.postfix_qualifiers)
+        return " ".join((*self.prefix_qualifiers, type, *self.postfix_qualifiers))
 
     def is_const_ref(self):
         return (
-            (self.prefix_qualifiers == ["const"] and self.postfix_qualifiers == ["&"])
-            or self.postfix_qualifiers == ["const&"]
-            or self.postfix_qualifiers == ["const", "&"]
+            (self.prefix_qualifiers == ("const",) and self.postfix_qualifiers == ("&",))
+            or self.postfix_qualifiers == ("const&",)
+            or self.postfix_qualifiers == ("const", "&")
         )
 
 
+VALID_PREFIX_QUALIFIERS = ["const", "constexpr", "consteval", "static"]
+# All the leading qualifiers (each one followed by a space), matched in one scan
+PREFIX_QUALIFIERS_PATTERN = re.compile(
+    f"(?: *(?:{'|'.join(VALID_PREFIX_QUALIFIERS)}) )*"
+)
+VALID_POSTFIX_QUALIFIERS = ["&", "*", "const&", "const*", "const"]
+
+
 def strip_qualifiers(type: str) -> tuple[str, CppQualifiers]:
-    valid_prefix_qualifiers = ["const", "constexpr", "consteval", "static"]
-    valid_postfix_qualifiers = ["&", "*", "const&", "const*", "const"]
-    prefix_qualifiers = []
+    prefix = PREFIX_QUALIFIERS_PATTERN.match(type).group()
+    prefix_qualifiers = prefix.split()
+    type = type[len(prefix) :].lstrip(" ")
     postfix_qualifiers = []
     qualifier_detected = True
-    while qualifier_detected:
-        type = type.lstrip(" ")
-        qualifier_detected = False
-        for valid_prefix_qualifier in valid_prefix_qualifiers:
-            if type.startswith(f"{valid_prefix_qualifier} "):
-                type = type.removeprefix(f"{valid_prefix_qualifier} ")
-                prefix_qualifiers.append(valid_prefix_qualifier)
-                qualifier_detected = True
-    qualifier_detected = True
     while qualifier_detected:
         type = type.rstrip(" ")
         qualifier_detected = False
-        for valid_postfix_qualifier in valid_postfix_qualifiers:
-            if type.endswith(f"{valid_postfix_qualifier}"):
-                type = type.removesuffix(f"{valid_postfix_qualifier}")
+        for valid_postfix_qualifier in VALID_POSTFIX_QUALIFIERS:
+            if type.endswith(valid_postfix_qualifier):
+                type = type[: -len(valid_postfix_qualifier)]
                 postfix_qualifiers.append(valid_postfix_qualifier)
                 qualifier_detected = True
     return type, CppQualifiers(
@@ -119,34 +155,82 @@ def strip_qualifiers(type: str) -> tuple[str, CppQualifiers]:
     )
 
 
+# Pool of the CppType instances in use (keyed by their content), equal types
+# are only built once, unused types are dropped from it
+_CPP_TYPES_POOL: "weakref.WeakValueDictionary[tuple, CppType]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def intern_cpp_type(cpp_type: "CppType") -> "CppType":
+    key = cpp_type.__reduce__()
+    interned_cpp_type = _CPP_TYPES_POOL.get(key)
+    if interned_cpp_type is None:
+        interned_cpp_type = _CPP_TYPES_POOL[key] = cpp_type
+    return interned_cpp_type
+
+
 class CppType(ABC):
+    """Immutable (and interned) C++ type, see CppType.traverse to transform it"""
+
+    __slots__ = ("qualifiers", "type", "_hash", "__weakref__")
+
     def __init__(self, qualifiers: CppQualifiers) -> None:
-        super().__init__()
-        self.qualifiers = qualifiers
-        self.type: str | CppType | None = None
+        object.__setattr__(self, "qualifiers", qualifiers)
+        object.__setattr__(self, "type", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @abstractmethod
+    def __reduce__(self):
+        pass
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.__reduce__() == other.__reduce__()
+
+    def __hash__(self) -> int:
+        # Hashing a type hashes all its inner types, it is only done once
+        try:
+            return self._hash
+        except AttributeError:
+            object.__setattr__(self, "_hash", hash(self.__reduce__()))
+            return self._hash
 
     @abstractmethod
     def __str__(self) -> str:
         pass
 
+    def with_qualifiers(self, qualifiers: CppQualifiers) -> "CppType":
+        cpp_type_class, (type, _, *args) = self.__reduce__()
+        return intern_cpp_type(cpp_type_class(type, qualifiers, *args))
+
     @abstractmethod
-    def traverse(self, func: callable):
+    def traverse(self, func: callable) -> "CppType":
+        """Returns a copy of this type where func has been applied to the types"""
         pass
 
 
 class CppBaseType(CppType):
+    __slots__ = ()
+
     def __init__(self, type: str, qualifiers: CppQualifiers) -> None:
         super().__init__(qualifiers)
-        self.type = type
+        object.__setattr__(self, "type", type)
+
+    def __reduce__(self):
+        return (CppBaseType, (self.type, self.qualifiers))
 
     def __str__(self) -> str:
         return self.qualifiers.format(str(self.type))
 
     def traverse(self, func: callable):
-        self.type = func(self.type)
+        return intern_cpp_type(CppBaseType(func(self.type), self.qualifiers))
 
 
 class CppTemplateType(CppType):
+    __slots__ = ("template_types",)
+
     def __init__(
         self,
         type: str,
@@ -154,8 +238,11 @@ class CppTemplateType(CppType):
         template_types: list["CppTemplateType"],
     ):
         super().__init__(qualifiers)
-        self.type = type
-        self.template_types = template_types
+        object.__setattr__(self, "type", type)
+        object.__setattr__(self, "template_types", tuple(template_types))
+
+    def __reduce__(self):
+        return (CppTemplateType, (self.type, self.qualifiers, self.template_types))
 
     def __str__(self):
         return self.qualifiers.format(
@@ -164,18 +251,27 @@ class CppTemplateType(CppType):
         )
 
     def traverse(self, func: callable):
-        self.type = func(self.type)
-        for template_type in self.template_types:
-            template_type.traverse(func)
+        return intern_cpp_type(
+            CppTemplateType(
+                func(self.type),
+                self.qualifiers,
+                [template_type.traverse(func) for template_type in self.template_types],
+            )
+        )
 
 
 class CppFunctionArg(CppType):
+    __slots__ = ("name",)
+
     def __init__(
         self, type: CppType, qualifiers: CppQualifiers, name: str | None = None
     ):
         super().__init__(qualifiers)
-        self.type = type
-        self.name = name
+        object.__setattr__(self, "type", type)
+        object.__setattr__(self, "name", name)
+
+    def __reduce__(self):
+        return (CppFunctionArg, (self.type, self.qualifiers, self.name))
 
     def __str__(self) -> str:
         if self.name:
@@ -184,10 +280,14 @@ class CppFunctionArg(CppType):
             return self.qualifiers.format(str(self.type))
 
     def traverse(self, func: callable):
-        self.type = func(self.type)
+        return intern_cpp_type(
+            CppFunctionArg(func(self.type), self.qualifiers, self.name)
+        )
 
 
 class CppFunctionType(CppType):
+    __slots__ = ("args",)
+
     def __init__(
         self,
         return_type: CppType,
@@ -195,8 +295,11 @@ class CppFunctionType(CppType):
         args: list[CppFunctionArg],
     ):
         super().__init__(qualifiers)
-        self.type = return_type
-        self.args = args
+        object.__setattr__(self, "type", return_type)
+        object.__setattr__(self, "args", tuple(args))
+
+    def __reduce__(self):
+        return (CppFunctionType, (self.type, self.qualifiers, self.args))
 
     def __str__(self) -> str:
         return self.qualifiers.format(
@@ -204,9 +307,13 @@ class CppFunctionType(CppType):
         )
 
     def traverse(self, func: callable):
-        self.type = func(self.type)
-        for arg in self.args:
-            arg.traverse(func)
+        return intern_cpp_type(
+            CppFunctionType(
+                func(self.type),
+                self.qualifiers,
+                [arg.traverse(func) for arg in self.args],
+            )
+        )
 
 
 def parse_templated_type(templated_type: str) -> CppTemplateType:
@@ -220,13 +327,15 @@ def parse_templated_type(templated_type: str) -> CppTemplateType:
         child_types = (
             "<".join(templated_type.split("<")[1::]).strip().removesuffix(">").strip()
         )
-        return CppTemplateType(
-            root_type,
-            qualifiers,
-            [
-                parse_cpp_type(child_type)
-                for child_type in split_root_types(child_types)
-            ],
+        return intern_cpp_type(
+            CppTemplateType(
+                root_type,
+                qualifiers,
+                [
+                    parse_cpp_type(child_type)
+                    for child_type in split_root_types(child_types)
+                ],
+            )
         )
 
 
@@ -247,27 +356,37 @@ def parse_function_type(function_type: str) -> CppFunctionType:
             fun_arg_type, fun_arg_name = fun_arg_split
             fun_arg_type = parse_cpp_type(fun_arg_type)
             fun_args_parsed.append(
-                CppFunctionArg(fun_arg_type, fun_arg_qualifiers, fun_arg_name)
+                intern_cpp_type(
+                    CppFunctionArg(fun_arg_type, fun_arg_qualifiers, fun_arg_name)
+                )
             )
         elif len(fun_arg_split) == 1:
             fun_arg_type = fun_arg_split[0]
             fun_arg_type = parse_cpp_type(fun_arg_type)
-            fun_args_parsed.append(CppFunctionArg(fun_arg_type, fun_arg_qualifiers))
+            fun_args_parsed.append(
+                intern_cpp_type(CppFunctionArg(fun_arg_type, fun_arg_qualifiers))
+            )
         else:
             raise RuntimeError("is that supposed to happen ?")
 
-    return CppFunctionType(fun_return_type, qualifiers, fun_args_parsed)
+    return intern_cpp_type(
+        CppFunctionType(fun_return_type, qualifiers, fun_args_parsed)
+    )
 
 
+@lru_cache(maxsize=TYPES_CACHE_SIZE)
 def parse_cpp_type(cpp_type: str) -> CppType:
+    """Parses a C++ type, the result is shared between all the callers
+    (CppType instances are immutable)
+    """
     if "<" not in cpp_type and "(" not in cpp_type:
-        return CppBaseType(*strip_qualifiers(cpp_type))
+        return intern_cpp_type(CppBaseType(*strip_qualifiers(cpp_type)))
     elif "<" not in cpp_type:
         return parse_function_type(cpp_type)
     elif "(" not in cpp_type:
         return parse_templated_type(cpp_type)
     elif "decltype(" in cpp_type:
-        return CppBaseType(*strip_qualifiers(cpp_type))
+        return intern_cpp_type(CppBaseType(*strip_qualifiers(cpp_type)))
     elif cpp_type.strip().endswith(")"):
         return parse_function_type(cpp_type)
     elif cpp_type.index("<") < cpp_type.index("("):
@@ -277,6 +396,9 @@ def parse_cpp_type(cpp_type: str) -> CppType:
     raise RuntimeError("shouldn't reach this branch")
 
 
+stats.register_cache("cpp types", parse_cpp_type)
+
+
 def patch_incomplete_type(parent: str, doxygen_index: DoxygenIndex):
     def patch_incomplete_type_inner(incomplete_type: str | CppType):
         incomplete_type = (
@@ -284,6 +406,17 @@ def patch_incomplete_type(parent: str, doxygen_index: DoxygenIndex):
             if isinstance(incomplete_type, CppType)
             else incomplete_type
         )
+        if (parent, incomplete_type) not in doxygen_index.resolved_types:
+            doxygen_index.resolved_types[(parent, incomplete_type)] = (
+                resolve_incomplete_type(incomplete_type)
+            )
+        resolved_type = doxygen_index.resolved_types[(parent, incomplete_type)]
+        current_parse_session().record_dependency(
+            ("type", parent, incomplete_type), resolved_type
+        )
+        return resolved_type
+
+    def resolve_incomplete_type(incomplete_type: str):
         parent_path = parent.split("::")
         if parent_path:
             for parent_path_using_length in range(len(parent_path), 0, -1):
@@ -295,14 +428,7 @@ def patch_incomplete_type(parent: str, doxygen_index: DoxygenIndex):
                     full_name_attempt
                 ].kind in ["class", "typedef", "enum"]:
                     return full_name_attempt
-        possible_types = []
-        incomplete_type_segments = str(incomplete_type).split("::")
-        for elem_name in doxygen_index.by_fqn:
-            if (
-                elem_name.split("::")[-len(incomplete_type_segments) : :]
-                == incomplete_type_segments
-            ):
-                possible_types.append(elem_name)
+        possible_types = doxygen_index.find_by_suffix(str(incomplete_type).split("::"))
         if not possible_types:
             return incomplete_type
         if len(possible_types) == 1:
@@ -310,8 +436,6 @@ def patch_incomplete_type(parent: str, doxygen_index: DoxygenIndex):
         else:
             raise RuntimeError("conflict, multiple types detected")
 
-        return incomplete_type
-
     return patch_incomplete_type_inner
 
 
@@ -319,5 +443,4 @@ def rebuild_incomplete_type(
     incomplete_type: str, parent: str, doxygen_index: DoxygenIndex
 ):
     parsed_type = parse_cpp_type(incomplete_type)
-    parsed_type.traverse(patch_incomplete_type(parent, doxygen_index))
-    return str(parsed_type)
+    return str(parsed_type.traverse(patch_incomplete_type(parent, doxygen_index)))
@@ -1,34 +1,67 @@
 import re
+from functools import lru_cache
+from typing import Iterator
+
+
+@lru_cache(maxsize=None)
+def _get_tokens_pattern(symbols: str, with_text: bool) -> re.Pattern:
+    escaped_symbols = re.escape(symbols)
+    if with_text:
+        return re.compile(f"[{escaped_symbols}]|[^{escaped_symbols}]+")
+    return re.compile(f"[{escaped_symbols}]")
+
+
+def tokenize(string: str, symbols: str, with_text: bool = True) -> Iterator[re.Match]:
+    """Splits a C++ declaration in a single scan, each character of symbols
+    is a token of its own and the text between the symbols is kept in one token
+    (skipped when with_text is False)
+
+    Tokens are re.Match objects, token[0] is the token and token.start() /
+    token.end() its offsets in the string
+    """
+    return _get_tokens_pattern(symbols, with_text).finditer(string)
+
+
+def _end_template(templates: list[list], stack: list):
+    if not stack[-1]:
+        stack.pop()
+    parent = templates[-1]
+    if not parent[-1]:
+        parent[-1] = stack
+    else:
+        parent.append(stack)
+    parent.append("")
 
 
 def _split_definition(definition: str):
+    # Templates being read, the current one is at the top of the stack
+    templates = []
     stack = [""]
-    i = 0
-    while i + 1 <= len(definition):
-        character = definition[i]
-
-        if character in [" ", ","]:
+    for token in tokenize(definition, " ,<>"):
+        token = token[0]
+        if token in (" ", ","):
             if stack[-1]:
                 stack.append("")
-        elif character == "<":
-            result, pos = _split_definition(definition[i + 1 : :])
-            if not stack[-1]:
-                stack[-1] = result
-                stack.append("")
-            else:
-                stack.append(result)
-                stack.append("")
-            i += pos
-        elif character == ">":
-            if not stack[-1]:
-                stack.pop()
-            return stack, i + 1
+        elif token == "<":
+            templates.append(stack)
+            stack = [""]
+        elif token == ">":
+            if not templates:
+                # Unbalanced closing symbol, the rest of the definition is ignored
+                if not stack[-1]:
+                    stack.pop()
+                return stack
+            _end_template(templates, stack)
+            stack = templates.pop()
         else:
-            stack[-1] = stack[-1] + character
-        i += 1
+            stack[-1] = stack[-1] + token
+    # Unclosed templates
+    while templates:
+        _end_template(templates, stack)
+        stack = templates.pop()
     if not stack[-1]:
         stack.pop()
-    return stack, i
+    return stack
 
 
 def _make_template(template_type: list):  # Shame on me
@@ -44,7 +77,7 @@ def _make_template(template_type: list):  # Shame on me
 
 
 def parse_definition(definition: str):
-    definition, _ = _split_definition(definition)
+    definition = _split_definition(definition)
 
     stack = []
     shift = 0
@@ -57,3 +57,29 @@ def doxygen_ref_to_cpp_name(doxygen_ref):
     else:
         log.warning(f"Unexpected return type '{name}', defaulting as empty string")
         return ""  # raise RuntimeError(f"Unexpected Return Type '{name}'")
+
+
+class MemberSections:
+    """Members of a Doxygen compound grouped by section kind and member kind,
+    collected in a single traversal of the compounddef
+    """
+
+    def __init__(self, compounddef):
+        self.compound_kind = compounddef.attrib["kind"]
+        self._members: dict[tuple[str, str], list] = {}
+        for section in compounddef.iterchildren("sectiondef"):
+            section_kind = section.attrib.get("kind")
+            for member in section.iterchildren("memberdef"):
+                self._members.setdefault(
+                    (section_kind, member.attrib.get("kind")), []
+                ).append(member)
+
+    def get(self, member_kind: str, *sections_kinds: str) -> list:
+        """Members of the given kind from the given sections, grouped by section
+        in the given order (document order inside each section)
+        """
+        return [
+            member
+            for section_kind in sections_kinds
+            for member in self._members.get((section_kind, member_kind), [])
+        ]
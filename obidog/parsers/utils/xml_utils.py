@@ -1,3 +1,29 @@
+from lxml import etree
+
+from obidog import stats
+from obidog.config import TIME_XPATH_QUERIES
+
+# Compiled XPath expressions shared by the parsers (see compile_xpath)
+XPATH_REGISTRY: dict[str, etree.XPath] = {}
+
+
+def compile_xpath(path: str) -> etree.XPath:
+    """Returns the compiled XPath expression of a path (compiled once per process)
+
+    Each expression has its own timer when OBIDOG_TIME_XPATH_QUERIES is set
+    """
+    if path not in XPATH_REGISTRY:
+        compiled_xpath = etree.XPath(path)
+        if TIME_XPATH_QUERIES:
+            compiled_xpath = stats.timed(f"xpath {path}")(compiled_xpath)
+        XPATH_REGISTRY[path] = compiled_xpath
+    return XPATH_REGISTRY[path]
+
+
+def xpath(node, path: str, **variables) -> list:
+    return compile_xpath(path)(node, **variables)
+
+
 def get_content(node):
     return "".join(node.itertext())
 
@@ -10,7 +36,8 @@ def get_content_if(node):
 
 
 def extract_xml_value(tree, path):
-    if len(tree.xpath(path)) > 0:
-        return get_content(tree.xpath(path)[0])
+    nodes = xpath(tree, path)
+    if nodes:
+        return get_content(nodes[0])
     else:
         return None
@@ -0,0 +1,86 @@
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+from obidog.config import TRACE_MEMORY
+from obidog.logger import log
+
+# Statistics of the current run, reported at the end of it
+# (durations of worker processes are cumulated)
+TIMERS: dict[str, float] = defaultdict(float)
+COUNTERS: dict[str, int] = defaultdict(int)
+# functools caches (name -> cached function) whose hit rates are reported
+CACHES: dict[str, callable] = {}
+# Hits and misses of the caches already added to COUNTERS
+_CACHES_COUNTED: dict[str, tuple[int, int]] = {}
+
+
+@contextmanager
+def timed(name: str):
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        TIMERS[name] += time.perf_counter() - start_time
+
+
+def count(name: str, amount: int = 1):
+    COUNTERS[name] += amount
+
+
+def register_cache(name: str, cached_function: callable):
+    CACHES[name] = cached_function
+
+
+def start_memory_tracing():
+    """Traces the memory allocations of the main process when
+    OBIDOG_TRACE_MEMORY is set (peak usage is reported by report_stats)
+    """
+    if TRACE_MEMORY:
+        tracemalloc.start()
+
+
+def _count_caches_usage():
+    for name, cached_function in CACHES.items():
+        cache_info = cached_function.cache_info()
+        hits, misses = _CACHES_COUNTED.get(name, (0, 0))
+        COUNTERS[f"{name} cache hits"] += cache_info.hits - hits
+        COUNTERS[f"{name} cache misses"] += cache_info.misses - misses
+        _CACHES_COUNTED[name] = (cache_info.hits, cache_info.misses)
+
+
+def pop_stats() -> tuple[dict[str, float], dict[str, int]]:
+    """Returns and resets the statistics gathered so far (used to send the
+    statistics of worker processes back to the main process)
+    """
+    _count_caches_usage()
+    timers, counters = dict(TIMERS), dict(COUNTERS)
+    TIMERS.clear()
+    COUNTERS.clear()
+    return timers, counters
+
+
+def merge_stats(timers: dict[str, float], counters: dict[str, int]):
+    for name, duration in timers.items():
+        TIMERS[name] += duration
+    for name, amount in counters.items():
+        COUNTERS[name] += amount
+
+
+def report_stats():
+    _count_caches_usage()
+    log.info("===== Run statistics =====")
+    for name, duration in sorted(TIMERS.items()):
+        log.info(f"  {name} : {duration:.3f}s")
+    for name, amount in sorted(COUNTERS.items()):
+        log.info(f"  {name} : {amount}")
+    for name in CACHES:
+        hits = COUNTERS[f"{name} cache hits"]
+        lookups = hits + COUNTERS[f"{name} cache misses"]
+        if lookups:
+            log.info(f"  {name} cache hit rate : {hits / lookups:.1%}")
+    if tracemalloc.is_tracing():
+        current_size, peak_size = tracemalloc.get_traced_memory()
+        log.info(f"  memory usage : {current_size / 2**20:.1f}MiB")
+        log.info(f"  memory peak : {peak_size / 2**20:.1f}MiB")
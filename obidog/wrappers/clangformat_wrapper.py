@@ -1,46 +1,137 @@
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
-from obidog.config import PATH_TO_OBENGINE
+from obidog import stats
+from obidog.cache import ParseCache, make_digest
+from obidog.config import CACHE_DIRECTORY, CLANG_FORMAT_JOBS, PATH_TO_OBENGINE
 from obidog.logger import log
 
 CLANG_FORMAT_PATH = os.environ.get("CLANG_FORMAT_PATH", "clang-format")
+# Maximum amount of files given to a single clang-format process
+CLANG_FORMAT_BATCH_SIZE = 32
 
 
-def _check_clang_format():
+def _get_clang_format_version():
     try:
         with subprocess.Popen(
             [CLANG_FORMAT_PATH, "--version"], stdout=subprocess.PIPE
         ) as clang_format_exec:
-            version_string = clang_format_exec.stdout.read().decode("utf-8").strip()
-            version_components = version_string.split()
-            try:
-                version = version_components[version_components.index("version") + 1]
-                if int(version.split(".")[0]) >= 10:
-                    return True
-                else:
-                    return False
-            except Exception as e:
-                log.warning(
-                    f"unable to use clang-format at '{CLANG_FORMAT_PATH}' : {e}"
-                )
-                return False
+            return clang_format_exec.stdout.read().decode("utf-8").strip()
     except FileNotFoundError as e:
         log.warning(f"unable to find clang-format at '{CLANG_FORMAT_PATH}' : {e}")
+        return None
+
+
+def _check_clang_format(version_string):
+    if version_string is None:
+        return False
+    version_components = version_string.split()
+    try:
+        version = version_components[version_components.index("version") + 1]
+        if int(version.split(".")[0]) >= 10:
+            return True
+        else:
+            return False
+    except Exception as e:
+        log.warning(f"unable to use clang-format at '{CLANG_FORMAT_PATH}' : {e}")
         return False
 
 
-def clang_format_files(file_list):
-    if CLANG_FORMAT_PATH is not None:
-        for path in file_list:
-            p = subprocess.Popen(
-                [CLANG_FORMAT_PATH, "-i", "-style=file", path], cwd=PATH_TO_OBENGINE
-            )
-            p.wait()
-        return True
-    log.warning("clang-format not found, could not format files")
-    return False
+def get_formatting_context() -> str:
+    """Formatted files cached for another clang-format version or style are
+    discarded
+    """
+    style = b""
+    style_path = os.path.join(PATH_TO_OBENGINE or "", ".clang-format")
+    if os.path.isfile(style_path):
+        with open(style_path, "rb") as style_file:
+            style = style_file.read()
+    return make_digest(CLANG_FORMAT_VERSION, style.hex())
+
+
+def _make_content_key(path: str, content: bytes) -> str:
+    return make_digest(os.path.splitext(path)[1], content.hex())
+
+
+def _clang_format_batch(paths: list[str]) -> bool:
+    result = subprocess.run(
+        [CLANG_FORMAT_PATH, "-i", "-style=file", *paths], cwd=PATH_TO_OBENGINE
+    )
+    if result.returncode != 0:
+        log.warning(
+            f"clang-format failed with exit code {result.returncode} "
+            f"while formatting {len(paths)} files"
+        )
+        return False
+    return True
+
+
+def clang_format_files(file_list, jobs: int = CLANG_FORMAT_JOBS) -> list[str]:
+    """Formats the given files, returns the ones (as listed in file_list) that
+    are formatted once done
+    """
+    if CLANG_FORMAT_PATH is None:
+        log.warning("clang-format not found, could not format files")
+        return []
+    # Files can be listed several times, relative paths are relative to ObEngine
+    listed_paths = {}
+    for listed_path in file_list:
+        path = os.path.abspath(os.path.join(PATH_TO_OBENGINE or "", listed_path))
+        listed_paths.setdefault(path, []).append(listed_path)
+    paths = [path for path in listed_paths if os.path.isfile(path)]
+    # Formatted content of files (key : content before formatting), files whose
+    # content was already formatted by a previous run are not formatted again
+    cache = None
+    if CACHE_DIRECTORY:
+        cache = ParseCache(CACHE_DIRECTORY).bucket(
+            "clang_format", get_formatting_context()
+        )
+    contents = {}
+    for path in paths:
+        with open(path, "rb") as source_file:
+            content = source_file.read()
+        formatted_content = cache and cache.get(_make_content_key(path, content))
+        if formatted_content is None:
+            contents[path] = content
+        elif formatted_content != content:
+            with open(path, "wb") as source_file:
+                source_file.write(formatted_content)
+    stats.count("clang-format skipped files", len(paths) - len(contents))
+    stats.count("clang-format formatted files", len(contents))
+
+    with stats.timed("formatting files"):
+        jobs = max(1, jobs)
+        batch_size = max(1, min(CLANG_FORMAT_BATCH_SIZE, -(-len(contents) // jobs)))
+        to_format = list(contents)
+        batches = [
+            to_format[index : index + batch_size]
+            for index in range(0, len(to_format), batch_size)
+        ]
+        # Only the files of the batches that succeeded are known to be formatted
+        formatted_paths = []
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for batch, success in zip(
+                batches, executor.map(_clang_format_batch, batches)
+            ):
+                if success:
+                    formatted_paths += batch
+
+    if cache is not None:
+        for path in formatted_paths:
+            content = contents[path]
+            with open(path, "rb") as source_file:
+                formatted_content = source_file.read()
+            cache.set(_make_content_key(path, content), formatted_content)
+            cache.set(_make_content_key(path, formatted_content), formatted_content)
+        cache.save()
+    # Files already formatted by a previous run are formatted too
+    formatted_paths += [path for path in paths if path not in contents]
+    return [
+        listed_path for path in formatted_paths for listed_path in listed_paths[path]
+    ]
 
 
-if not _check_clang_format():
+CLANG_FORMAT_VERSION = _get_clang_format_version()
+if not _check_clang_format(CLANG_FORMAT_VERSION):
     CLANG_FORMAT_PATH = None
@@ -1,37 +1,46 @@
+import filecmp
+import hashlib
 import os
+import shutil
 import subprocess
 import tempfile
 
+import git
 import semver
 
 from obidog.config import SOURCE_DIRECTORIES
+from obidog.exceptions import DoxygenBuildFailedException
 from obidog.logger import log
 
 DOXYGEN_PATH = os.environ.get("DOXYGEN_PATH", "doxygen")
 
 
-def _check_doxygen():
+def _get_doxygen_version():
     try:
         with subprocess.Popen(
             [DOXYGEN_PATH, "--version"], stdout=subprocess.PIPE
         ) as doxygen_exec:
-            version = doxygen_exec.stdout.read().decode("utf-8").strip()
-            try:
-                version = version.split()[0]
-                version = semver.VersionInfo.parse(version)
-                if version >= semver.VersionInfo(major=1, minor=8, patch=18):
-                    return True
-                else:
-                    return False
-            except:
-                return False
+            return doxygen_exec.stdout.read().decode("utf-8").strip()
     except FileNotFoundError as e:
         log.warning(f"doxygen not found at '{DOXYGEN_PATH}' : {e}")
+        return None
+
+
+def _check_doxygen(version_string):
+    if version_string is None:
+        return False
+    try:
+        version = version_string.split()[0]
+        version = semver.VersionInfo.parse(version)
+        if version >= semver.VersionInfo(major=1, minor=8, patch=18):
+            return True
+        else:
+            return False
+    except:
         return False
 
 
-def build_doxygen_documentation(source_path):
-    path = tempfile.mkdtemp()
+def _render_doxyfile(source_path: str) -> str:
     src_directories = [
         os.path.join(source_path, directory)
         for directory in [item["path"] for item in SOURCE_DIRECTORIES]
@@ -50,25 +59,131 @@ def build_doxygen_documentation(source_path):
     ]
     with open("Doxyfile", "r") as src_doxyfile:
         doxyfile_content = src_doxyfile.read()
-        with open(os.path.join(path, "Doxyfile"), "w") as dst_doxyfile:
-            dst_doxyfile.write(
-                doxyfile_content.replace(
-                    "{{input_directories}}", (" \\\n" + " " * 25).join(src_directories)
-                )
-                .replace(
-                    "{{exclude_patterns}}",
-                    (" \\\n" + " " * 25).join(exclude_directories),
-                )
-                .replace(
-                    "{{exclude_symbols}}", (" \\\n" + " " * 25).join(exclude_symbols)
-                )
-            )
+    return (
+        doxyfile_content.replace(
+            "{{input_directories}}", (" \\\n" + " " * 25).join(src_directories)
+        )
+        .replace(
+            "{{exclude_patterns}}",
+            (" \\\n" + " " * 25).join(exclude_directories),
+        )
+        .replace("{{exclude_symbols}}", (" \\\n" + " " * 25).join(exclude_symbols))
+    )
+
+
+def _run_doxygen(path: str, doxyfile_content: str):
+    with open(os.path.join(path, "Doxyfile"), "w") as dst_doxyfile:
+        dst_doxyfile.write(doxyfile_content)
     with open(os.path.join(path, "out.log"), "w") as logger:
-        subprocess.run(
+        doxygen_process = subprocess.run(
             [DOXYGEN_PATH, "Doxyfile"], cwd=path, stdout=logger, stderr=logger
         )
-    return path
+    if doxygen_process.returncode != 0:
+        raise DoxygenBuildFailedException(
+            f"Doxygen exited with code {doxygen_process.returncode}, "
+            f"see {os.path.join(path, 'out.log')}"
+        )
+
+
+def _get_source_tree_state(source_path: str) -> str:
+    """Digest of the state of SOURCE_DIRECTORIES : committed trees,
+    uncommitted changes and untracked files
+    """
+    repo = git.Repo(source_path)
+    paths = [item["path"] for item in SOURCE_DIRECTORIES]
+    state = hashlib.sha256()
+    for path in paths:
+        try:
+            state.update(repo.git.rev_parse(f"HEAD:{path}").encode())
+        except git.GitCommandError:
+            state.update(f"missing:{path}".encode())
+    state.update(repo.git.diff("HEAD", "--binary", "--", *paths).encode())
+    untracked_files = repo.git.ls_files(
+        "--others", "--exclude-standard", "--", *paths
+    ).splitlines()
+    for untracked_file in sorted(untracked_files):
+        state.update(untracked_file.encode())
+        with open(os.path.join(source_path, untracked_file), "rb") as file:
+            state.update(file.read())
+    return state.hexdigest()
+
+
+def _sync_directory(source: str, destination: str) -> tuple[int, int]:
+    """Copies the files of source that differ from the ones in destination
+    and removes the files missing from source, unchanged files are left
+    untouched so their modification time is preserved
+    """
+    updated_files = 0
+    source_files = set()
+    for current_dir, _, files in os.walk(source):
+        for f in files:
+            relative_path = os.path.relpath(os.path.join(current_dir, f), source)
+            source_files.add(relative_path)
+            source_file = os.path.join(source, relative_path)
+            destination_file = os.path.join(destination, relative_path)
+            if os.path.isfile(destination_file) and filecmp.cmp(
+                source_file, destination_file, shallow=False
+            ):
+                continue
+            os.makedirs(os.path.dirname(destination_file), exist_ok=True)
+            shutil.copyfile(source_file, destination_file)
+            updated_files += 1
+    removed_files = 0
+    for current_dir, _, files in os.walk(destination):
+        for f in files:
+            destination_file = os.path.join(current_dir, f)
+            if os.path.relpath(destination_file, destination) not in source_files:
+                os.remove(destination_file)
+                removed_files += 1
+    return updated_files, removed_files
+
+
+def build_doxygen_documentation(source_path, build_directory=None):
+    doxyfile_content = _render_doxyfile(source_path)
+    if build_directory is None:
+        path = tempfile.mkdtemp()
+        _run_doxygen(path, doxyfile_content)
+        return path
+
+    os.makedirs(build_directory, exist_ok=True)
+    build_key = hashlib.sha256(
+        (
+            DOXYGEN_VERSION + doxyfile_content + _get_source_tree_state(source_path)
+        ).encode()
+    ).hexdigest()
+    build_key_filepath = os.path.join(build_directory, "build_key")
+    xml_directory = os.path.join(build_directory, "docbuild", "xml")
+    if os.path.isfile(build_key_filepath) and os.path.isdir(xml_directory):
+        with open(build_key_filepath, "r") as build_key_file:
+            if build_key_file.read() == build_key:
+                log.info("Doxygen documentation is up to date, skipping Doxygen")
+                return build_directory
+
+    # Doxygen can not rebuild a subset of its output, it runs in a staging
+    # directory and only the XML files that actually changed are replaced
+    staging_directory = os.path.join(build_directory, "staging")
+    shutil.rmtree(staging_directory, ignore_errors=True)
+    os.makedirs(staging_directory)
+    # A failed build leaves the previous output and its build key untouched
+    _run_doxygen(staging_directory, doxyfile_content)
+    updated_files, removed_files = _sync_directory(
+        os.path.join(staging_directory, "docbuild"),
+        os.path.join(build_directory, "docbuild"),
+    )
+    log.info(
+        f"Doxygen documentation refreshed : {updated_files} files updated, "
+        f"{removed_files} files removed"
+    )
+    shutil.copyfile(
+        os.path.join(staging_directory, "out.log"),
+        os.path.join(build_directory, "out.log"),
+    )
+    shutil.rmtree(staging_directory)
+    with open(build_key_filepath, "w") as build_key_file:
+        build_key_file.write(build_key)
+    return build_directory
 
 
-if not _check_doxygen():
+DOXYGEN_VERSION = _get_doxygen_version()
+if not _check_doxygen(DOXYGEN_VERSION):
     raise RuntimeError("Doxygen (>= 1.8.18) not found")
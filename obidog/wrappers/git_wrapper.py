@@ -1,4 +1,5 @@
 import tempfile
+from typing import NamedTuple
 
 import git
 
@@ -6,6 +7,7 @@ from obidog.config import (
     OBENGINE_GIT_SSH,
     OBENGINE_GIT_URL,
     PATH_TO_OBENGINE,
+    PIN_SOURCES_LINKS,
     set_obengine_git_directory,
 )
 from obidog.exceptions import InvalidObEngineGitRepositoryException
@@ -44,5 +46,32 @@ def check_obengine_repo(git_dir):
     )
 
 
-def get_current_branch():
-    return git.Repo(PATH_TO_OBENGINE).active_branch.name
+class RepositoryMetadata(NamedTuple):
+    """Metadata of the ÖbEngine repository used to build the sources links"""
+
+    url: str
+    # None when the HEAD is detached
+    branch: str | None
+    commit: str
+    pinned: bool = False
+
+    @property
+    def ref(self) -> str:
+        """Git reference used in the links, the commit SHA when the links are
+        pinned (immutable links) or when there is no current branch
+        """
+        if self.pinned or self.branch is None:
+            return self.commit
+        return self.branch
+
+
+def get_repository_metadata(pinned: bool = PIN_SOURCES_LINKS) -> RepositoryMetadata:
+    """Resolves the repository metadata, meant to be called once per run"""
+    repo = git.Repo(PATH_TO_OBENGINE)
+    branch = None if repo.head.is_detached else repo.active_branch.name
+    return RepositoryMetadata(
+        url=OBENGINE_GIT_URL,
+        branch=branch,
+        commit=repo.head.commit.hexsha,
+        pinned=pinned,
+    )
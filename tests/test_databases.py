@@ -0,0 +1,153 @@
+"""Checks that the snapshots of a CppDatabase only copy the elements and the
+fields that are made writable, everything else stays shared with the database
+"""
+
+from obidog.databases import CppDatabase
+from obidog.models.classes import AttributeModel, ClassModel
+from obidog.models.functions import (
+    FunctionModel,
+    FunctionOverloadModel,
+    ParameterModel,
+)
+
+
+def make_method(name: str, class_value: ClassModel, parameters_types: list[str]):
+    return FunctionModel(
+        name=name,
+        namespace="obe",
+        from_class=class_value.name,
+        definition=f"void {name}",
+        parameters=[
+            ParameterModel(name=f"p{index}", type=parameter_type)
+            for index, parameter_type in enumerate(parameters_types)
+        ],
+        return_type="void",
+    )
+
+
+def make_database() -> CppDatabase:
+    cpp_db = CppDatabase()
+    for class_name in ["Base", "Sprite"]:
+        class_value = ClassModel(name=class_name, namespace="obe")
+        class_value.methods = {
+            "draw": make_method("draw", class_value, ["int"]),
+            "move": FunctionOverloadModel(
+                name="move",
+                namespace="obe",
+                from_class=class_name,
+                overloads=[
+                    make_method("move", class_value, ["int"]),
+                    make_method("move", class_value, ["float", "float"]),
+                ],
+            ),
+        }
+        class_value.attributes = {
+            "size": AttributeModel(
+                name="size",
+                namespace="obe",
+                type="int",
+                from_class=class_name,
+                initializer=None,
+            )
+        }
+        cpp_db.classes[f"obe::{class_name}"] = class_value
+    for class_value in cpp_db.classes.values():
+        for method in class_value.methods.values():
+            for method_model in getattr(method, "overloads", [method]):
+                for parameter in method_model.parameters:
+                    parameter.ref = cpp_db.classes["obe::Base"]
+    return cpp_db
+
+
+def test_snapshot_shares_elements_until_writable():
+    cpp_db = make_database()
+    snapshot = cpp_db.snapshot()
+
+    sprite = snapshot.writable("classes", "obe::Sprite")
+
+    assert snapshot.classes["obe::Base"] is cpp_db.classes["obe::Base"]
+    assert sprite is not cpp_db.classes["obe::Sprite"]
+    assert snapshot.writable("classes", "obe::Sprite") is sprite
+    for field_name in ["methods", "attributes", "flags", "urls", "location"]:
+        assert getattr(sprite, field_name) is getattr(
+            cpp_db.classes["obe::Sprite"], field_name
+        )
+
+
+def test_writable_only_copies_given_fields():
+    cpp_db = make_database()
+    original = cpp_db.classes["obe::Sprite"]
+    snapshot = cpp_db.snapshot()
+
+    sprite = snapshot.writable(
+        "classes", "obe::Sprite", "methods.parameters", "methods.overloads.parameters"
+    )
+    for method in sprite.methods.values():
+        for method_model in getattr(method, "overloads", [method]):
+            for parameter in method_model.parameters:
+                parameter.type = "number"
+
+    original_draw = original.methods["draw"]
+    draw = sprite.methods["draw"]
+    assert draw is not original_draw
+    assert draw.parameters[0] is not original_draw.parameters[0]
+    assert original_draw.parameters[0].type == "int"
+    assert original.methods["move"].overloads[1].parameters[1].type == "float"
+    # Fields that were not given are not copied
+    assert sprite.attributes is original.attributes
+    assert draw.flags is original_draw.flags
+    assert draw.urls is original_draw.urls
+    # Parameters still reference the classes of the database
+    assert draw.parameters[0].ref is cpp_db.classes["obe::Base"]
+
+
+def test_writable_copies_missing_fields_of_writable_element():
+    cpp_db = make_database()
+    original = cpp_db.classes["obe::Sprite"]
+    snapshot = cpp_db.snapshot()
+
+    sprite = snapshot.writable("classes", "obe::Sprite", "methods")
+    draw = sprite.methods["draw"]
+    assert draw.flags is original.methods["draw"].flags
+
+    assert snapshot.writable("classes", "obe::Sprite", "methods.flags") is sprite
+    sprite.methods["draw"].flags.nobind = True
+    assert not original.methods["draw"].flags.nobind
+    assert sprite.attributes is original.attributes
+
+
+def test_writable_copies_replaced_fields_again():
+    cpp_db = make_database()
+    base = cpp_db.classes["obe::Base"]
+    snapshot = cpp_db.snapshot()
+
+    sprite = snapshot.writable("classes", "obe::Sprite", "methods.parameters")
+    sprite.methods = dict(base.methods)
+    snapshot.writable("classes", "obe::Sprite", "methods.parameters")
+    sprite.methods["draw"].parameters[0].type = "number"
+
+    assert base.methods["draw"].parameters[0].type == "int"
+
+
+def test_writable_copies_fields_of_elements_added_to_snapshot():
+    cpp_db = make_database()
+    original = cpp_db.classes["obe::Sprite"]
+    snapshot = cpp_db.snapshot()
+    specialisation = ClassModel.build(
+        name="Sprite<int>", namespace="obe", attributes=original.attributes
+    )
+    snapshot.classes["obe::Sprite<int>"] = specialisation
+
+    writable = snapshot.writable("classes", "obe::Sprite<int>", "attributes")
+    writable.attributes["size"].type = "number"
+
+    assert writable is specialisation
+    assert original.attributes["size"].type == "int"
+
+
+def test_writable_does_not_copy_database_elements():
+    cpp_db = make_database()
+    sprite = cpp_db.classes["obe::Sprite"]
+
+    assert cpp_db.writable("classes", "obe::Sprite", "methods") is sprite
+    assert cpp_db.classes["obe::Sprite"].methods is sprite.methods
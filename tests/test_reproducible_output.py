@@ -0,0 +1,97 @@
+"""Checks that the generated files do not depend on the hash seed of the
+Python process (set / dict iteration order)
+
+The generators run twice on the sample Doxygen output of tests/fixtures
+with different PYTHONHASHSEED values, the digests of all the generated files
+must be the same
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+
+import git
+
+REPOSITORY_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PATH_TO_DOC = os.path.join(os.path.dirname(__file__), "fixtures", "doxygen")
+
+GENERATION_SCRIPT = """
+import sys
+
+from obidog.bindings.generator import generate_bindings
+from obidog.databases import CppDatabase
+from obidog.documentation.documentation import generate_documentation
+from obidog.hints.hints import generate_hints
+from obidog.parsers.cpp_parser import parse_doxygen_files
+
+path_to_doc = sys.argv[1]
+cpp_db = CppDatabase()
+doxygen_index = parse_doxygen_files(path_to_doc, cpp_db)
+generate_bindings(cpp_db.snapshot())
+generate_hints(cpp_db.snapshot())
+generate_documentation(cpp_db.snapshot(), doxygen_index, path_to_doc)
+"""
+
+
+def make_obengine_repository(path: str):
+    repository = git.Repo.init(path)
+    author = git.Actor("Obidog", "obidog@example.com")
+    repository.index.commit("Initial commit", author=author, committer=author)
+
+
+def get_output_digests(directories: list[str]) -> dict[str, str]:
+    digests = {}
+    for directory in directories:
+        for current_dir, _, filenames in os.walk(directory):
+            for filename in filenames:
+                path = os.path.join(current_dir, filename)
+                with open(path, "rb") as output_file:
+                    digests[os.path.relpath(path, directory)] = hashlib.sha256(
+                        output_file.read()
+                    ).hexdigest()
+    return digests
+
+
+def generate(tmp_path, hash_seed: int) -> dict[str, str]:
+    obengine_directory = tmp_path / "obengine"
+    working_directory = tmp_path / f"working_directory_{hash_seed}"
+    output_directories = [
+        obengine_directory / "include",
+        obengine_directory / "src",
+        obengine_directory / "engine",
+        working_directory / "export",
+    ]
+    for directory in output_directories:
+        shutil.rmtree(directory, ignore_errors=True)
+    (obengine_directory / "engine" / "Hints").mkdir(parents=True)
+    for directory in ["templates", "hints"]:
+        shutil.copytree(
+            os.path.join(REPOSITORY_ROOT, directory), working_directory / directory
+        )
+    environment = {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith("OBIDOG_") and not key.startswith("OBENGINE_")
+    }
+    environment.update(
+        PYTHONHASHSEED=str(hash_seed),
+        PYTHONPATH=REPOSITORY_ROOT,
+        OBENGINE_GIT_DIRECTORY=str(obengine_directory),
+        OBENGINE_BINDINGS_OUTPUT=str(obengine_directory),
+    )
+    subprocess.run(
+        [sys.executable, "-c", GENERATION_SCRIPT, PATH_TO_DOC],
+        cwd=working_directory,
+        env=environment,
+        check=True,
+    )
+    return get_output_digests([str(directory) for directory in output_directories])
+
+
+def test_generated_files_do_not_depend_on_hash_seed(tmp_path):
+    make_obengine_repository(str(tmp_path / "obengine"))
+    first_digests = generate(tmp_path, hash_seed=1)
+    assert first_digests
+    assert generate(tmp_path, hash_seed=2) == first_digests
@@ -0,0 +1,36 @@
+"""Checks the C++ declarations tokenizer against the results of the original
+character by character implementation
+
+tests/fixtures/declarations.json holds declarations from Doxygen XML files,
+deeply nested templates and randomly generated declarations along with the
+results of the original implementation
+"""
+
+import json
+import os
+
+import pytest
+
+from obidog.parsers.type_parser import split_root_types, strip_qualifiers
+from obidog.parsers.utils.cpp_utils import parse_definition
+
+with open(
+    os.path.join(os.path.dirname(__file__), "fixtures", "declarations.json")
+) as declarations_file:
+    DECLARATIONS = json.load(declarations_file)
+
+
+@pytest.mark.parametrize(
+    "declaration", DECLARATIONS, ids=lambda declaration: declaration["declaration"]
+)
+def test_tokenizer_matches_original_implementation(declaration):
+    assert list(parse_definition(declaration["declaration"])) == (
+        declaration["parse_definition"]
+    )
+    assert split_root_types(declaration["type"]) == declaration["split_root_types"]
+    cpp_type, qualifiers = strip_qualifiers(declaration["type"])
+    assert [
+        cpp_type,
+        list(qualifiers.prefix_qualifiers),
+        list(qualifiers.postfix_qualifiers),
+    ] == declaration["strip_qualifiers"]